@@ -13,27 +13,39 @@ from http import HTTPStatus
 from typing import Any
 
 from flask import current_app
-import requests
 
 from byceps.events.base import _BaseEvent
 from byceps.services.webhooks import webhook_service
 from byceps.services.webhooks.models import AnnouncementRequest, OutgoingWebhook
+from byceps.signals import webhook as webhook_signals
+from byceps.util.cache import GenerationalCache
 from byceps.util.jobqueue import enqueue, enqueue_at
 
 from .connections import get_signals, registry
+from .dispatch import dispatch
 
 
-DEFAULT_WEBHOOK_TIMEOUT = 15
+_WEBHOOKS_NAMESPACE = 'webhooks'
 
-
-class WebhookError(Exception):
-    pass
+_webhook_cache = GenerationalCache(
+    'webhook',
+    'byceps:announce:generation',
+    maxsize=256,
+    ttl_config_key='WEBHOOK_CACHE_TTL',
+)
 
 
 def enable_announcements() -> None:
     for signal in get_signals():
         signal.connect(_receive_signal)
 
+    for signal in [
+        webhook_signals.webhook_created,
+        webhook_signals.webhook_updated,
+        webhook_signals.webhook_deleted,
+    ]:
+        signal.connect(_on_webhook_changed)
+
 
 def _receive_signal(sender, *, event: _BaseEvent | None = None) -> None:
     if event is None:
@@ -41,8 +53,8 @@ def _receive_signal(sender, *, event: _BaseEvent | None = None) -> None:
 
     event_name = get_name_for_event(event)
     webhooks = _get_webhooks(event_name)
-    for webhook in webhooks:
-        enqueue(_handle_event, event, webhook)
+    if webhooks:
+        enqueue(_handle_event, event, webhooks)
 
 
 def get_event_names() -> set[str]:
@@ -58,7 +70,7 @@ def get_name_for_event(event: _BaseEvent) -> str:
 
 
 def _get_webhooks(event_name: str) -> list[OutgoingWebhook]:
-    webhooks = webhook_service.get_enabled_outgoing_webhooks(event_name)
+    webhooks = list(_get_enabled_outgoing_webhooks(event_name))
 
     # Stable order is easier to test.
     webhooks.sort(key=lambda wh: wh.extra_fields.get('channel', ''))
@@ -66,12 +78,40 @@ def _get_webhooks(event_name: str) -> list[OutgoingWebhook]:
     return webhooks
 
 
-def _handle_event(event: _BaseEvent, webhook: OutgoingWebhook) -> None:
-    announcement_request = build_announcement_request(event, webhook)
-    if announcement_request is None:
-        return
+def _get_enabled_outgoing_webhooks(event_name: str) -> list[OutgoingWebhook]:
+    """Return the enabled webhooks for that event type.
+
+    Their configuration is cached (for all processes until any webhook
+    is changed) to avoid a database query for every event.
+    """
+    return _webhook_cache.get_or_load(
+        event_name,
+        [_WEBHOOKS_NAMESPACE],
+        lambda: webhook_service.get_enabled_outgoing_webhooks(event_name),
+    )
+
+
+def invalidate_webhook_cache() -> None:
+    """Make all processes reload webhook configurations."""
+    _webhook_cache.invalidate(_WEBHOOKS_NAMESPACE)
+
+
+def clear_webhook_cache() -> None:
+    """Remove all webhook configurations cached by this process."""
+    _webhook_cache.clear()
 
-    announce(announcement_request)
+
+def _on_webhook_changed(sender, **kwargs) -> None:
+    invalidate_webhook_cache()
+
+
+def _handle_event(event: _BaseEvent, webhooks: list[OutgoingWebhook]) -> None:
+    for webhook in webhooks:
+        announcement_request = build_announcement_request(event, webhook)
+        if announcement_request is None:
+            continue
+
+        announce(announcement_request)
 
 
 def build_announcement_request(
@@ -157,30 +197,10 @@ def announce(announcement_request: AnnouncementRequest) -> None:
     announce_at = announcement_request.announce_at
     if announce_at is not None:
         # Schedule job to announce later.
-        enqueue_at(announce_at, call_webhook, announcement_request)
+        enqueue_at(announce_at, dispatch, announcement_request)
     else:
         # Announce now.
-        call_webhook(announcement_request)
-
-
-def call_webhook(announcement_request: AnnouncementRequest) -> None:
-    """Send HTTP request to the webhook."""
-    response = requests.post(
-        announcement_request.url,
-        json=announcement_request.data,
-        timeout=DEFAULT_WEBHOOK_TIMEOUT,
-    )
-
-    expected_response_code = announcement_request.expected_response_status_code
-    if expected_response_code is None:
-        return
-
-    actual_response_code = response.status_code
-    if actual_response_code != expected_response_code:
-        raise WebhookError(
-            f'Endpoint for webhook {announcement_request.webhook_id} '
-            f'returned unexpected status code {actual_response_code}'
-        )
+        dispatch(announcement_request)
 
 
 _EXPECTED_RESPONSE_STATUS_CODES = {
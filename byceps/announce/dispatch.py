@@ -0,0 +1,298 @@
+"""
+byceps.announce.dispatch
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Deliver announcement requests to webhook endpoints.
+
+Requests are put into a per-endpoint outbox. One job at a time per
+endpoint drains that outbox in batches, so announcements made in quick
+succession are delivered together, in order, over a pooled (keep-alive)
+HTTP connection. Calls to the same endpoint are spaced out by a minimum
+interval, and failed calls are retried by later jobs, with exponential
+backoff.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from enum import Enum, auto
+from functools import cache
+from hashlib import sha256
+from http import HTTPStatus
+import pickle
+import time
+
+from flask import current_app
+import requests
+import structlog
+
+from byceps.services.webhooks.models import AnnouncementRequest
+from byceps.util.jobqueue import enqueue, enqueue_at
+from byceps.util.outbox import Outbox
+
+
+log = structlog.get_logger()
+
+
+DEFAULT_WEBHOOK_TIMEOUT = 15
+
+_OUTBOX_KEY_PREFIX = 'byceps:announce:outbox'
+
+_BATCH_SIZE = 50
+
+# Stop in time before the job queue's job timeout (180 seconds by
+# default) and leave the remaining requests to the next job.
+_JOB_TIME_LIMIT = 120  # seconds
+
+_MAX_BACKOFF = 60  # seconds
+
+_RETRYABLE_STATUS_CODES = frozenset(
+    [
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ]
+)
+
+
+class WebhookError(Exception):
+    pass
+
+
+class _RetryableWebhookError(WebhookError):
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@cache
+def _get_session() -> requests.Session:
+    """Return the HTTP session of this process.
+
+    It keeps connections to endpoints open for reuse.
+    """
+    return requests.Session()
+
+
+# -------------------------------------------------------------------- #
+# queueing
+
+
+def dispatch(announcement_request: AnnouncementRequest) -> None:
+    """Put the request into its endpoint's outbox and make sure the
+    outbox is going to be drained.
+    """
+    endpoint_key = _get_endpoint_key(announcement_request.url)
+    outbox = _get_outbox(endpoint_key)
+
+    if outbox.push(_serialize(announcement_request, 0)):
+        enqueue(drain_outbox, endpoint_key)
+
+
+def drain_outbox(endpoint_key: str) -> None:
+    """Deliver a batch of the requests waiting in the endpoint's outbox.
+
+    A request that failed temporarily is retried by a job scheduled
+    after a backoff period. The requests after it wait for that, too, to
+    preserve their order. Otherwise, another job is scheduled right away
+    if requests are left.
+
+    Raise an exception if requests had to be given up on, so that the
+    job is recorded as failed.
+    """
+    outbox = _get_outbox(endpoint_key)
+    if not outbox.start():
+        # Another job is draining the outbox and takes care of the
+        # requests.
+        return
+
+    rate_limiter = _RateLimiter(_get_min_call_interval())
+    deadline = time.monotonic() + _JOB_TIME_LIMIT
+
+    retry_delay = None
+    failed_webhook_ids = []
+
+    for data in outbox.claim_batch(_BATCH_SIZE):
+        if time.monotonic() >= deadline:
+            # Leave the rest to the next job.
+            break
+
+        if not outbox.keep_draining():
+            # Another job has taken over, including the claimed requests.
+            break
+
+        announcement_request, failed_attempts = pickle.loads(data)  # noqa: S301
+
+        match _deliver(announcement_request, failed_attempts, rate_limiter):
+            case _DeliveryOutcome.DELIVERED:
+                pass
+            case _DeliveryOutcome.FAILED:
+                failed_webhook_ids.append(announcement_request.webhook_id)
+            case backoff:
+                outbox.replace_oldest_claimed(
+                    _serialize(announcement_request, failed_attempts + 1)
+                )
+                retry_delay = backoff
+                break
+
+        outbox.acknowledge()
+
+    if outbox.release():
+        if retry_delay is None:
+            enqueue(drain_outbox, endpoint_key)
+        else:
+            retry_at = datetime.utcnow() + timedelta(seconds=retry_delay)
+            enqueue_at(retry_at, drain_outbox, endpoint_key)
+
+    if failed_webhook_ids:
+        webhook_ids_str = ', '.join(map(str, failed_webhook_ids))
+        raise WebhookError(
+            f'Gave up delivering requests to webhooks {webhook_ids_str}'
+        )
+
+
+def _serialize(
+    announcement_request: AnnouncementRequest, failed_attempts: int
+) -> bytes:
+    return pickle.dumps((announcement_request, failed_attempts))
+
+
+def _get_endpoint_key(url: str) -> str:
+    # Keep (possibly secret) URLs out of key names.
+    return sha256(url.encode()).hexdigest()
+
+
+def _get_outbox(endpoint_key: str) -> Outbox:
+    return Outbox(f'{_OUTBOX_KEY_PREFIX}:{endpoint_key}')
+
+
+# -------------------------------------------------------------------- #
+# delivery
+
+
+class _RateLimiter:
+    """Space out calls by a minimum interval."""
+
+    def __init__(self, min_interval: float) -> None:
+        self._min_interval = min_interval
+        self._last_call_at: float | None = None
+
+    def wait(self) -> None:
+        if self._last_call_at is not None:
+            elapsed = time.monotonic() - self._last_call_at
+            if elapsed < self._min_interval:
+                time.sleep(self._min_interval - elapsed)
+
+        self._last_call_at = time.monotonic()
+
+
+class _DeliveryOutcome(Enum):
+    DELIVERED = auto()
+    FAILED = auto()
+
+
+def _deliver(
+    announcement_request: AnnouncementRequest,
+    failed_attempts: int,
+    rate_limiter: _RateLimiter,
+) -> _DeliveryOutcome | float:
+    """Call the webhook.
+
+    Return the number of seconds to wait before retrying if the call
+    failed temporarily and retries are left.
+
+    Errors are logged instead of raised so that the remaining requests
+    in the outbox are still delivered.
+    """
+    rate_limiter.wait()
+
+    try:
+        call_webhook(announcement_request)
+        return _DeliveryOutcome.DELIVERED
+    except _RetryableWebhookError as e:
+        attempts = failed_attempts + 1
+        if attempts > _get_max_retries():
+            log.error(
+                'Webhook call failed, giving up',
+                webhook_id=str(announcement_request.webhook_id),
+                attempts=attempts,
+                error=str(e),
+            )
+            return _DeliveryOutcome.FAILED
+
+        backoff = min(2**failed_attempts, _MAX_BACKOFF)
+        if e.retry_after is not None:
+            backoff = max(backoff, min(e.retry_after, _MAX_BACKOFF))
+
+        log.warning(
+            'Webhook call failed, retrying',
+            webhook_id=str(announcement_request.webhook_id),
+            attempt=attempts,
+            backoff=backoff,
+            error=str(e),
+        )
+        return backoff
+    except WebhookError as e:
+        log.error(
+            'Webhook call failed',
+            webhook_id=str(announcement_request.webhook_id),
+            error=str(e),
+        )
+        return _DeliveryOutcome.FAILED
+
+
+def call_webhook(announcement_request: AnnouncementRequest) -> None:
+    """Send HTTP request to the webhook."""
+    try:
+        response = _get_session().post(
+            announcement_request.url,
+            json=announcement_request.data,
+            timeout=DEFAULT_WEBHOOK_TIMEOUT,
+        )
+    except requests.RequestException as e:
+        raise _RetryableWebhookError(
+            f'Endpoint for webhook {announcement_request.webhook_id} '
+            f'could not be reached: {e}'
+        ) from e
+
+    actual_response_code = response.status_code
+    if actual_response_code in _RETRYABLE_STATUS_CODES:
+        raise _RetryableWebhookError(
+            f'Endpoint for webhook {announcement_request.webhook_id} '
+            f'returned status code {actual_response_code}',
+            retry_after=_parse_retry_after(response),
+        )
+
+    expected_response_code = announcement_request.expected_response_status_code
+    if expected_response_code is None:
+        return
+
+    if actual_response_code != expected_response_code:
+        raise WebhookError(
+            f'Endpoint for webhook {announcement_request.webhook_id} '
+            f'returned unexpected status code {actual_response_code}'
+        )
+
+
+def _parse_retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        # HTTP dates are not supported.
+        return None
+
+
+def _get_min_call_interval() -> float:
+    return current_app.config['WEBHOOK_MIN_CALL_INTERVAL']
+
+
+def _get_max_retries() -> int:
+    return current_app.config['WEBHOOK_MAX_RETRIES']
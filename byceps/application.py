@@ -25,10 +25,12 @@ from byceps import config, config_defaults
 from byceps.announce.announce import enable_announcements
 from byceps.blueprints.admin.blueprints import register_admin_blueprints
 from byceps.blueprints.api.blueprints import register_api_blueprints
+from byceps.blueprints.site.snippet import rendering_cache
 from byceps.blueprints.site.blueprints import register_site_blueprints
 from byceps.config import ConfigurationError, parse_value_from_environment
 from byceps.database import db
-from byceps.util import templatefilters
+from byceps.services.party_stats import party_stats_snapshot_service
+from byceps.util import request_context_cache, templatefilters
 from byceps.util.authz import (
     has_current_user_permission,
     load_permissions,
@@ -97,13 +99,23 @@ def create_cli_app() -> Flask:
     return _create_app(config_overrides=config_overrides)
 
 
-def create_metrics_app(database_uri: str) -> Flask:
+def create_metrics_app(
+    database_uri: str,
+    redis_url: str,
+    *,
+    additional_config: dict[str, Any] | None = None,
+) -> Flask:
     app = Flask(__name__)
 
     app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
 
+    if additional_config is not None:
+        app.config.update(additional_config)
+
     db.init_app(app)
 
+    app.redis_client = Redis.from_url(redis_url)
+
     blueprint = get_blueprint('monitoring.metrics')
     app.register_blueprint(blueprint)
 
@@ -166,6 +178,10 @@ def _create_app(*, config_overrides: dict[str, Any] | None = None) -> Flask:
 
     enable_announcements()
 
+    request_context_cache.enable_invalidation()
+    rendering_cache.enable_invalidation()
+    party_stats_snapshot_service.enable_refresh_on_changes()
+
     debug_toolbar_enabled = (
         app.config.get('DEBUG_TOOLBAR_ENABLED', False)
         and (app_mode.is_admin() or app_mode.is_site())
@@ -269,7 +285,17 @@ def _dispatch_apps_by_url_path(
         app.config['METRICS_ENABLED'] and app.byceps_app_mode.is_admin()
     )
     if metrics_enabled:
-        metrics_app = create_metrics_app(app.config['SQLALCHEMY_DATABASE_URI'])
+        metrics_app = create_metrics_app(
+            app.config['SQLALCHEMY_DATABASE_URI'],
+            app.config['REDIS_URL'],
+            additional_config={
+                key: app.config[key]
+                for key in (
+                    'PARTY_STATS_SNAPSHOTS_ENABLED',
+                    'PARTY_STATS_SNAPSHOTS_MAX_AGE',
+                )
+            },
+        )
         mounts['/metrics'] = metrics_app
     app.byceps_feature_states['metrics'] = metrics_enabled
 
@@ -7,8 +7,8 @@ byceps.blueprints.admin.api.forms
 """
 
 from flask_babel import lazy_gettext
-from wtforms import StringField
-from wtforms.validators import InputRequired, Optional
+from wtforms import IntegerField, StringField
+from wtforms.validators import InputRequired, NumberRange, Optional
 
 from byceps.util.authz import permission_registry
 from byceps.util.forms import MultiCheckboxField
@@ -32,3 +32,7 @@ class CreateForm(LocalizedForm):
     description = StringField(
         lazy_gettext('Description'), validators=[Optional()]
     )
+    rate_limit = IntegerField(
+        lazy_gettext('Rate limit (requests per minute)'),
+        validators=[Optional(), NumberRange(min=1)],
+    )
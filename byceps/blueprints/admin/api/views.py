@@ -9,7 +9,10 @@ byceps.blueprints.admin.api.views
 from flask import g, request
 from flask_babel import gettext
 
-from byceps.services.authn.api import authn_api_service
+from byceps.services.authn.api import (
+    authn_api_request_count_service,
+    authn_api_service,
+)
 from byceps.services.user import user_service
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_success
@@ -38,9 +41,14 @@ def index():
         user_ids, include_avatars=True
     )
 
+    request_counts_by_token_id = (
+        authn_api_request_count_service.get_request_counts()
+    )
+
     return {
         'api_tokens': api_tokens,
         'users_by_id': users_by_id,
+        'request_counts_by_token_id': request_counts_by_token_id,
     }
 
 
@@ -68,9 +76,10 @@ def create_api_token():
     creator_id = g.user.id
     permissions = set(form.permissions.data)
     description = form.description.data.strip()
+    rate_limit = form.rate_limit.data
 
     authn_api_service.create_api_token(
-        creator_id, permissions, description=description
+        creator_id, permissions, description=description, rate_limit=rate_limit
     )
 
     flash_success(gettext('API token has been created.'))
@@ -14,6 +14,7 @@ from flask import abort, request
 from flask_babel import gettext
 
 from byceps.services.board import (
+    board_aggregation_service,
     board_category_command_service,
     board_category_query_service,
     board_posting_query_service,
@@ -93,6 +94,23 @@ def board_view(board_id):
     }
 
 
+@blueprint.post('/boards/<board_id>/reaggregate')
+@permission_required('board_category.update')
+@respond_no_content
+def board_reaggregate(board_id):
+    """Recount topics and postings of the board's categories."""
+    board = _get_board_or_404(board_id)
+
+    inconsistencies = board_aggregation_service.reaggregate_board(board.id)
+
+    flash_success(
+        gettext(
+            'Board has been reaggregated. Inconsistencies fixed: %(count)s',
+            count=len(inconsistencies),
+        )
+    )
+
+
 @blueprint.get('/for_brand/<brand_id>/boards/create')
 @permission_required('board.create')
 @templated
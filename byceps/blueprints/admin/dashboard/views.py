@@ -6,6 +6,8 @@ byceps.blueprints.admin.dashboard.views
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
 from datetime import date, timedelta
 
 from flask import abort
@@ -21,12 +23,14 @@ from byceps.services.news import news_channel_service
 from byceps.services.orga import orga_birthday_service
 from byceps.services.orga_team import orga_team_service
 from byceps.services.party import party_service
-from byceps.services.seating import seat_service, seating_area_service
-from byceps.services.shop.order import order_service as shop_order_service
+from byceps.services.party.models import Party
+from byceps.services.party_stats import party_stats_snapshot_service
+from byceps.services.seating import seating_area_service
+from byceps.services.seating.models import SeatUtilization
 from byceps.services.shop.shop import shop_service
 from byceps.services.shop.storefront import storefront_service
 from byceps.services.site import site_service
-from byceps.services.ticketing import ticket_service
+from byceps.services.ticketing.models.ticket import TicketSaleStats
 from byceps.services.user import user_service, user_stats_service
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.templating import templated
@@ -44,24 +48,22 @@ def view_global():
     active_brands = brand_service.get_active_brands()
 
     active_parties = party_service.get_active_parties(include_brands=True)
-    active_parties_with_stats = [
-        (
-            party,
-            ticket_service.get_ticket_sale_stats(party.id),
-            seat_service.get_seat_utilization(party.id),
-        )
-        for party in active_parties
-    ]
+    active_parties_with_stats = _get_parties_with_stats(active_parties)
 
     all_brands_by_id = {
         brand.id: brand for brand in brand_service.get_all_brands()
     }
     active_shops = shop_service.get_active_shops()
+    order_stats_by_shop_id = (
+        party_stats_snapshot_service.get_order_stats_for_shops(
+            shop.id for shop in active_shops
+        )
+    )
     active_shops_with_brands_and_open_orders_counts = [
         (
             shop,
             all_brands_by_id[shop.brand_id],
-            shop_order_service.count_open_orders(shop.id),
+            order_stats_by_shop_id[shop.id].open_orders,
         )
         for shop in active_shops
     ]
@@ -105,14 +107,7 @@ def view_brand(brand_id):
     active_parties = party_service.get_active_parties(
         brand_id=brand.id, include_brands=True
     )
-    active_parties_with_stats = [
-        (
-            party,
-            ticket_service.get_ticket_sale_stats(party.id),
-            seat_service.get_seat_utilization(party.id),
-        )
-        for party in active_parties
-    ]
+    active_parties_with_stats = _get_parties_with_stats(active_parties)
 
     active_news_channels = news_channel_service.get_channels_for_brand(
         brand.id, only_non_archived=True
@@ -132,7 +127,10 @@ def view_brand(brand_id):
 
     shop = shop_service.find_shop_for_brand(brand.id)
     if shop is not None:
-        open_order_count = shop_order_service.count_open_orders(shop.id)
+        order_stats_by_shop_id = (
+            party_stats_snapshot_service.get_order_stats_for_shops([shop.id])
+        )
+        open_order_count = order_stats_by_shop_id[shop.id].open_orders
     else:
         open_order_count = None
 
@@ -164,14 +162,12 @@ def view_party(party_id):
     orga_team_count = orga_team_service.count_teams_for_party(party.id)
 
     seating_area_count = seating_area_service.count_areas_for_party(party.id)
-    seat_count = seat_service.count_seats_for_party(party.id)
-
-    ticket_sale_stats = ticket_service.get_ticket_sale_stats(party.id)
-    tickets_checked_in = ticket_service.count_tickets_checked_in_for_party(
-        party.id
-    )
 
-    seat_utilization = seat_service.get_seat_utilization(party.id)
+    party_stats = party_stats_snapshot_service.get_stats_for_party(party.id)
+    seat_count = party_stats.seat_utilization.total
+    ticket_sale_stats = party_stats.ticket_sale_stats
+    tickets_checked_in = party_stats.tickets_checked_in
+    seat_utilization = party_stats.seat_utilization
 
     guest_servers = guest_server_service.get_all_servers_for_party(party.id)
     guest_server_quantities_by_status = (
@@ -195,6 +191,23 @@ def view_party(party_id):
     }
 
 
+def _get_parties_with_stats(
+    parties: list[Party],
+) -> list[tuple[Party, TicketSaleStats, SeatUtilization]]:
+    stats_by_party_id = party_stats_snapshot_service.get_stats_for_parties(
+        party.id for party in parties
+    )
+
+    return [
+        (
+            party,
+            stats_by_party_id[party.id].ticket_sale_stats,
+            stats_by_party_id[party.id].seat_utilization,
+        )
+        for party in parties
+    ]
+
+
 @blueprint.get('/sites/<site_id>')
 @permission_required('site.view')
 @templated
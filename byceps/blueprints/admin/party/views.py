@@ -15,8 +15,9 @@ from flask_babel import gettext, to_user_timezone, to_utc
 from byceps.services.brand import brand_service
 from byceps.services.party import party_service, party_setting_service
 from byceps.services.party.models import PartyID
-from byceps.services.ticketing import ticket_service
+from byceps.services.party_stats import party_stats_snapshot_service
 from byceps.services.ticketing.models.ticket import TicketSaleStats
+from byceps.signals import party as party_signals
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_success
 from byceps.util.framework.templating import templated
@@ -91,9 +92,13 @@ def _get_days_by_party_id(parties) -> dict[PartyID, list[date]]:
 def _get_ticket_sale_stats_by_party_id(
     parties,
 ) -> dict[PartyID, TicketSaleStats]:
+    stats_by_party_id = party_stats_snapshot_service.get_stats_for_parties(
+        party.id for party in parties
+    )
+
     return {
-        party.id: ticket_service.get_ticket_sale_stats(party.id)
-        for party in parties
+        party_id: stats.ticket_sale_stats
+        for party_id, stats in stats_by_party_id.items()
     }
 
 
@@ -233,6 +238,8 @@ def update(party_id):
     except party_service.UnknownPartyIdError:
         abort(404, f'Unknown party ID "{party_id}".')
 
+    party_signals.party_updated.send(None, party_id=party.id)
+
     flash_success(
         gettext('Party "%(title)s" has been updated.', title=party.title)
     )
@@ -22,6 +22,7 @@ from byceps.services.shop.storefront import storefront_service
 from byceps.services.shop.storefront.models import Storefront, StorefrontID
 from byceps.services.site import site_service, site_setting_service
 from byceps.services.site.models import Site, SiteWithBrand
+from byceps.signals import site as site_signals
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_error, flash_success
 from byceps.util.framework.templating import templated
@@ -301,6 +302,8 @@ def update(site_id):
     except site_service.UnknownSiteIdError:
         abort(404, f'Unknown site ID "{site_id}".')
 
+    site_signals.site_updated.send(None, site_id=site.id)
+
     flash_success(
         gettext('Site "%(title)s" has been updated.', title=site.title)
     )
@@ -351,6 +354,8 @@ def add_news_channel(site_id):
 
     site_service.add_news_channel(site.id, news_channel.id)
 
+    site_signals.site_updated.send(None, site_id=site.id)
+
     flash_success(
         gettext(
             'News channel "%(news_channel_id)s" has been added to site "%(site_title)s".',
@@ -377,6 +382,8 @@ def remove_news_channel(site_id, news_channel_id):
 
     site_service.remove_news_channel(site.id, news_channel.id)
 
+    site_signals.site_updated.send(None, site_id=site.id)
+
     flash_success(
         gettext(
             'News channel "%(news_channel_id)s" has been removed from site "%(site_title)s".',
@@ -12,9 +12,11 @@ import json
 from flask import abort, request
 from flask_babel import gettext
 
-from byceps.announce.announce import assemble_announcement_request, call_webhook
+from byceps.announce.announce import assemble_announcement_request
+from byceps.announce.dispatch import call_webhook
 from byceps.services.webhooks import webhook_service
 from byceps.services.webhooks.models import OutgoingWebhook, WebhookID
+from byceps.signals import webhook as webhook_signals
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_error, flash_success
 from byceps.util.framework.templating import templated
@@ -72,7 +74,7 @@ def create():
     description = form.description.data.strip()
     enabled = False
 
-    webhook_service.create_outgoing_webhook(
+    webhook = webhook_service.create_outgoing_webhook(
         event_types,
         event_filters,
         format,
@@ -81,6 +83,8 @@ def create():
         description=description,
     )
 
+    webhook_signals.webhook_created.send(None, webhook_id=webhook.id)
+
     flash_success(gettext('Webhook has been created.'))
 
     return redirect_to('.index')
@@ -141,6 +145,8 @@ def update(webhook_id):
         enabled,
     ).unwrap()
 
+    webhook_signals.webhook_updated.send(None, webhook_id=webhook.id)
+
     flash_success(gettext('Webhook has been updated.'))
 
     return redirect_to('.index')
@@ -155,6 +161,8 @@ def delete(webhook_id):
 
     webhook_service.delete_outgoing_webhook(webhook.id)
 
+    webhook_signals.webhook_deleted.send(None, webhook_id=webhook.id)
+
     flash_success(gettext('Webhook has been removed.'))
 
 
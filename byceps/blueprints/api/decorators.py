@@ -10,10 +10,14 @@ from __future__ import annotations
 
 from functools import wraps
 
-from flask import abort, request
+from flask import abort, g, request
 from werkzeug.datastructures import WWWAuthenticate
 
-from byceps.services.authn.api import authn_api_service
+from byceps.services.authn.api import (
+    authn_api_rate_limit_service,
+    authn_api_request_count_service,
+    authn_api_service,
+)
 
 
 def api_token_required(func):
@@ -36,11 +40,29 @@ def api_token_required(func):
             www_authenticate['error'] = 'invalid_token'
             abort(401, www_authenticate=www_authenticate)
 
+        g.api_token = api_token
+
+        authn_api_request_count_service.increment_request_count(api_token.id)
+
+        if authn_api_rate_limit_service.is_enabled():
+            retry_after = authn_api_rate_limit_service.consume_request(
+                api_token, _get_endpoint_group()
+            )
+            if retry_after is not None:
+                abort(429, retry_after=retry_after)
+
         return func(*args, **kwargs)
 
     return wrapper
 
 
+def _get_endpoint_group() -> str:
+    """Return the name of the blueprint the requested endpoint belongs
+    to (e.g. `api_v1.ticketing`).
+    """
+    return request.blueprint or ''
+
+
 def _extract_token_from_request() -> str | None:
     if request.authorization is None or request.authorization.type != 'bearer':
         return None
@@ -12,6 +12,7 @@ from typing import Any
 from flask import current_app, g, render_template
 
 from byceps.util.authz import (
+    has_current_user_all_permissions,
     has_current_user_any_permission,
     has_current_user_permission,
 )
@@ -39,6 +40,7 @@ def inject_template_variables() -> dict[str, Any]:
         'now': datetime.utcnow(),
         'today': date.today(),
         'Navigation': Navigation,
+        'has_current_user_all_permissions': has_current_user_all_permissions,
         'has_current_user_any_permission': has_current_user_any_permission,
         'has_current_user_permission': has_current_user_permission,
     }
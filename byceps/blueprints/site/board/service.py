@@ -46,25 +46,23 @@ def add_unseen_postings_flag_to_categories(
     """Add flag to each category stating if it contains postings unseen
     by the user.
     """
-    categories_with_flag = []
+    categories = list(categories)
 
-    for category in categories:
-        contains_unseen_postings = (
-            user.authenticated
-            and board_last_view_service.contains_category_unseen_postings(
-                category, user.id
+    if user.authenticated:
+        unseen_flags_by_category_id = (
+            board_last_view_service.contains_categories_unseen_postings(
+                categories, user.id
             )
         )
+    else:
+        unseen_flags_by_category_id = {}
 
-        category_with_flag = (
-            CategoryWithLastUpdateAndUnseenFlag.from_category_with_last_update(
-                category, contains_unseen_postings
-            )
+    return [
+        CategoryWithLastUpdateAndUnseenFlag.from_category_with_last_update(
+            category, unseen_flags_by_category_id.get(category.id, False)
         )
-
-        categories_with_flag.append(category_with_flag)
-
-    return categories_with_flag
+        for category in categories
+    ]
 
 
 def add_topic_creators(db_topics: Iterable[DbTopic]) -> None:
@@ -82,13 +80,21 @@ def add_topic_unseen_flag(
     db_topics: Iterable[DbTopic], user: CurrentUser
 ) -> None:
     """Add `unseen` flag to topics."""
-    for db_topic in db_topics:
-        db_topic.contains_unseen_postings = (
-            user.authenticated
-            and board_last_view_service.contains_topic_unseen_postings(
-                db_topic, user.id
+    db_topics = list(db_topics)
+
+    if user.authenticated:
+        unseen_flags_by_topic_id = (
+            board_last_view_service.contains_topics_unseen_postings(
+                db_topics, user.id
             )
         )
+    else:
+        unseen_flags_by_topic_id = {}
+
+    for db_topic in db_topics:
+        db_topic.contains_unseen_postings = unseen_flags_by_topic_id.get(
+            db_topic.id, False
+        )
 
 
 def add_unseen_flag_to_postings(
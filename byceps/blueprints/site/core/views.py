@@ -14,10 +14,9 @@ from flask import current_app, g, request, url_for
 from flask_babel import get_locale
 import sentry_sdk
 
-from byceps.services.party import party_service
-from byceps.services.site import site_service
 from byceps.services.text_markup import text_markup_service
 from byceps.util.framework.blueprint import create_blueprint
+from byceps.util import request_context_cache
 from byceps.util.l10n import get_locales
 from byceps.util.user_session import get_current_user
 
@@ -42,7 +41,7 @@ def url_for_site_file(filename, **kwargs) -> str | None:
 @blueprint.before_app_request
 def prepare_request_globals() -> None:
     site_id = current_app.config['SITE_ID']
-    site = site_service.get_site(site_id)
+    site = request_context_cache.get_site(site_id)
     g.site = site
     g.site_id = site.id
     sentry_sdk.set_tag('site_id', g.site_id)
@@ -53,7 +52,7 @@ def prepare_request_globals() -> None:
     party = None
     party_id = site.party_id
     if party_id is not None:
-        party = party_service.get_party(party_id)
+        party = request_context_cache.get_party(party_id)
         party_id = party.id
     g.party = party
     g.party_id = party_id
@@ -15,6 +15,7 @@ from typing import Any
 from flask import abort, g, render_template, url_for
 from jinja2 import TemplateNotFound
 
+from byceps.blueprints.site.snippet import rendering_cache
 from byceps.blueprints.site.snippet.templating import (
     render_snippet_as_partial_from_template,
 )
@@ -32,9 +33,14 @@ Context = dict[str, Any]
 def render_page(page: Page, version: PageVersion) -> str | tuple[str, int]:
     """Render the page, or an error page if that fails."""
     try:
-        context = build_template_context(
-            version.title, version.head, version.body
+        context = rendering_cache.get_or_render_page_version(
+            version.id,
+            lambda: build_template_context(
+                version.title, version.head, version.body
+            ),
         )
+        # Copy to keep the cached context unmodified.
+        context = dict(context)
         context['current_page'] = page.current_page_id
 
         subnav_menu_id = _find_subnav_menu_id(page)
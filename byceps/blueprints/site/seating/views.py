@@ -8,16 +8,19 @@ byceps.blueprints.site.seating.views
 
 from typing import Any
 
-from flask import abort, g, request
+from flask import abort, g, jsonify, request, Response
 from flask_babel import gettext
 
 from byceps.blueprints.site.site.navigation import subnavigation_for_view
+from byceps.database import db
 from byceps.services.seating import (
+    seat_occupancy_feed_service,
+    seat_plan_service,
     seat_service,
     seating_area_service,
     seating_area_tickets_service,
 )
-from byceps.services.seating.models import Seat, SeatID, SeatingArea
+from byceps.services.seating.models import Seat, SeatID, SeatingArea, SeatPlan
 from byceps.services.ticketing import (
     errors as ticketing_errors,
     ticket_seat_management_service,
@@ -29,7 +32,12 @@ from byceps.util.authz import has_current_user_permission
 from byceps.util.framework.blueprint import create_blueprint
 from byceps.util.framework.flash import flash_error, flash_success
 from byceps.util.framework.templating import templated
-from byceps.util.views import login_required, redirect_to, respond_no_content
+from byceps.util.views import (
+    event_streamed,
+    login_required,
+    redirect_to,
+    respond_no_content,
+)
 
 
 blueprint = create_blueprint('seating', __name__)
@@ -84,25 +92,111 @@ def view_area(slug):
 def _render_view_area(area: SeatingArea) -> dict[str, Any]:
     seat_management_enabled = _is_seat_management_enabled()
 
-    seats_with_tickets = seat_service.get_seats_with_tickets_for_area(area.id)
-
-    users_by_id = seating_area_tickets_service.get_users(seats_with_tickets, [])
-
-    seats_and_tickets = seating_area_tickets_service.get_seats_and_tickets(
-        seats_with_tickets, users_by_id
-    )
+    seat_plan = seat_plan_service.get_seat_plan(area.id)
+    live_updates_enabled = seat_occupancy_feed_service.is_enabled()
 
     seat_utilization = seat_service.get_seat_utilization(g.party_id)
 
     return {
         'area': area,
         'seat_management_enabled': seat_management_enabled,
-        'seats_and_tickets': seats_and_tickets,
+        'seat_plan': seat_plan,
+        'seat_plan_live_updates_enabled': live_updates_enabled,
         'seat_utilization': seat_utilization,
         'manage_mode': False,
     }
 
 
+@blueprint.get('/areas/<slug>/seat_plan.json')
+def view_seat_plan_as_json(slug):
+    """Show the area's seats and which of them are occupied by whom
+    as JSON.
+
+    Clients can revalidate their copy via `If-None-Match`.
+    """
+    if g.party is None:
+        # No party is configured for the current site.
+        abort(404)
+
+    area = seating_area_service.find_area_for_party_by_slug(g.party_id, slug)
+    if area is None:
+        abort(404)
+
+    # Avoid loading the plan if the client's copy is still current.
+    version = seat_plan_service.get_seat_plan_version(area.id)
+    if (version is not None) and request.if_none_match.contains(version):
+        response = Response(status=304)
+        response.set_etag(version)
+        return response
+
+    seat_plan = seat_plan_service.get_seat_plan(area.id)
+
+    response = jsonify(_serialize_seat_plan(seat_plan))
+
+    if seat_plan.version is not None:
+        response.set_etag(seat_plan.version)
+    else:
+        response.add_etag()
+
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
+
+
+def _serialize_seat_plan(seat_plan: SeatPlan) -> dict[str, Any]:
+    return {
+        'seats': [
+            {
+                'id': str(seat.id),
+                'coord_x': seat.coord_x,
+                'coord_y': seat.coord_y,
+                'rotation': seat.rotation,
+                'label': seat.label,
+                'type': seat.type_,
+            }
+            for seat in seat_plan.seats
+        ],
+        'occupied_seats': [
+            seat_occupancy_feed_service.serialize_seat_occupancy(
+                seat_id, occupancy
+            )
+            for seat_id, occupancy in seat_plan.occupancies.items()
+        ],
+    }
+
+
+@blueprint.get('/areas/<slug>/seat_occupancy_updates')
+@event_streamed
+def stream_seat_occupancy_updates(slug):
+    """Stream changes of which seats in the area are occupied by whom
+    as server-sent events.
+    """
+    if not seat_occupancy_feed_service.is_enabled():
+        abort(404)
+
+    if g.party is None:
+        # No party is configured for the current site.
+        abort(404)
+
+    area = seating_area_service.find_area_for_party_by_slug(g.party_id, slug)
+    if area is None:
+        abort(404)
+
+    # Sent by clients on reconnect.
+    last_version = request.headers.get('Last-Event-ID') or request.args.get(
+        'version'
+    )
+
+    # Do not hold on to a database connection while streaming.
+    db.session.close()
+
+    return seat_occupancy_feed_service.stream_events(
+        area.id,
+        last_version,
+        lambda: seat_plan_service.get_seat_plan_version(area.id),
+    )
+
+
 @blueprint.get('/areas/<slug>/manage_seats')
 @login_required
 @templated('site/seating/view_area')
@@ -136,7 +230,8 @@ def manage_seats_in_area(slug):
     elif seat_management_enabled:
         seat_manager_id = g.user.id
 
-    seats_with_tickets = seat_service.get_seats_with_tickets_for_area(area.id)
+    seat_plan = seat_plan_service.get_seat_plan(area.id)
+    live_updates_enabled = seat_occupancy_feed_service.is_enabled()
 
     if seat_manager_id is not None:
         tickets = ticket_service.get_tickets_for_seat_manager(
@@ -145,15 +240,8 @@ def manage_seats_in_area(slug):
     else:
         tickets = []
 
-    users_by_id = seating_area_tickets_service.get_users(
-        seats_with_tickets, tickets
-    )
-
-    seats_and_tickets = seating_area_tickets_service.get_seats_and_tickets(
-        seats_with_tickets, users_by_id
-    )
-
     if seat_management_enabled:
+        users_by_id = seating_area_tickets_service.get_users([], tickets)
         managed_tickets = list(
             seating_area_tickets_service.get_managed_tickets(
                 tickets, users_by_id
@@ -166,7 +254,8 @@ def manage_seats_in_area(slug):
 
     return {
         'area': area,
-        'seats_and_tickets': seats_and_tickets,
+        'seat_plan': seat_plan,
+        'seat_plan_live_updates_enabled': live_updates_enabled,
         'seat_utilization': seat_utilization,
         'manage_mode': True,
         'seat_management_enabled': seat_management_enabled,
@@ -13,14 +13,21 @@ from moneyed import Currency
 from byceps.blueprints.site.site.navigation import subnavigation_for_view
 from byceps.services.country import country_service
 from byceps.services.shop.article import article_domain_service, article_service
-from byceps.services.shop.article.errors import NoArticlesAvailableError
+from byceps.services.shop.article.errors import (
+    ArticlesSoldOutError,
+    NoArticlesAvailableError,
+)
 from byceps.services.shop.article.models import ArticleCompilation
 from byceps.services.shop.cart.models import Cart
 from byceps.services.shop.order import order_checkout_service, order_service
 from byceps.services.shop.order.email import order_email_service
 from byceps.services.shop.order.models.order import Order
 from byceps.services.shop.shop import shop_service
-from byceps.services.shop.storefront import storefront_service
+from byceps.services.shop.storefront import (
+    storefront_admission_service,
+    storefront_service,
+)
+from byceps.services.shop.storefront.models import StorefrontAdmission
 from byceps.services.user import user_service
 from byceps.signals import shop as shop_signals
 from byceps.util.framework.blueprint import create_blueprint
@@ -54,6 +61,13 @@ def order_form(erroneous_form=None):
         flash_notice(gettext('The shop is closed.'))
         return {'article_compilation': None}
 
+    if g.user.authenticated:
+        admission = storefront_admission_service.get_admission(
+            storefront.id, g.user.id
+        )
+        if not admission.admitted:
+            return waiting_room(admission)
+
     article_compilation_result = (
         article_service.get_article_compilation_for_orderable_articles(shop.id)
     )
@@ -100,6 +114,19 @@ def list_articles(article_compilation):
     }
 
 
+# No route registered. Intended to be called from another view function.
+@templated
+@subnavigation_for_view('shop')
+def waiting_room(admission: StorefrontAdmission):
+    """Show the user's position in line to order."""
+    return {
+        'admission': admission,
+        'refresh_interval': (
+            storefront_admission_service.WAITING_ROOM_REFRESH_INTERVAL
+        ),
+    }
+
+
 @blueprint.post('/order')
 @login_required
 def order():
@@ -111,6 +138,9 @@ def order():
         flash_notice(gettext('The shop is closed.'))
         return order_form()
 
+    if not _is_admitted(storefront):
+        return redirect_to('.order_form')
+
     article_compilation_result = (
         article_service.get_article_compilation_for_orderable_articles(shop.id)
     )
@@ -143,7 +173,7 @@ def order():
 
     placement_result = _place_order(storefront, orderer, cart)
     if placement_result.is_err():
-        flash_error(gettext('Placing the order has failed.'))
+        _flash_order_placement_error(placement_result.unwrap_err())
         return order_form(form)
 
     order = placement_result.unwrap()
@@ -176,6 +206,12 @@ def order_single_form(article_id, erroneous_form=None):
             'article': None,
         }
 
+    admission = storefront_admission_service.get_admission(
+        storefront.id, user.id
+    )
+    if not admission.admitted:
+        return waiting_room(admission)
+
     article_compilation = (
         article_service.get_article_compilation_for_single_article(article.id)
     )
@@ -227,6 +263,9 @@ def order_single(article_id):
         flash_notice(gettext('The shop is closed.'))
         return order_single_form(article.id)
 
+    if not _is_admitted(storefront):
+        return redirect_to('.order_single_form', article_id=article.id)
+
     if article.not_directly_orderable:
         flash_error(gettext('The article cannot be ordered directly.'))
         return order_single_form(article.id)
@@ -260,7 +299,7 @@ def order_single(article_id):
 
     placement_result = _place_order(storefront, orderer, cart)
     if placement_result.is_err():
-        flash_error(gettext('Placing the order has failed.'))
+        _flash_order_placement_error(placement_result.unwrap_err())
         return order_form(form)
 
     order = placement_result.unwrap()
@@ -278,6 +317,13 @@ def _get_storefront_or_404():
     return storefront_service.get_storefront(storefront_id)
 
 
+def _is_admitted(storefront) -> bool:
+    admission = storefront_admission_service.get_admission(
+        storefront.id, g.user.id
+    )
+    return admission.admitted
+
+
 def _get_article_or_404(article_id):
     article = article_service.find_db_article(article_id)
 
@@ -299,15 +345,21 @@ def _create_cart_from_article_compilation(
     return cart
 
 
-def _place_order(storefront, orderer, cart) -> Result[Order, None]:
+def _place_order(
+    storefront, orderer, cart
+) -> Result[Order, ArticlesSoldOutError | None]:
     placement_result = order_checkout_service.place_order(
         storefront, orderer, cart
     )
     if placement_result.is_err():
-        return Err(None)
+        return Err(placement_result.unwrap_err())
 
     order, event = placement_result.unwrap()
 
+    storefront_admission_service.release_admission(
+        storefront.id, orderer.user.id
+    )
+
     order_email_service.send_email_for_incoming_order_to_orderer(order)
 
     shop_signals.order_placed.send(None, event=event)
@@ -315,6 +367,18 @@ def _place_order(storefront, orderer, cart) -> Result[Order, None]:
     return Ok(order)
 
 
+def _flash_order_placement_error(error: ArticlesSoldOutError | None) -> None:
+    if isinstance(error, ArticlesSoldOutError):
+        flash_error(
+            gettext(
+                'Not enough units of some of the selected articles are '
+                'available anymore.'
+            )
+        )
+    else:
+        flash_error(gettext('Placing the order has failed.'))
+
+
 def _flash_order_success(order):
     flash_success(
         gettext(
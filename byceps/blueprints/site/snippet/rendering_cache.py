@@ -0,0 +1,376 @@
+"""
+byceps.blueprints.site.snippet.rendering_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cache rendered snippet and page versions.
+
+Versions are immutable, so rendered output is keyed by version ID (plus
+locale and site, which affect nested snippets and page URLs).
+
+Snippets embedded via `render_snippet` are recorded as dependencies of
+the output that embeds them. A cache entry is only used as long as the
+current versions of its dependencies are unchanged.
+
+The mapping from snippet names to current versions is cached, too, and
+invalidated via generation counters (per snippet scope and per site for
+pages) that are bumped on snippet and page changes.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from flask import current_app, g
+from redis.exceptions import RedisError
+import structlog
+
+from byceps.events.page import (
+    PageCreatedEvent,
+    PageDeletedEvent,
+    PageUpdatedEvent,
+)
+from byceps.events.snippet import (
+    SnippetCreatedEvent,
+    SnippetDeletedEvent,
+    SnippetUpdatedEvent,
+)
+from byceps.services.page.models import PageVersionID
+from byceps.services.site.models import SiteID
+from byceps.services.snippet import snippet_service
+from byceps.services.snippet.models import SnippetScope, SnippetVersionID
+from byceps.signals import page as page_signals, snippet as snippet_signals
+from byceps.util.cache import GenerationCounters, LocalCache, RedisCache
+from byceps.util.l10n import get_current_user_locale, get_default_locale
+
+
+log = structlog.get_logger()
+
+
+_GENERATION_KEY_PREFIX = 'byceps:rendering_cache:generation'
+_VALUE_KEY_PREFIX = 'byceps:rendering_cache:value'
+
+_local_cache = LocalCache(maxsize=2048)
+_generation_counters = GenerationCounters(_GENERATION_KEY_PREFIX)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CurrentSnippetVersion:
+    id: SnippetVersionID
+    body: str
+
+
+@dataclass(frozen=True)
+class _Dependency:
+    """A snippet that has been looked up by name during rendering."""
+
+    scope: SnippetScope
+    name: str
+    language_code: str
+    version_id: SnippetVersionID | None
+
+
+@dataclass(frozen=True)
+class _RenderedContent:
+    content: Any
+    dependencies: frozenset[_Dependency]
+
+
+def is_enabled() -> bool:
+    """Return `True` if the rendering cache is enabled."""
+    return _get_backend_name() is not None
+
+
+def _get_backend_name() -> str | None:
+    return current_app.config.get('RENDERING_CACHE_BACKEND')
+
+
+# -------------------------------------------------------------------- #
+# lookup
+
+
+def find_current_snippet_version(
+    scope: SnippetScope, name: str, language_code: str
+) -> CurrentSnippetVersion | None:
+    """Return the current version of the snippet with that name and
+    language code in that scope, or `None` if not found.
+
+    The lookup is recorded as a dependency of the content currently
+    being rendered, if any.
+    """
+    version = _find_current_snippet_version(scope, name, language_code)
+
+    version_id = version.id if (version is not None) else None
+    _record_dependency(_Dependency(scope, name, language_code, version_id))
+
+    return version
+
+
+def _find_current_snippet_version(
+    scope: SnippetScope, name: str, language_code: str
+) -> CurrentSnippetVersion | None:
+    if not is_enabled():
+        return _load_current_snippet_version(scope, name, language_code)
+
+    try:
+        [generation] = _get_generations([_get_snippet_scope_namespace(scope)])
+    except RedisError as e:
+        log.warning('Rendering cache unavailable', error=str(e))
+        return _load_current_snippet_version(scope, name, language_code)
+
+    key = (
+        f'snippet:{scope.type_}/{scope.name}:{name}:{language_code}'
+        f':{generation}'
+    )
+
+    # Wrap value to be able to cache unknown snippets, too.
+    wrapped_version = _get_value(key)
+    if wrapped_version is _MISSING:
+        wrapped_version = (
+            _load_current_snippet_version(scope, name, language_code),
+        )
+        _set_value(key, wrapped_version)
+
+    return wrapped_version[0]
+
+
+def _load_current_snippet_version(
+    scope: SnippetScope, name: str, language_code: str
+) -> CurrentSnippetVersion | None:
+    db_version = snippet_service.find_current_version_of_snippet_with_name(
+        scope, name, language_code
+    )
+
+    if db_version is None:
+        return None
+
+    return CurrentSnippetVersion(id=db_version.id, body=db_version.body)
+
+
+def get_or_render_snippet_version(
+    version_id: SnippetVersionID, render: Callable[[], str]
+) -> str:
+    """Return the rendered snippet version from the cache, or render
+    and cache it.
+    """
+    if not is_enabled():
+        return render()
+
+    # Nested snippets depend on locale and site.
+    key = f'snippet_version:{version_id}:{_get_locale()}:{g.site_id}'
+
+    return _get_or_render(key, render)
+
+
+def get_or_render_page_version(
+    version_id: PageVersionID, render: Callable[[], Any]
+) -> Any:
+    """Return the rendered page version content from the cache, or
+    render and cache it.
+    """
+    if not is_enabled():
+        return render()
+
+    # Page URLs depend on other pages of the site.
+    try:
+        site_id = g.site_id
+        [generation] = _get_generations([_get_pages_namespace(site_id)])
+    except RedisError as e:
+        log.warning('Rendering cache unavailable', error=str(e))
+        return render()
+
+    key = f'page_version:{version_id}:{_get_locale()}:{site_id}:{generation}'
+
+    return _get_or_render(key, render)
+
+
+def _get_or_render(key: str, render: Callable[[], Any]) -> Any:
+    rendered = _get_value(key)
+    if (rendered is not _MISSING) and _are_dependencies_current(
+        rendered.dependencies
+    ):
+        # Make nested dependencies known to enclosing renderings.
+        for dependency in rendered.dependencies:
+            _record_dependency(dependency)
+
+        return rendered.content
+
+    dependencies: set[_Dependency] = set()
+    recorders = _get_dependency_recorders()
+    recorders.append(dependencies)
+    try:
+        # Dependencies are recorded by enclosing renderings as well.
+        content = render()
+    finally:
+        recorders.pop()
+
+    _set_value(key, _RenderedContent(content, frozenset(dependencies)))
+
+    return content
+
+
+def _are_dependencies_current(dependencies: frozenset[_Dependency]) -> bool:
+    for dependency in dependencies:
+        version = _find_current_snippet_version(
+            dependency.scope, dependency.name, dependency.language_code
+        )
+        version_id = version.id if (version is not None) else None
+        if version_id != dependency.version_id:
+            return False
+
+    return True
+
+
+def _record_dependency(dependency: _Dependency) -> None:
+    for dependencies in _get_dependency_recorders():
+        dependencies.add(dependency)
+
+
+def _get_dependency_recorders() -> list[set[_Dependency]]:
+    return g.setdefault('rendering_cache_dependency_recorders', [])
+
+
+def _get_locale() -> str:
+    return get_current_user_locale() or get_default_locale()
+
+
+def _get_generations(namespaces: list[str]) -> list[int]:
+    prefetch = []
+    site_id = g.get('site_id')
+    if site_id is not None:
+        # Likely needed in the same request.
+        prefetch.append(_get_pages_namespace(site_id))
+        prefetch.append(
+            _get_snippet_scope_namespace(SnippetScope.for_site(site_id))
+        )
+
+    return _generation_counters.get(namespaces, prefetch=prefetch)
+
+
+# -------------------------------------------------------------------- #
+# storage
+
+
+def _get_value(key: str) -> Any:
+    value = _local_cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    redis_cache = _get_redis_cache()
+    if redis_cache is None:
+        return _MISSING
+
+    try:
+        value = redis_cache.get(key, _MISSING)
+    except RedisError as e:
+        log.warning('Rendering cache unavailable', error=str(e))
+        return _MISSING
+
+    if value is not _MISSING:
+        _local_cache.set(key, value, ttl=_get_ttl())
+
+    return value
+
+
+def _set_value(key: str, value: Any) -> None:
+    _local_cache.set(key, value, ttl=_get_ttl())
+
+    redis_cache = _get_redis_cache()
+    if redis_cache is None:
+        return
+
+    try:
+        redis_cache.set(key, value)
+    except RedisError as e:
+        log.warning('Could not store rendering in cache', error=str(e))
+
+
+def _get_redis_cache() -> RedisCache | None:
+    if _get_backend_name() != 'redis':
+        return None
+
+    return RedisCache(current_app.redis_client, _VALUE_KEY_PREFIX, _get_ttl())
+
+
+def _get_ttl() -> int:
+    return current_app.config['RENDERING_CACHE_TTL']
+
+
+# -------------------------------------------------------------------- #
+# invalidation
+
+
+def invalidate_snippet_scope(scope: SnippetScope) -> None:
+    """Invalidate the cached current versions of snippets in that
+    scope (and thus everything rendered from them).
+    """
+    _bump_generation(_get_snippet_scope_namespace(scope))
+
+
+def invalidate_pages_for_site(site_id: SiteID) -> None:
+    """Invalidate rendered pages and snippets of that site."""
+    _bump_generation(_get_pages_namespace(site_id))
+
+
+def _bump_generation(namespace: str) -> None:
+    if not is_enabled():
+        return
+
+    try:
+        _generation_counters.bump(namespace)
+    except RedisError as e:
+        log.error(
+            'Could not invalidate rendering cache',
+            namespace=namespace,
+            error=str(e),
+        )
+
+
+def clear() -> None:
+    """Remove all entries cached by this process."""
+    _local_cache.clear()
+
+
+def _get_snippet_scope_namespace(scope: SnippetScope) -> str:
+    return f'snippets:{scope.type_}/{scope.name}'
+
+
+def _get_pages_namespace(site_id: SiteID) -> str:
+    return f'pages:{site_id}'
+
+
+def enable_invalidation() -> None:
+    """Connect signals that indicate changes to snippets and pages."""
+    for signal in [
+        snippet_signals.snippet_created,
+        snippet_signals.snippet_updated,
+        snippet_signals.snippet_deleted,
+    ]:
+        signal.connect(_on_snippet_changed)
+
+    for signal in [
+        page_signals.page_created,
+        page_signals.page_updated,
+        page_signals.page_deleted,
+    ]:
+        signal.connect(_on_page_changed)
+
+
+def _on_snippet_changed(
+    sender,
+    *,
+    event: SnippetCreatedEvent | SnippetUpdatedEvent | SnippetDeletedEvent,
+) -> None:
+    invalidate_snippet_scope(event.scope)
+
+
+def _on_page_changed(
+    sender, *, event: PageCreatedEvent | PageUpdatedEvent | PageDeletedEvent
+) -> None:
+    invalidate_pages_for_site(event.site_id)
@@ -19,6 +19,8 @@ from byceps.services.snippet.models import SnippetScope
 from byceps.util.l10n import get_current_user_locale, get_default_locale
 from byceps.util.templating import load_template
 
+from . import rendering_cache
+
 
 Context = dict[str, Any]
 
@@ -74,7 +76,7 @@ def render_snippet_as_partial(
     if scope is None:
         scope = SnippetScope.for_site(g.site_id)
 
-    current_version = snippet_service.find_current_version_of_snippet_with_name(
+    current_version = rendering_cache.find_current_snippet_version(
         scope, name, language_code
     )
 
@@ -86,10 +88,13 @@ def render_snippet_as_partial(
                 scope, name, language_code
             )
 
-    if context is None:
-        context = {}
+    if context:
+        # Output depends on the given context and cannot be cached.
+        return _render_template(current_version.body, context=context)
 
-    return _render_template(current_version.body, context=context)
+    return rendering_cache.get_or_render_snippet_version(
+        current_version.id, lambda: _render_template(current_version.body)
+    )
 
 
 def _render_template(source, *, context: Context | None = None) -> str:
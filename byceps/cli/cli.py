@@ -16,10 +16,12 @@ from .commands.create_demo_data import create_demo_data
 from .commands.create_superuser import create_superuser
 from .commands.export_roles import export_roles
 from .commands.generate_secret_key import generate_secret_key
+from .commands.hash_api_tokens import hash_api_tokens
 from .commands.import_roles import import_roles
 from .commands.import_seats import import_seats
 from .commands.import_users import import_users
 from .commands.initialize_database import initialize_database
+from .commands.reaggregate_board import reaggregate_board
 from .commands.shell import shell
 
 
@@ -34,10 +36,12 @@ for func in [
     create_superuser,
     export_roles,
     generate_secret_key,
+    hash_api_tokens,
     import_roles,
     import_seats,
     import_users,
     initialize_database,
+    reaggregate_board,
     shell,
 ]:
     cli.add_command(func)
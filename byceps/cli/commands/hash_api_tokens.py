@@ -0,0 +1,24 @@
+"""
+byceps.cli.command.hash_api_tokens
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Store the hashes of API tokens created before API tokens were looked up
+by their hash.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from byceps.services.authn.api import authn_api_service
+
+
+@click.command()
+@with_appcontext
+def hash_api_tokens() -> None:
+    """Store the hashes of API tokens that lack them."""
+    hashed_count = authn_api_service.hash_unhashed_api_tokens()
+
+    click.secho(f'Hashed {hashed_count} API token(s).', fg='green')
@@ -0,0 +1,65 @@
+"""
+byceps.cli.command.reaggregate_board
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Check (and fix) the count and latest posting fields of a board's
+topics and categories.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from byceps.services.board import board_aggregation_service, board_service
+from byceps.services.board.board_aggregation_service import (
+    AggregationInconsistency,
+    CategoryAggregationInconsistency,
+    TopicAggregationInconsistency,
+)
+from byceps.services.board.models import BoardID
+
+
+@click.command()
+@click.argument('board_id')
+@click.option(
+    '--check-only',
+    is_flag=True,
+    help='only report inconsistencies, do not fix them',
+)
+@with_appcontext
+def reaggregate_board(board_id: BoardID, check_only: bool) -> None:
+    """Recount topics and postings of a board."""
+    board = board_service.find_board(board_id)
+    if board is None:
+        raise click.BadParameter(f'Unknown board ID "{board_id}"')
+
+    if check_only:
+        inconsistencies = board_aggregation_service.find_inconsistencies(
+            board.id
+        )
+    else:
+        inconsistencies = board_aggregation_service.reaggregate_board(board.id)
+
+    for inconsistency in inconsistencies:
+        click.echo(_format_inconsistency(inconsistency))
+
+    if not inconsistencies:
+        click.secho('No inconsistencies found.', fg='green')
+    elif check_only:
+        click.secho(
+            f'Found {len(inconsistencies)} inconsistencies.', fg='yellow'
+        )
+    else:
+        click.secho(
+            f'Fixed {len(inconsistencies)} inconsistencies.', fg='green'
+        )
+
+
+def _format_inconsistency(inconsistency: AggregationInconsistency) -> str:
+    match inconsistency:
+        case TopicAggregationInconsistency(topic_id, stored, actual):
+            return f'topic {topic_id}: stored {stored}, actual {actual}'
+        case CategoryAggregationInconsistency(category_id, stored, actual):
+            return f'category {category_id}: stored {stored}, actual {actual}'
@@ -19,12 +19,39 @@ SQLALCHEMY_ECHO = False
 # unreachable, then becomes reachable again.
 SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
 
+# API rate limit
+API_RATE_LIMIT_ENABLED = False
+API_RATE_LIMIT = 60  # requests per minute, per API token and endpoint group
+
+# API token cache
+API_TOKEN_CACHE_ENABLED = False
+API_TOKEN_CACHE_TTL = 60  # seconds
+
+# board
+BOARD_TOPIC_VIEWS_WRITE_BEHIND = False
+BOARD_TOPIC_VIEWS_FLUSH_DELAY = 10  # seconds
+
 # job queue
 JOBS_ASYNC = True
 
 # metrics
 METRICS_ENABLED = False
 
+# party statistics snapshots
+PARTY_STATS_SNAPSHOTS_ENABLED = False
+PARTY_STATS_SNAPSHOTS_MAX_AGE = 300  # seconds
+PARTY_STATS_SNAPSHOTS_REFRESH_DELAY = 10  # seconds
+PARTY_STATS_SNAPSHOTS_REFRESH_INTERVAL = 60  # seconds
+
+# rendering cache for pages and snippets (`None`, 'local', or 'redis')
+RENDERING_CACHE_BACKEND = None
+RENDERING_CACHE_TTL = 300  # seconds
+
+# request context cache
+REQUEST_CONTEXT_CACHE_ENABLED = False
+REQUEST_CONTEXT_CACHE_REDIS_ENABLED = False
+REQUEST_CONTEXT_CACHE_TTL = 60  # seconds
+
 # RQ dashboard (for job queue)
 RQ_DASHBOARD_POLL_INTERVAL = 2500
 RQ_DASHBOARD_WEB_BACKGROUND = 'white'
@@ -47,5 +74,24 @@ PATH_DATA = Path('./data')
 # Limit incoming request content.
 MAX_CONTENT_LENGTH = 4000000
 
+# seating
+SEATING_PLAN_CACHE_ENABLED = False
+SEATING_PLAN_CACHE_TTL = 300  # seconds
+SEATING_PLAN_LIVE_UPDATES_ENABLED = False
+
 # shop
+SHOP_ARTICLE_CACHE_ENABLED = False
+SHOP_ARTICLE_CACHE_TTL = 300  # seconds
+SHOP_ORDER_ADMISSION_LIMIT = None  # concurrent buyers per storefront
+SHOP_ORDER_ADMISSION_TTL = 600  # seconds
 SHOP_ORDER_EXPORT_TIMEZONE = 'Europe/Berlin'
+SHOP_ORDER_NUMBER_BLOCK_SIZE = 1
+
+# ticketing
+TICKET_CODE_GENERATOR = 'random'  # or 'permutation'
+TICKET_CODE_MAX_FILL_RATIO = 0.01
+
+# outgoing webhooks
+WEBHOOK_CACHE_TTL = 300  # seconds
+WEBHOOK_MIN_CALL_INTERVAL = 0.5  # seconds, per endpoint
+WEBHOOK_MAX_RETRIES = 3
@@ -21,6 +21,8 @@ from sqlalchemy.sql import Select
 from sqlalchemy.sql.dml import Insert
 from sqlalchemy.sql.schema import Table
 
+from byceps.util.iterables import chunk
+
 
 F = TypeVar('F')
 T = TypeVar('T')
@@ -38,6 +40,11 @@ db = SQLAlchemy(model_class=Base)
 db.JSONB = JSONB
 
 
+# Maximum number of rows per statement for bulk operations. Keeps the
+# number of bind parameters well below PostgreSQL's limit.
+BULK_CHUNK_SIZE = 1000
+
+
 def paginate(
     stmt: Select,
     page: int,
@@ -70,6 +77,30 @@ def insert_ignore_on_conflict(table: Table, values: dict[str, Any]) -> None:
     db.session.commit()
 
 
+def insert_ignore_many_on_conflict(
+    table: Table, rows: Iterable[dict[str, Any]]
+) -> None:
+    """Insert the records identified by their primary keys (specified as
+    part of the values), or do nothing for those that already exist.
+
+    Rows are inserted in chunks, with one statement per chunk. If
+    multiple rows have the same primary key, the first one wins.
+    """
+    rows_by_primary_key = _index_rows_by_primary_key(
+        table, rows, first_wins=True
+    )
+
+    for rows_chunk in chunk(rows_by_primary_key.values(), BULK_CHUNK_SIZE):
+        query = (
+            insert(table)
+            .values(rows_chunk)
+            .on_conflict_do_nothing(constraint=table.primary_key)
+        )
+        db.session.execute(query)
+
+    db.session.commit()
+
+
 def upsert(
     table: Table, identifier: dict[str, Any], replacement: dict[str, Any]
 ) -> None:
@@ -85,15 +116,67 @@ def upsert_many(
     identifiers: Iterable[dict[str, Any]],
     replacement: dict[str, Any],
 ) -> None:
-    """Insert or update the record identified by `identifier` with value
-    `replacement`.
+    """Insert or update the records identified by `identifiers` with
+    value `replacement`.
+
+    Records are upserted in chunks, with one statement per chunk.
     """
-    for identifier in identifiers:
-        execute_upsert(table, identifier, replacement)
+    rows = (identifier | replacement for identifier in identifiers)
 
+    execute_upsert_many(table, rows, replacement.keys())
     db.session.commit()
 
 
+def execute_upsert_many(
+    table: Table,
+    rows: Iterable[dict[str, Any]],
+    replacement_column_names: Iterable[str],
+) -> None:
+    """Execute, but do not commit, an UPSERT for multiple records.
+
+    Each row has to contain the primary key as well as the values to
+    insert. On conflict, the columns with the given names are updated
+    with the values from the row.
+
+    If multiple rows have the same primary key, the last one wins.
+    """
+    replacement_column_names = list(replacement_column_names)
+
+    # A single statement must not affect a row more than once.
+    rows_by_primary_key = _index_rows_by_primary_key(table, rows)
+
+    for rows_chunk in chunk(rows_by_primary_key.values(), BULK_CHUNK_SIZE):
+        insert_query = insert(table).values(rows_chunk)
+        query = insert_query.on_conflict_do_update(
+            constraint=table.primary_key,
+            set_={
+                name: insert_query.excluded[name]
+                for name in replacement_column_names
+            },
+        )
+        db.session.execute(query)
+
+
+def _index_rows_by_primary_key(
+    table: Table, rows: Iterable[dict[str, Any]], *, first_wins: bool = False
+) -> dict[tuple[Any, ...], dict[str, Any]]:
+    """Index the rows by their primary key values, keeping only the last
+    (or first) of those with the same primary key.
+    """
+    primary_key_column_names = [
+        column.name for column in table.primary_key.columns
+    ]
+
+    rows_by_primary_key: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for row in rows:
+        primary_key = tuple(row[name] for name in primary_key_column_names)
+        if first_wins and (primary_key in rows_by_primary_key):
+            continue
+        rows_by_primary_key[primary_key] = row
+
+    return rows_by_primary_key
+
+
 def execute_upsert(
     table: Table, identifier: dict[str, Any], replacement: dict[str, Any]
 ) -> None:
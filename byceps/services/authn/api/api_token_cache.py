@@ -0,0 +1,54 @@
+"""
+byceps.services.authn.api.api_token_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cache API tokens (including their suspension state and permissions) by
+token hash, per process.
+
+Whenever an API token is suspended, unsuspended, or deleted, all cached
+tokens are invalidated in all processes.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from byceps.util.cache import GenerationalCache
+
+from .models import ApiToken
+
+
+_NAMESPACE = 'api_tokens'
+
+_cache = GenerationalCache(
+    'API token',
+    'byceps:authn:api_tokens:generation',
+    maxsize=256,
+    ttl_config_key='API_TOKEN_CACHE_TTL',
+    enabled_config_key='API_TOKEN_CACHE_ENABLED',
+)
+
+
+def get_or_load(
+    token_hash: str, load: Callable[[], ApiToken | None]
+) -> ApiToken | None:
+    """Return the cached API token for the token hash, or load, cache,
+    and return it.
+
+    Unknown tokens are not cached, so that clients sending random tokens
+    cannot evict those of other clients.
+    """
+    return _cache.get_or_load(token_hash, [_NAMESPACE], load, cache_none=False)
+
+
+def invalidate() -> None:
+    """Make all processes reload API tokens."""
+    _cache.invalidate(_NAMESPACE)
+
+
+def clear() -> None:
+    """Remove all entries cached by this process."""
+    _cache.clear()
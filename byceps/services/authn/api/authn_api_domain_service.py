@@ -9,6 +9,7 @@ byceps.services.authn.api.authn_api_domain_service
 from __future__ import annotations
 
 from datetime import datetime
+from hashlib import sha256
 from secrets import token_urlsafe
 
 from byceps.services.authz.models import PermissionID
@@ -24,6 +25,7 @@ def create_api_token(
     *,
     num_bytes: int = 40,
     description: str | None = None,
+    rate_limit: int | None = None,
 ) -> ApiToken:
     """Create an API token."""
     api_token_id = generate_uuid7()
@@ -38,4 +40,14 @@ def create_api_token(
         permissions=frozenset(permissions),
         description=description,
         suspended=False,
+        rate_limit=rate_limit,
     )
+
+
+def hash_token(token: str) -> str:
+    """Return the hash by which the API token is looked up.
+
+    Tokens are random and long enough that a fast, unsalted hash
+    suffices.
+    """
+    return sha256(token.encode()).hexdigest()
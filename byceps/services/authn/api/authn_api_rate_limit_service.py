@@ -0,0 +1,147 @@
+"""
+byceps.services.authn.api.authn_api_rate_limit_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Limit the rate of API requests per API token and endpoint group.
+
+Each combination of API token and endpoint group has a token bucket in
+Redis that holds up to one minute's worth of requests and refills
+continuously at the token's rate limit.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from math import ceil
+from time import time
+from uuid import UUID
+
+from flask import current_app
+from redis.client import Pipeline
+from redis.exceptions import RedisError
+import structlog
+
+from .models import ApiToken
+
+
+log = structlog.get_logger()
+
+
+_BUCKET_KEY_PREFIX = 'byceps:authn:api_tokens:rate_limit'
+_THROTTLED_REQUEST_COUNTS_KEY = (
+    'byceps:authn:api_tokens:throttled_request_counts'
+)
+
+# A bucket is full again after a minute without requests, so it can
+# be discarded by then.
+_BUCKET_TTL = 60  # seconds
+
+
+def is_enabled() -> bool:
+    """Return `True` if API requests are rate-limited."""
+    return current_app.config['API_RATE_LIMIT_ENABLED']
+
+
+def get_rate_limit(api_token: ApiToken) -> int:
+    """Return the number of requests per minute permitted for the API
+    token (per endpoint group).
+    """
+    if api_token.rate_limit is not None:
+        return api_token.rate_limit
+
+    return current_app.config['API_RATE_LIMIT']
+
+
+def consume_request(api_token: ApiToken, endpoint_group: str) -> int | None:
+    """Take a request from the API token's bucket for the endpoint
+    group.
+
+    Return `None` if the request may be processed, or the number of
+    seconds after which the request may be retried.
+
+    Requests are permitted if Redis is unavailable.
+    """
+    rate_limit = get_rate_limit(api_token)
+    key = f'{_BUCKET_KEY_PREFIX}:{api_token.id}:{endpoint_group}'
+
+    try:
+        retry_after = current_app.redis_client.transaction(
+            partial(_take_from_bucket, key, rate_limit),
+            key,
+            value_from_callable=True,
+        )
+    except RedisError as e:
+        log.warning(
+            'Could not apply API rate limit',
+            api_token_id=str(api_token.id),
+            endpoint_group=endpoint_group,
+            error=str(e),
+        )
+        return None
+
+    if retry_after is not None:
+        _count_throttled_request(api_token.id, endpoint_group)
+
+    return retry_after
+
+
+def _take_from_bucket(key: str, rate_limit: int, pipe: Pipeline) -> int | None:
+    capacity = float(rate_limit)
+    refill_rate = rate_limit / 60  # per second
+    now = time()
+
+    tokens_value, updated_at_value = pipe.hmget(key, ['tokens', 'updated_at'])
+    if tokens_value is None or updated_at_value is None:
+        tokens = capacity
+    else:
+        elapsed = max(now - float(updated_at_value), 0.0)
+        tokens = min(float(tokens_value) + elapsed * refill_rate, capacity)
+
+    if tokens >= 1:
+        tokens -= 1
+        retry_after = None
+    else:
+        retry_after = ceil((1 - tokens) / refill_rate)
+
+    pipe.multi()
+    pipe.hset(key, mapping={'tokens': tokens, 'updated_at': now})
+    pipe.expire(key, _BUCKET_TTL)
+
+    return retry_after
+
+
+def _count_throttled_request(api_token_id: UUID, endpoint_group: str) -> None:
+    try:
+        current_app.redis_client.hincrby(
+            _THROTTLED_REQUEST_COUNTS_KEY, f'{api_token_id}:{endpoint_group}', 1
+        )
+    except RedisError as e:
+        log.warning(
+            'Could not count throttled API request',
+            api_token_id=str(api_token_id),
+            error=str(e),
+        )
+
+
+def get_throttled_request_counts() -> dict[tuple[UUID, str], int]:
+    """Return the number of throttled requests, indexed by API token ID
+    and endpoint group.
+    """
+    try:
+        counts = current_app.redis_client.hgetall(_THROTTLED_REQUEST_COUNTS_KEY)
+    except RedisError as e:
+        log.warning(
+            'Could not obtain throttled API request counts', error=str(e)
+        )
+        return {}
+
+    counts_by_token_id_and_endpoint_group = {}
+    for field, count in counts.items():
+        api_token_id_str, endpoint_group = field.decode().split(':', 1)
+        key = (UUID(api_token_id_str), endpoint_group)
+        counts_by_token_id_and_endpoint_group[key] = int(count)
+
+    return counts_by_token_id_and_endpoint_group
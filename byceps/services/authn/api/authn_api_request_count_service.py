@@ -0,0 +1,67 @@
+"""
+byceps.services.authn.api.authn_api_request_count_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Count the API requests made with each API token.
+
+Counts are kept in Redis, shared by all API application processes.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from flask import current_app
+from redis.exceptions import RedisError
+import structlog
+
+
+log = structlog.get_logger()
+
+
+_REQUEST_COUNTS_KEY = 'byceps:authn:api_tokens:request_counts'
+
+
+def increment_request_count(api_token_id: UUID) -> None:
+    """Count a request made with the API token."""
+    try:
+        current_app.redis_client.hincrby(
+            _REQUEST_COUNTS_KEY, str(api_token_id), 1
+        )
+    except RedisError as e:
+        log.warning(
+            'Could not count API request',
+            api_token_id=str(api_token_id),
+            error=str(e),
+        )
+
+
+def get_request_counts() -> dict[UUID, int]:
+    """Return the number of requests made with each API token, indexed
+    by API token ID.
+    """
+    try:
+        counts = current_app.redis_client.hgetall(_REQUEST_COUNTS_KEY)
+    except RedisError as e:
+        log.warning('Could not obtain API request counts', error=str(e))
+        return {}
+
+    return {
+        UUID(api_token_id.decode()): int(count)
+        for api_token_id, count in counts.items()
+    }
+
+
+def delete_request_count(api_token_id: UUID) -> None:
+    """Delete the request count of the API token."""
+    try:
+        current_app.redis_client.hdel(_REQUEST_COUNTS_KEY, str(api_token_id))
+    except RedisError as e:
+        log.warning(
+            'Could not delete API request count',
+            api_token_id=str(api_token_id),
+            error=str(e),
+        )
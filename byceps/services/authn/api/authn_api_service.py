@@ -16,7 +16,11 @@ from byceps.database import db
 from byceps.services.authz.models import PermissionID
 from byceps.services.user.models.user import UserID
 
-from . import authn_api_domain_service
+from . import (
+    api_token_cache,
+    authn_api_domain_service,
+    authn_api_request_count_service,
+)
 from .dbmodels import DbApiToken
 from .models import ApiToken
 
@@ -26,10 +30,14 @@ def create_api_token(
     permissions: set[PermissionID],
     *,
     description: str | None = None,
+    rate_limit: int | None = None,
 ) -> ApiToken:
     """Create an API token."""
     api_token = authn_api_domain_service.create_api_token(
-        creator_id, permissions, description=description
+        creator_id,
+        permissions,
+        description=description,
+        rate_limit=rate_limit,
     )
 
     _persist_api_token(api_token)
@@ -43,9 +51,11 @@ def _persist_api_token(api_token: ApiToken) -> None:
         api_token.created_at,
         api_token.creator_id,
         api_token.token,
+        authn_api_domain_service.hash_token(api_token.token),
         api_token.permissions,
         api_token.description,
         api_token.suspended,
+        api_token.rate_limit,
     )
     db.session.add(db_api_token)
     db.session.commit()
@@ -53,8 +63,16 @@ def _persist_api_token(api_token: ApiToken) -> None:
 
 def find_api_token_by_token(token: str) -> ApiToken | None:
     """Return the API token for that token, or nothing if not found."""
+    token_hash = authn_api_domain_service.hash_token(token)
+
+    return api_token_cache.get_or_load(
+        token_hash, lambda: _find_api_token_by_token_hash(token_hash)
+    )
+
+
+def _find_api_token_by_token_hash(token_hash: str) -> ApiToken | None:
     db_api_token = db.session.execute(
-        select(DbApiToken).filter_by(token=token)
+        select(DbApiToken).filter_by(token_hash=token_hash)
     ).scalar_one_or_none()
 
     if db_api_token is None:
@@ -63,6 +81,26 @@ def find_api_token_by_token(token: str) -> ApiToken | None:
     return _db_entity_to_api_token(db_api_token)
 
 
+def hash_unhashed_api_tokens() -> int:
+    """Store the hashes of API tokens created before tokens were looked
+    up by their hash.
+
+    Return the number of tokens hashed.
+    """
+    db_api_tokens = db.session.scalars(
+        select(DbApiToken).filter(DbApiToken.token_hash.is_(None))
+    ).all()
+
+    for db_api_token in db_api_tokens:
+        db_api_token.token_hash = authn_api_domain_service.hash_token(
+            db_api_token.token
+        )
+
+    db.session.commit()
+
+    return len(db_api_tokens)
+
+
 def get_all_api_tokens() -> list[ApiToken]:
     """Return all API tokens."""
     db_api_tokens = db.session.scalars(select(DbApiToken)).unique().all()
@@ -78,6 +116,8 @@ def suspend_api_token(api_token_id: UUID) -> None:
     db_api_token.suspended = True
     db.session.commit()
 
+    api_token_cache.invalidate()
+
 
 def unsuspend_api_token(api_token_id: UUID) -> None:
     """Unsuspend the API token."""
@@ -85,6 +125,8 @@ def unsuspend_api_token(api_token_id: UUID) -> None:
     db_api_token.suspended = False
     db.session.commit()
 
+    api_token_cache.invalidate()
+
 
 def _get_db_api_token(api_token_id: UUID) -> DbApiToken:
     db_api_token = db.session.get(DbApiToken, api_token_id)
@@ -104,6 +146,9 @@ def delete_api_token(api_token_id: UUID) -> None:
     )
     db.session.commit()
 
+    api_token_cache.invalidate()
+    authn_api_request_count_service.delete_request_count(api_token_id)
+
 
 def _db_entity_to_api_token(db_api_token: DbApiToken) -> ApiToken:
     return ApiToken(
@@ -114,4 +159,5 @@ def _db_entity_to_api_token(db_api_token: DbApiToken) -> ApiToken:
         permissions=frozenset(db_api_token.permissions),
         description=db_api_token.description,
         suspended=db_api_token.suspended,
+        rate_limit=db_api_token.rate_limit,
     )
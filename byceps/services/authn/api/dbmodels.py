@@ -30,11 +30,13 @@ class DbApiToken(db.Model):
         db.Uuid, db.ForeignKey('users.id')
     )
     token: Mapped[str] = mapped_column(db.UnicodeText)
+    token_hash: Mapped[str] = mapped_column(db.UnicodeText, unique=True)
     permissions: Mapped[list[PermissionID]] = mapped_column(
         MutableList.as_mutable(db.JSONB)
     )
     description: Mapped[str | None] = mapped_column(db.UnicodeText)
     suspended: Mapped[bool]
+    rate_limit: Mapped[int | None]
 
     def __init__(
         self,
@@ -42,14 +44,18 @@ class DbApiToken(db.Model):
         created_at: datetime,
         creator_id: UserID,
         token: str,
+        token_hash: str,
         permissions: frozenset[PermissionID],
         description: str | None,
         suspended: bool,
+        rate_limit: int | None,
     ) -> None:
         self.id = api_token_id
         self.created_at = created_at
         self.creator_id = creator_id
         self.token = token
+        self.token_hash = token_hash
         self.permissions = list(permissions)
         self.description = description
         self.suspended = suspended
+        self.rate_limit = rate_limit
@@ -25,3 +25,4 @@ class ApiToken:
     permissions: frozenset[PermissionID]
     description: str | None
     suspended: bool
+    rate_limit: int | None
@@ -17,8 +17,11 @@ from byceps.database import db, insert_ignore_on_conflict, upsert
 from byceps.events.authn import UserLoggedInEvent
 from byceps.services.site.models import Site, SiteID
 from byceps.services.user import user_log_service
+from byceps.services.user.dbmodels.avatar import DbUserAvatar
 from byceps.services.user.dbmodels.log import DbUserLogEntry
+from byceps.services.user.dbmodels.user import DbUser
 from byceps.services.user.models.user import User, UserID
+from byceps.signals import authn as authn_signals
 
 from .dbmodels import DbRecentLogin, DbSessionToken
 from .models import CurrentUser
@@ -51,6 +54,8 @@ def delete_session_tokens_for_user(user_id: UserID) -> None:
     )
     db.session.commit()
 
+    authn_signals.session_tokens_deleted.send(None, user_id=user_id)
+
 
 def delete_all_session_tokens() -> int:
     """Delete all users' session tokens.
@@ -60,6 +65,8 @@ def delete_all_session_tokens() -> int:
     result = db.session.execute(delete(DbSessionToken))
     db.session.commit()
 
+    authn_signals.all_session_tokens_deleted.send(None)
+
     num_deleted = result.rowcount
     return num_deleted
 
@@ -101,6 +108,50 @@ def _is_token_valid_for_user(token: str, user_id: UserID) -> bool:
     )
 
 
+def find_active_user_with_valid_session(
+    user_id: UserID, auth_token: str
+) -> User | None:
+    """Return the user with that ID (including avatar) if the account
+    is "active" and the client session is valid, or `None` otherwise.
+
+    Combines what `user_service.find_active_user` and `is_session_valid`
+    do in a single query.
+    """
+    if not user_id or not auth_token:
+        return None
+
+    row = db.session.execute(
+        select(
+            DbUser.id,
+            DbUser.screen_name,
+            DbUser.locale,
+            DbUserAvatar,
+        )
+        .join(DbSessionToken, DbSessionToken.user_id == DbUser.id)
+        .outerjoin(DbUserAvatar, DbUser.avatar_id == DbUserAvatar.id)
+        .filter(DbUser.id == user_id)
+        .filter(DbUser.initialized == True)  # noqa: E712
+        .filter(DbUser.suspended == False)  # noqa: E712
+        .filter(DbUser.deleted == False)  # noqa: E712
+        .filter(DbSessionToken.token == auth_token)
+    ).one_or_none()
+
+    if row is None:
+        return None
+
+    user_id, screen_name, locale, avatar = row
+
+    return User(
+        id=user_id,
+        screen_name=screen_name,
+        initialized=True,
+        suspended=False,
+        deleted=False,
+        locale=locale,
+        avatar_url=avatar.url if (avatar is not None) else None,
+    )
+
+
 def log_in_user(
     user: User,
     *,
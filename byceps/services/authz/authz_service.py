@@ -22,6 +22,7 @@ from byceps.events.authz import (
 from byceps.services.user import user_log_service, user_service
 from byceps.services.user.models.log import UserLogEntry
 from byceps.services.user.models.user import User, UserID
+from byceps.signals import authz as authz_signals
 from byceps.util.result import Err, Ok, Result
 
 from . import authz_domain_service
@@ -52,6 +53,8 @@ def delete_role(role_id: RoleID) -> None:
     db.session.execute(delete(DbRole).where(DbRole.id == role_id))
     db.session.commit()
 
+    authz_signals.role_deleted.send(None, role_id=role_id)
+
 
 def find_role(role_id: RoleID) -> Role | None:
     """Return the role with that id, or `None` if not found."""
@@ -96,6 +99,10 @@ def assign_permission_to_role(
     db.session.add(db_role_permission)
     db.session.commit()
 
+    authz_signals.permission_assigned_to_role.send(
+        None, permission_id=permission_id, role_id=role_id
+    )
+
 
 def deassign_permission_from_role(
     permission_id: PermissionID, role_id: RoleID
@@ -111,6 +118,10 @@ def deassign_permission_from_role(
     db.session.delete(db_role_permission)
     db.session.commit()
 
+    authz_signals.permission_deassigned_from_role.send(
+        None, permission_id=permission_id, role_id=role_id
+    )
+
     return Ok(None)
 
 
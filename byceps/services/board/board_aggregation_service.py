@@ -2,14 +2,25 @@
 byceps.services.board.board_aggregation_service
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+Maintain the count and latest posting fields of topics and categories.
+
+Changes to postings and topics are applied incrementally (as deltas)
+to avoid recounting a category's whole history each time. Should the
+fields drift anyway, a board can be checked against and reaggregated
+from its postings.
+
 :Copyright: 2014-2023 Jochen Kupperschmidt
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 
 from byceps.database import db
 from byceps.services.user.models.user import UserID
@@ -17,7 +28,7 @@ from byceps.services.user.models.user import UserID
 from .dbmodels.category import DbBoardCategory
 from .dbmodels.posting import DbPosting
 from .dbmodels.topic import DbTopic
-from .models import BoardCategoryID, TopicID
+from .models import BoardCategoryID, BoardID, TopicID
 
 
 @dataclass(frozen=True)
@@ -128,3 +139,611 @@ def _get_topic_latest_posting_info(
         created_at=db_latest_posting.created_at,
         creator_id=db_latest_posting.creator_id,
     )
+
+
+# -------------------------------------------------------------------- #
+# incremental updates
+
+
+def on_topic_created(db_topic: DbTopic, db_posting: DbPosting) -> None:
+    """Update the topic's and its category's count and latest fields
+    after the topic has been created with its initial posting.
+    """
+    db.session.execute(
+        update(DbTopic)
+        .filter_by(id=db_topic.id)
+        .values(
+            posting_count=1,
+            last_updated_at=db_posting.created_at,
+            last_updated_by_id=db_posting.creator_id,
+        )
+    )
+
+    _change_category_counts(
+        db_topic.category_id, topic_count_delta=1, posting_count_delta=1
+    )
+    _advance_category_latest_posting(
+        db_topic.category_id,
+        LatestPostingInfo(db_posting.created_at, db_posting.creator_id),
+    )
+
+    db.session.commit()
+
+
+def on_posting_created(db_posting: DbPosting) -> None:
+    """Update the topic's and its category's count and latest fields
+    after the posting has been created.
+    """
+    _on_posting_made_visible(db_posting)
+
+
+def on_posting_unhidden(db_posting: DbPosting) -> None:
+    """Update the topic's and its category's count and latest fields
+    after the posting has been un-hidden.
+    """
+    _on_posting_made_visible(db_posting)
+
+
+def _on_posting_made_visible(db_posting: DbPosting) -> None:
+    db_topic = db_posting.topic
+    latest_posting_info = LatestPostingInfo(
+        db_posting.created_at, db_posting.creator_id
+    )
+
+    _change_topic_posting_count(db_topic.id, 1)
+    _advance_topic_latest_posting(db_topic.id, latest_posting_info)
+
+    _change_category_counts(db_topic.category_id, posting_count_delta=1)
+    if not db_topic.hidden:
+        _advance_category_latest_posting(
+            db_topic.category_id, latest_posting_info
+        )
+
+    db.session.commit()
+
+
+def on_posting_hidden(db_posting: DbPosting) -> None:
+    """Update the topic's and its category's count and latest fields
+    after the posting has been hidden.
+    """
+    db_topic = db_posting.topic
+    category_id = db_topic.category_id
+
+    # Fetch before the update expires the objects.
+    was_topic_latest = _is_at_or_after(
+        db_posting.created_at, db_topic.last_updated_at
+    )
+    was_category_latest = (not db_topic.hidden) and _is_at_or_after(
+        db_posting.created_at, db_topic.category.last_posting_updated_at
+    )
+
+    _change_topic_posting_count(db_topic.id, -1)
+    if was_topic_latest:
+        _set_topic_latest_posting(
+            db_topic.id, _get_topic_latest_posting_info(db_topic.id)
+        )
+
+    _change_category_counts(category_id, posting_count_delta=-1)
+    if was_category_latest:
+        _set_category_latest_posting(
+            category_id,
+            _get_category_latest_posting_info_from_topics(category_id),
+        )
+
+    db.session.commit()
+
+
+def on_topic_hidden(db_topic: DbTopic) -> None:
+    """Update the category's count and latest fields after the topic
+    has been hidden.
+    """
+    category_id = db_topic.category_id
+
+    was_category_latest = _is_at_or_after(
+        db_topic.last_updated_at, db_topic.category.last_posting_updated_at
+    )
+
+    _change_category_counts(category_id, topic_count_delta=-1)
+    if was_category_latest:
+        _set_category_latest_posting(
+            category_id,
+            _get_category_latest_posting_info_from_topics(category_id),
+        )
+
+    db.session.commit()
+
+
+def on_topic_unhidden(db_topic: DbTopic) -> None:
+    """Update the category's count and latest fields after the topic
+    has been un-hidden.
+    """
+    latest_posting_info = _get_topic_latest_posting_info_from_fields(db_topic)
+
+    _change_category_counts(db_topic.category_id, topic_count_delta=1)
+    if latest_posting_info is not None:
+        _advance_category_latest_posting(
+            db_topic.category_id, latest_posting_info
+        )
+
+    db.session.commit()
+
+
+def on_topic_moved(
+    db_topic: DbTopic,
+    old_category_id: BoardCategoryID,
+    new_category_id: BoardCategoryID,
+) -> None:
+    """Update both categories' count and latest fields after the topic
+    has been moved from one to the other.
+    """
+    topic_count_delta = 0 if db_topic.hidden else 1
+    posting_count_delta = db_topic.posting_count
+    latest_posting_info = (
+        _get_topic_latest_posting_info_from_fields(db_topic)
+        if not db_topic.hidden
+        else None
+    )
+
+    _change_category_counts(
+        old_category_id,
+        topic_count_delta=-topic_count_delta,
+        posting_count_delta=-posting_count_delta,
+    )
+    if latest_posting_info is not None:
+        _set_category_latest_posting(
+            old_category_id,
+            _get_category_latest_posting_info_from_topics(old_category_id),
+        )
+
+    _change_category_counts(
+        new_category_id,
+        topic_count_delta=topic_count_delta,
+        posting_count_delta=posting_count_delta,
+    )
+    if latest_posting_info is not None:
+        _advance_category_latest_posting(new_category_id, latest_posting_info)
+
+    db.session.commit()
+
+
+def _change_topic_posting_count(topic_id: TopicID, delta: int) -> None:
+    db.session.execute(
+        update(DbTopic)
+        .filter_by(id=topic_id)
+        .values(posting_count=DbTopic.posting_count + delta)
+    )
+
+
+def _advance_topic_latest_posting(
+    topic_id: TopicID, latest_posting_info: LatestPostingInfo
+) -> None:
+    """Set the topic's latest fields unless they already refer to a
+    later posting.
+    """
+    db.session.execute(
+        update(DbTopic)
+        .filter_by(id=topic_id)
+        .filter(
+            or_(
+                DbTopic.last_updated_at.is_(None),
+                DbTopic.last_updated_at < latest_posting_info.created_at,
+            )
+        )
+        .values(
+            last_updated_at=latest_posting_info.created_at,
+            last_updated_by_id=latest_posting_info.creator_id,
+        )
+    )
+
+
+def _set_topic_latest_posting(
+    topic_id: TopicID, latest_posting_info: LatestPostingInfo | None
+) -> None:
+    db.session.execute(
+        update(DbTopic)
+        .filter_by(id=topic_id)
+        .values(
+            last_updated_at=(
+                latest_posting_info.created_at if latest_posting_info else None
+            ),
+            last_updated_by_id=(
+                latest_posting_info.creator_id if latest_posting_info else None
+            ),
+        )
+    )
+
+
+def _change_category_counts(
+    category_id: BoardCategoryID,
+    *,
+    topic_count_delta: int = 0,
+    posting_count_delta: int = 0,
+) -> None:
+    db.session.execute(
+        update(DbBoardCategory)
+        .filter_by(id=category_id)
+        .values(
+            topic_count=DbBoardCategory.topic_count + topic_count_delta,
+            posting_count=DbBoardCategory.posting_count + posting_count_delta,
+        )
+    )
+
+
+def _advance_category_latest_posting(
+    category_id: BoardCategoryID, latest_posting_info: LatestPostingInfo
+) -> None:
+    """Set the category's latest fields unless they already refer to a
+    later posting.
+    """
+    db.session.execute(
+        update(DbBoardCategory)
+        .filter_by(id=category_id)
+        .filter(
+            or_(
+                DbBoardCategory.last_posting_updated_at.is_(None),
+                DbBoardCategory.last_posting_updated_at
+                < latest_posting_info.created_at,
+            )
+        )
+        .values(
+            last_posting_updated_at=latest_posting_info.created_at,
+            last_posting_updated_by_id=latest_posting_info.creator_id,
+        )
+    )
+
+
+def _set_category_latest_posting(
+    category_id: BoardCategoryID, latest_posting_info: LatestPostingInfo | None
+) -> None:
+    db.session.execute(
+        update(DbBoardCategory)
+        .filter_by(id=category_id)
+        .values(
+            last_posting_updated_at=(
+                latest_posting_info.created_at if latest_posting_info else None
+            ),
+            last_posting_updated_by_id=(
+                latest_posting_info.creator_id if latest_posting_info else None
+            ),
+        )
+    )
+
+
+def _get_category_latest_posting_info_from_topics(
+    category_id: BoardCategoryID,
+) -> LatestPostingInfo | None:
+    """Determine the category's latest posting from the (already
+    aggregated) latest fields of its visible topics instead of going
+    through all of its postings.
+    """
+    row = db.session.execute(
+        select(DbTopic.last_updated_at, DbTopic.last_updated_by_id)
+        .filter_by(category_id=category_id)
+        .filter_by(hidden=False)
+        .filter(DbTopic.last_updated_at.is_not(None))
+        .order_by(DbTopic.last_updated_at.desc())
+        .limit(1)
+    ).one_or_none()
+
+    if row is None:
+        return None
+
+    created_at, creator_id = row
+    return LatestPostingInfo(created_at=created_at, creator_id=creator_id)
+
+
+def _get_topic_latest_posting_info_from_fields(
+    db_topic: DbTopic,
+) -> LatestPostingInfo | None:
+    # Both fields are always set together.
+    if (db_topic.last_updated_at is None) or (
+        db_topic.last_updated_by_id is None
+    ):
+        return None
+
+    return LatestPostingInfo(
+        created_at=db_topic.last_updated_at,
+        creator_id=db_topic.last_updated_by_id,
+    )
+
+
+def _is_at_or_after(value: datetime | None, other: datetime | None) -> bool:
+    return (value is not None) and ((other is None) or (value >= other))
+
+
+# -------------------------------------------------------------------- #
+# consistency check and full recount
+
+
+@dataclass(frozen=True)
+class TopicAggregate:
+    posting_count: int
+    latest_posting: LatestPostingInfo | None
+
+
+@dataclass(frozen=True)
+class CategoryAggregate:
+    topic_count: int
+    posting_count: int
+    latest_posting: LatestPostingInfo | None
+
+
+@dataclass(frozen=True)
+class TopicAggregationInconsistency:
+    topic_id: TopicID
+    stored: TopicAggregate
+    actual: TopicAggregate
+
+
+@dataclass(frozen=True)
+class CategoryAggregationInconsistency:
+    category_id: BoardCategoryID
+    stored: CategoryAggregate
+    actual: CategoryAggregate
+
+
+AggregationInconsistency = (
+    TopicAggregationInconsistency | CategoryAggregationInconsistency
+)
+
+
+def find_inconsistencies(board_id: BoardID) -> list[AggregationInconsistency]:
+    """Compare the stored count and latest fields of the board's topics
+    and categories to the values determined from their postings.
+    """
+    inconsistencies: list[AggregationInconsistency] = []
+
+    stored_topic_aggregates = _get_stored_topic_aggregates(board_id)
+    actual_topic_aggregates = _calculate_topic_aggregates(board_id)
+    for topic_id, stored_topic in stored_topic_aggregates.items():
+        actual_topic = actual_topic_aggregates[topic_id]
+        if stored_topic != actual_topic:
+            inconsistencies.append(
+                TopicAggregationInconsistency(
+                    topic_id, stored_topic, actual_topic
+                )
+            )
+
+    stored_category_aggregates = _get_stored_category_aggregates(board_id)
+    actual_category_aggregates = _calculate_category_aggregates(
+        board_id, actual_topic_aggregates
+    )
+    for category_id, stored_category in stored_category_aggregates.items():
+        actual_category = actual_category_aggregates[category_id]
+        if stored_category != actual_category:
+            inconsistencies.append(
+                CategoryAggregationInconsistency(
+                    category_id, stored_category, actual_category
+                )
+            )
+
+    return inconsistencies
+
+
+def reaggregate_board(board_id: BoardID) -> list[AggregationInconsistency]:
+    """Recount the count and latest fields of the board's topics and
+    categories from their postings, and fix those that are off.
+
+    Return the inconsistencies that have been fixed.
+    """
+    inconsistencies = find_inconsistencies(board_id)
+
+    topic_rows = []
+    category_rows = []
+    for inconsistency in inconsistencies:
+        match inconsistency:
+            case TopicAggregationInconsistency(topic_id, _, actual):
+                topic_rows.append(
+                    {
+                        'id': topic_id,
+                        'posting_count': actual.posting_count,
+                        **_latest_posting_to_topic_fields(
+                            actual.latest_posting
+                        ),
+                    }
+                )
+            case CategoryAggregationInconsistency(category_id, _, actual):
+                category_rows.append(
+                    {
+                        'id': category_id,
+                        'topic_count': actual.topic_count,
+                        'posting_count': actual.posting_count,
+                        **_latest_posting_to_category_fields(
+                            actual.latest_posting
+                        ),
+                    }
+                )
+
+    if topic_rows:
+        db.session.execute(update(DbTopic), topic_rows)
+    if category_rows:
+        db.session.execute(update(DbBoardCategory), category_rows)
+
+    db.session.commit()
+
+    return inconsistencies
+
+
+def _get_stored_topic_aggregates(
+    board_id: BoardID,
+) -> dict[TopicID, TopicAggregate]:
+    rows = db.session.execute(
+        select(
+            DbTopic.id,
+            DbTopic.posting_count,
+            DbTopic.last_updated_at,
+            DbTopic.last_updated_by_id,
+        )
+        .join(DbBoardCategory)
+        .filter(DbBoardCategory.board_id == board_id)
+    ).all()
+
+    return {
+        topic_id: TopicAggregate(
+            posting_count=posting_count,
+            latest_posting=_to_latest_posting_info(
+                last_updated_at, last_updated_by_id
+            ),
+        )
+        for topic_id, posting_count, last_updated_at, last_updated_by_id in rows
+    }
+
+
+def _get_stored_category_aggregates(
+    board_id: BoardID,
+) -> dict[BoardCategoryID, CategoryAggregate]:
+    rows = db.session.execute(
+        select(
+            DbBoardCategory.id,
+            DbBoardCategory.topic_count,
+            DbBoardCategory.posting_count,
+            DbBoardCategory.last_posting_updated_at,
+            DbBoardCategory.last_posting_updated_by_id,
+        ).filter_by(board_id=board_id)
+    ).all()
+
+    return {
+        category_id: CategoryAggregate(
+            topic_count=topic_count,
+            posting_count=posting_count,
+            latest_posting=_to_latest_posting_info(
+                last_posting_updated_at, last_posting_updated_by_id
+            ),
+        )
+        for (
+            category_id,
+            topic_count,
+            posting_count,
+            last_posting_updated_at,
+            last_posting_updated_by_id,
+        ) in rows
+    }
+
+
+def _calculate_topic_aggregates(
+    board_id: BoardID,
+) -> dict[TopicID, TopicAggregate]:
+    topic_ids = db.session.scalars(
+        select(DbTopic.id)
+        .join(DbBoardCategory)
+        .filter(DbBoardCategory.board_id == board_id)
+    ).all()
+
+    posting_count_rows = db.session.execute(
+        select(DbPosting.topic_id, db.func.count(DbPosting.id))
+        .join(DbTopic)
+        .join(DbBoardCategory)
+        .filter(DbBoardCategory.board_id == board_id)
+        .filter(DbPosting.hidden == False)  # noqa: E712
+        .group_by(DbPosting.topic_id)
+    ).all()
+    posting_counts_by_topic_id: dict[TopicID, int] = {
+        topic_id: posting_count
+        for topic_id, posting_count in posting_count_rows
+    }
+
+    latest_posting_rows = db.session.execute(
+        select(DbPosting.topic_id, DbPosting.created_at, DbPosting.creator_id)
+        .join(DbTopic)
+        .join(DbBoardCategory)
+        .filter(DbBoardCategory.board_id == board_id)
+        .filter(DbPosting.hidden == False)  # noqa: E712
+        .distinct(DbPosting.topic_id)
+        .order_by(DbPosting.topic_id, DbPosting.created_at.desc())
+    ).all()
+    latest_postings_by_topic_id = {
+        topic_id: LatestPostingInfo(created_at, creator_id)
+        for topic_id, created_at, creator_id in latest_posting_rows
+    }
+
+    return {
+        topic_id: TopicAggregate(
+            posting_count=posting_counts_by_topic_id.get(topic_id, 0),
+            latest_posting=latest_postings_by_topic_id.get(topic_id),
+        )
+        for topic_id in topic_ids
+    }
+
+
+def _calculate_category_aggregates(
+    board_id: BoardID, topic_aggregates: dict[TopicID, TopicAggregate]
+) -> dict[BoardCategoryID, CategoryAggregate]:
+    category_ids = db.session.scalars(
+        select(DbBoardCategory.id).filter_by(board_id=board_id)
+    ).all()
+
+    topic_rows = db.session.execute(
+        select(DbTopic.id, DbTopic.category_id, DbTopic.hidden)
+        .join(DbBoardCategory)
+        .filter(DbBoardCategory.board_id == board_id)
+    ).all()
+
+    topic_counts: dict[BoardCategoryID, int] = defaultdict(int)
+    posting_counts: dict[BoardCategoryID, int] = defaultdict(int)
+    latest_postings: dict[BoardCategoryID, LatestPostingInfo] = {}
+
+    for topic_id, category_id, hidden in topic_rows:
+        topic_aggregate = topic_aggregates[topic_id]
+
+        # Postings in hidden topics are counted, too.
+        posting_counts[category_id] += topic_aggregate.posting_count
+
+        if hidden:
+            continue
+
+        topic_counts[category_id] += 1
+
+        latest_posting = topic_aggregate.latest_posting
+        if latest_posting is None:
+            continue
+
+        current_latest_posting = latest_postings.get(category_id)
+        if (current_latest_posting is None) or (
+            latest_posting.created_at > current_latest_posting.created_at
+        ):
+            latest_postings[category_id] = latest_posting
+
+    return {
+        category_id: CategoryAggregate(
+            topic_count=topic_counts[category_id],
+            posting_count=posting_counts[category_id],
+            latest_posting=latest_postings.get(category_id),
+        )
+        for category_id in category_ids
+    }
+
+
+def _to_latest_posting_info(
+    created_at: datetime | None, creator_id: UserID | None
+) -> LatestPostingInfo | None:
+    # Both fields are always set together.
+    if (created_at is None) or (creator_id is None):
+        return None
+
+    return LatestPostingInfo(created_at=created_at, creator_id=creator_id)
+
+
+def _latest_posting_to_topic_fields(
+    latest_posting: LatestPostingInfo | None,
+) -> dict[str, Any]:
+    return {
+        'last_updated_at': latest_posting.created_at
+        if latest_posting
+        else None,
+        'last_updated_by_id': (
+            latest_posting.creator_id if latest_posting else None
+        ),
+    }
+
+
+def _latest_posting_to_category_fields(
+    latest_posting: LatestPostingInfo | None,
+) -> dict[str, Any]:
+    return {
+        'last_posting_updated_at': (
+            latest_posting.created_at if latest_posting else None
+        ),
+        'last_posting_updated_by_id': (
+            latest_posting.creator_id if latest_posting else None
+        ),
+    }
@@ -8,12 +8,21 @@ byceps.services.board.board_last_view_service
 
 from __future__ import annotations
 
-from datetime import datetime
-
-from sqlalchemy import delete, select
-
-from byceps.database import db, upsert, upsert_many
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import time
+from typing import Any
+from uuid import UUID, uuid4
+
+from flask import current_app
+from redis.exceptions import ResponseError
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import BULK_CHUNK_SIZE, db, upsert, upsert_many
 from byceps.services.user.models.user import UserID
+from byceps.util.iterables import chunk
+from byceps.util.jobqueue import enqueue_at
 
 from . import board_topic_query_service
 from .dbmodels.last_category_view import DbLastCategoryView
@@ -43,6 +52,55 @@ def contains_category_unseen_postings(
     return category.last_posting_updated_at > db_last_view.occurred_at
 
 
+def contains_categories_unseen_postings(
+    categories: Iterable[BoardCategoryWithLastUpdate], user_id: UserID
+) -> dict[BoardCategoryID, bool]:
+    """Return, for each category, if it contains postings created after
+    the last time the user viewed it.
+
+    Last views are fetched with a single query.
+    """
+    categories = list(categories)
+
+    category_ids = {category.id for category in categories}
+    last_viewed_ats = find_categories_last_viewed_at(category_ids, user_id)
+
+    def contains_unseen_postings(category: BoardCategoryWithLastUpdate) -> bool:
+        if category.last_posting_updated_at is None:
+            return False
+
+        return _is_updated_since(
+            category.last_posting_updated_at, last_viewed_ats.get(category.id)
+        )
+
+    return {
+        category.id: contains_unseen_postings(category)
+        for category in categories
+    }
+
+
+def find_categories_last_viewed_at(
+    category_ids: set[BoardCategoryID], user_id: UserID
+) -> dict[BoardCategoryID, datetime]:
+    """Return the times the categories were last viewed by the user.
+
+    Categories not viewed by the user yet are omitted.
+    """
+    if not category_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(DbLastCategoryView.category_id, DbLastCategoryView.occurred_at)
+        .filter(DbLastCategoryView.user_id == user_id)
+        .filter(DbLastCategoryView.category_id.in_(category_ids))
+    ).all()
+
+    return {
+        BoardCategoryID(category_id): occurred_at
+        for category_id, occurred_at in rows
+    }
+
+
 def find_last_category_view(
     user_id: UserID, category_id: BoardCategoryID
 ) -> DbLastCategoryView | None:
@@ -92,30 +150,88 @@ def contains_topic_unseen_postings(db_topic: DbTopic, user_id: UserID) -> bool:
     return last_viewed_at is None or db_topic.last_updated_at > last_viewed_at
 
 
+def contains_topics_unseen_postings(
+    db_topics: Iterable[DbTopic], user_id: UserID
+) -> dict[TopicID, bool]:
+    """Return, for each topic, if it contains postings created after the
+    last time the user viewed it.
+
+    Last views are fetched with a single query.
+    """
+    db_topics = list(db_topics)
+
+    topic_ids = {db_topic.id for db_topic in db_topics}
+    last_viewed_ats = find_topics_last_viewed_at(topic_ids, user_id)
+
+    return {
+        db_topic.id: _is_updated_since(
+            db_topic.last_updated_at, last_viewed_ats.get(db_topic.id)
+        )
+        for db_topic in db_topics
+    }
+
+
+def find_topics_last_viewed_at(
+    topic_ids: set[TopicID], user_id: UserID
+) -> dict[TopicID, datetime]:
+    """Return the times the topics were last viewed by the user.
+
+    Topics not viewed by the user yet are omitted.
+    """
+    if not topic_ids:
+        return {}
+
+    rows = db.session.execute(
+        select(DbLastTopicView.topic_id, DbLastTopicView.occurred_at)
+        .filter(DbLastTopicView.user_id == user_id)
+        .filter(DbLastTopicView.topic_id.in_(topic_ids))
+    ).all()
+
+    last_viewed_ats = {
+        TopicID(topic_id): occurred_at for topic_id, occurred_at in rows
+    }
+
+    # Views not yet written to the database are more recent.
+    buffered_views = _find_buffered_topic_views(topic_ids, user_id)
+    for topic_id, occurred_at in buffered_views.items():
+        persisted_occurred_at = last_viewed_ats.get(topic_id)
+        if (persisted_occurred_at is None) or (
+            occurred_at > persisted_occurred_at
+        ):
+            last_viewed_ats[topic_id] = occurred_at
+
+    return last_viewed_ats
+
+
 def find_topic_last_viewed_at(
     topic_id: TopicID, user_id: UserID
 ) -> datetime | None:
     """Return the time the topic was last viewed by the user (or
     nothing, if it hasn't been viewed by the user yet).
     """
-    db_last_view = db.session.scalars(
-        select(DbLastTopicView).filter_by(user_id=user_id, topic_id=topic_id)
-    ).first()
-
-    return db_last_view.occurred_at if (db_last_view is not None) else None
+    return find_topics_last_viewed_at({topic_id}, user_id).get(topic_id)
 
 
 def mark_topic_as_just_viewed(topic_id: TopicID, user_id: UserID) -> None:
     """Mark the topic as last viewed by the user (if logged in) at the
     current time.
+
+    If write-behind is enabled, the view is buffered in Redis and
+    written to the database later on, together with other views.
     """
+    occurred_at = datetime.utcnow()
+
+    if _is_topic_view_buffering_enabled():
+        _buffer_topic_view(topic_id, user_id, occurred_at)
+        return
+
     table = DbLastTopicView.__table__
     identifier = {
         'user_id': user_id,
         'topic_id': topic_id,
     }
     replacement = {
-        'occurred_at': datetime.utcnow(),
+        'occurred_at': occurred_at,
     }
 
     upsert(table, identifier, replacement)
@@ -148,3 +264,260 @@ def delete_last_topic_views(topic_id: TopicID) -> None:
     """Delete the topic's last views."""
     db.session.execute(delete(DbLastTopicView).filter_by(topic_id=topic_id))
     db.session.commit()
+
+
+# -------------------------------------------------------------------- #
+# write-behind buffer for topic views
+
+
+_BUFFERED_TOPIC_VIEWS_KEY = 'byceps:board:buffered_topic_views'
+_BUFFERED_TOPIC_VIEWS_FLUSH_SCHEDULED_KEY = (
+    'byceps:board:buffered_topic_views:flush_scheduled'
+)
+
+# Each flush moves the buffered views to a hash of its own, and records
+# when it did so.
+_CLAIMED_TOPIC_VIEWS_KEY_PREFIX = 'byceps:board:buffered_topic_views:claimed'
+_TOPIC_VIEW_CLAIMS_KEY = 'byceps:board:buffered_topic_views:claims'
+
+# Claims older than this (well beyond the job timeout) have been left
+# over by a flush that crashed.
+_ORPHANED_CLAIM_AGE = 600
+
+
+def _is_topic_view_buffering_enabled() -> bool:
+    return current_app.config.get('BOARD_TOPIC_VIEWS_WRITE_BEHIND', False)
+
+
+def _buffer_topic_view(
+    topic_id: TopicID, user_id: UserID, occurred_at: datetime
+) -> None:
+    """Record the topic view in Redis, and schedule a flush unless one
+    is already pending.
+    """
+    redis_client = current_app.redis_client
+
+    field = _build_buffered_topic_view_field(user_id, topic_id)
+    redis_client.hset(_BUFFERED_TOPIC_VIEWS_KEY, field, occurred_at.isoformat())
+
+    _schedule_flush(occurred_at)
+
+
+def _schedule_flush(now: datetime) -> None:
+    """Schedule a flush of the buffered views unless one is already
+    pending.
+    """
+    flush_delay = current_app.config['BOARD_TOPIC_VIEWS_FLUSH_DELAY']
+    # Let the flag expire in case the flush job gets lost.
+    flush_scheduled_flag_ttl = flush_delay + 60
+    if current_app.redis_client.set(
+        _BUFFERED_TOPIC_VIEWS_FLUSH_SCHEDULED_KEY,
+        1,
+        nx=True,
+        ex=flush_scheduled_flag_ttl,
+    ):
+        flush_at = now + timedelta(seconds=flush_delay)
+        enqueue_at(flush_at, flush_buffered_topic_views)
+
+
+def _find_buffered_topic_views(
+    topic_ids: set[TopicID], user_id: UserID
+) -> dict[TopicID, datetime]:
+    """Return the buffered (not yet persisted) views of the topics by
+    the user.
+    """
+    if not _is_topic_view_buffering_enabled():
+        return {}
+
+    topic_ids_list = list(topic_ids)
+    fields = [
+        _build_buffered_topic_view_field(user_id, topic_id)
+        for topic_id in topic_ids_list
+    ]
+
+    redis_client = current_app.redis_client
+
+    # Views that are being flushed have not been committed yet either.
+    claim_keys = redis_client.zrange(_TOPIC_VIEW_CLAIMS_KEY, 0, -1)
+
+    pipeline = redis_client.pipeline()
+    pipeline.hmget(_BUFFERED_TOPIC_VIEWS_KEY, fields)
+    for claim_key in claim_keys:
+        pipeline.hmget(claim_key.decode(), fields)
+    values_per_hash = pipeline.execute()
+
+    viewed_ats = {}
+    for topic_id, *values in zip(topic_ids_list, *values_per_hash, strict=True):
+        viewed_at_values = [
+            datetime.fromisoformat(value.decode())
+            for value in values
+            if value is not None
+        ]
+        if viewed_at_values:
+            viewed_ats[topic_id] = max(viewed_at_values)
+
+    return viewed_ats
+
+
+def flush_buffered_topic_views() -> int:
+    """Write buffered topic views to the database.
+
+    The buffered views are only removed from Redis once they have been
+    committed to the database. Should writing them fail, they are put
+    back into the buffer.
+
+    Flushes may overlap as each one only handles (and removes) the views
+    it has claimed itself.
+
+    Return the number of views written.
+    """
+    redis_client = current_app.redis_client
+
+    # Allow scheduling of another flush for views buffered from now on.
+    redis_client.delete(_BUFFERED_TOPIC_VIEWS_FLUSH_SCHEDULED_KEY)
+
+    _unclaim_orphaned_topic_views()
+
+    claim_key = _claim_buffered_topic_views()
+    if claim_key is None:
+        return 0
+
+    claimed_views = redis_client.hgetall(claim_key)
+
+    try:
+        written_count = _write_topic_views(claimed_views)
+    except Exception:
+        db.session.rollback()
+        _unclaim_topic_views(claim_key)
+        _schedule_flush(datetime.utcnow())
+        raise
+
+    pipeline = redis_client.pipeline()
+    pipeline.delete(claim_key)
+    pipeline.zrem(_TOPIC_VIEW_CLAIMS_KEY, claim_key)
+    pipeline.execute()
+
+    return written_count
+
+
+def _claim_buffered_topic_views() -> str | None:
+    """Move the buffered views to a hash of their own to flush them
+    from.
+
+    Views buffered from then on are added to a new buffer.
+
+    Return the key of the claimed views, or `None` if there are no views
+    to flush.
+    """
+    redis_client = current_app.redis_client
+
+    if not redis_client.exists(_BUFFERED_TOPIC_VIEWS_KEY):
+        return None
+
+    claim_key = f'{_CLAIMED_TOPIC_VIEWS_KEY_PREFIX}:{uuid4()}'
+
+    pipeline = redis_client.pipeline()
+    pipeline.zadd(_TOPIC_VIEW_CLAIMS_KEY, {claim_key: time.time()})
+    pipeline.rename(_BUFFERED_TOPIC_VIEWS_KEY, claim_key)
+    try:
+        pipeline.execute()
+    except ResponseError:
+        # Another flush has claimed the buffered views in the meantime.
+        redis_client.zrem(_TOPIC_VIEW_CLAIMS_KEY, claim_key)
+        return None
+
+    return claim_key
+
+
+def _unclaim_orphaned_topic_views() -> None:
+    """Merge views claimed by flushes that crashed back into the
+    buffer.
+    """
+    max_claimed_at = time.time() - _ORPHANED_CLAIM_AGE
+
+    claim_keys = current_app.redis_client.zrangebyscore(
+        _TOPIC_VIEW_CLAIMS_KEY, '-inf', max_claimed_at
+    )
+
+    for claim_key in claim_keys:
+        _unclaim_topic_views(claim_key.decode())
+
+
+def _unclaim_topic_views(claim_key: str) -> None:
+    """Merge the claimed views back into the buffer."""
+
+    def merge(pipeline) -> None:
+        claimed_views = pipeline.hgetall(claim_key)
+
+        pipeline.multi()
+        for field, value in claimed_views.items():
+            # Views buffered in the meantime are more recent, keep them.
+            pipeline.hsetnx(_BUFFERED_TOPIC_VIEWS_KEY, field, value)
+        pipeline.delete(claim_key)
+        pipeline.zrem(_TOPIC_VIEW_CLAIMS_KEY, claim_key)
+
+    current_app.redis_client.transaction(merge, claim_key)
+
+
+def _write_topic_views(buffered_views: dict[bytes, bytes]) -> int:
+    """Upsert the views and commit.
+
+    Return the number of views written.
+    """
+    rows = [
+        _parse_buffered_topic_view(field, value)
+        for field, value in buffered_views.items()
+    ]
+    if not rows:
+        return 0
+
+    # Skip views of topics that have been deleted in the meantime.
+    topic_ids = {row['topic_id'] for row in rows}
+    existing_topic_ids = set(
+        db.session.scalars(
+            select(DbTopic.id).filter(DbTopic.id.in_(topic_ids))
+        ).all()
+    )
+    rows = [row for row in rows if row['topic_id'] in existing_topic_ids]
+    if not rows:
+        return 0
+
+    table = DbLastTopicView.__table__
+    for rows_chunk in chunk(rows, BULK_CHUNK_SIZE):
+        insert_stmt = insert(table).values(rows_chunk)
+        stmt = insert_stmt.on_conflict_do_update(
+            constraint=table.primary_key,
+            # Never move a view back in time.
+            set_={
+                'occurred_at': func.greatest(
+                    table.c.occurred_at, insert_stmt.excluded.occurred_at
+                )
+            },
+        )
+        db.session.execute(stmt)
+    db.session.commit()
+
+    return len(rows)
+
+
+def _build_buffered_topic_view_field(user_id: UserID, topic_id: TopicID) -> str:
+    return f'{user_id}:{topic_id}'
+
+
+def _parse_buffered_topic_view(field: bytes, value: bytes) -> dict[str, Any]:
+    user_id_str, topic_id_str = field.decode().split(':')
+
+    return {
+        'user_id': UserID(UUID(user_id_str)),
+        'topic_id': TopicID(UUID(topic_id_str)),
+        'occurred_at': datetime.fromisoformat(value.decode()),
+    }
+
+
+# -------------------------------------------------------------------- #
+
+
+def _is_updated_since(
+    updated_at: datetime, last_viewed_at: datetime | None
+) -> bool:
+    return (last_viewed_at is None) or (updated_at > last_viewed_at)
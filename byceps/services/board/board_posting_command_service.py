@@ -8,7 +8,7 @@ byceps.services.board.board_posting_command_service
 
 from datetime import datetime
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 
 from byceps.database import db
 from byceps.events.board import (
@@ -50,7 +50,7 @@ def create_posting(
     db.session.add(db_posting)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_topic)
+    board_aggregation_service.on_posting_created(db_posting)
 
     db_category = db_topic.category
     brand = brand_service.get_brand(db_category.board.brand_id)
@@ -117,13 +117,10 @@ def hide_posting(
 
     now = datetime.utcnow()
 
-    db_posting.hidden = True
-    db_posting.hidden_at = now
-    db_posting.hidden_by_id = moderator.id
+    if _set_posting_hidden(posting_id, True, now, moderator.id):
+        board_aggregation_service.on_posting_hidden(db_posting)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_posting.topic)
-
     brand = brand_service.get_brand(db_posting.topic.category.board.brand_id)
     posting_creator = _get_user(db_posting.creator_id)
     event = BoardPostingHiddenEvent(
@@ -146,6 +143,26 @@ def hide_posting(
     return event
 
 
+def _set_posting_hidden(
+    posting_id: PostingID,
+    hidden: bool,
+    hidden_at: datetime | None,
+    hidden_by_id: UserID | None,
+) -> bool:
+    """Hide or un-hide the posting unless it already is.
+
+    Return `True` if the posting has been changed. Does not commit.
+    """
+    changed_posting_id = db.session.execute(
+        update(DbPosting)
+        .filter_by(id=posting_id, hidden=not hidden)
+        .values(hidden=hidden, hidden_at=hidden_at, hidden_by_id=hidden_by_id)
+        .returning(DbPosting.id)
+    ).scalar_one_or_none()
+
+    return changed_posting_id is not None
+
+
 def unhide_posting(
     posting_id: PostingID, moderator: User
 ) -> BoardPostingUnhiddenEvent:
@@ -155,13 +172,10 @@ def unhide_posting(
     now = datetime.utcnow()
 
     # TODO: Store who un-hid the posting.
-    db_posting.hidden = False
-    db_posting.hidden_at = None
-    db_posting.hidden_by_id = None
+    if _set_posting_hidden(posting_id, False, None, None):
+        board_aggregation_service.on_posting_unhidden(db_posting)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_posting.topic)
-
     brand = brand_service.get_brand(db_posting.topic.category.board.brand_id)
     posting_creator = _get_user(db_posting.creator_id)
     event = BoardPostingUnhiddenEvent(
@@ -8,7 +8,7 @@ byceps.services.board.board_topic_command_service
 
 from datetime import datetime
 
-from sqlalchemy import delete
+from sqlalchemy import delete, update
 
 from byceps.database import db
 from byceps.events.board import (
@@ -56,7 +56,7 @@ def create_topic(
     db.session.add(db_initial_topic_posting_association)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_topic)
+    board_aggregation_service.on_topic_created(db_topic, db_posting)
 
     db_category = db_topic.category
     brand = brand_service.get_brand(db_category.board.brand_id)
@@ -118,13 +118,10 @@ def hide_topic(topic_id: TopicID, moderator: User) -> BoardTopicHiddenEvent:
 
     now = datetime.utcnow()
 
-    db_topic.hidden = True
-    db_topic.hidden_at = now
-    db_topic.hidden_by_id = moderator.id
+    if _set_topic_hidden(topic_id, True, now, moderator.id):
+        board_aggregation_service.on_topic_hidden(db_topic)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_topic)
-
     brand = brand_service.get_brand(db_topic.category.board.brand_id)
     topic_creator = _get_user(db_topic.creator_id)
     return BoardTopicHiddenEvent(
@@ -144,6 +141,26 @@ def hide_topic(topic_id: TopicID, moderator: User) -> BoardTopicHiddenEvent:
     )
 
 
+def _set_topic_hidden(
+    topic_id: TopicID,
+    hidden: bool,
+    hidden_at: datetime | None,
+    hidden_by_id: UserID | None,
+) -> bool:
+    """Hide or un-hide the topic unless it already is.
+
+    Return `True` if the topic has been changed. Does not commit.
+    """
+    changed_topic_id = db.session.execute(
+        update(DbTopic)
+        .filter_by(id=topic_id, hidden=not hidden)
+        .values(hidden=hidden, hidden_at=hidden_at, hidden_by_id=hidden_by_id)
+        .returning(DbTopic.id)
+    ).scalar_one_or_none()
+
+    return changed_topic_id is not None
+
+
 def unhide_topic(topic_id: TopicID, moderator: User) -> BoardTopicUnhiddenEvent:
     """Un-hide the topic."""
     db_topic = _get_db_topic(topic_id)
@@ -151,13 +168,10 @@ def unhide_topic(topic_id: TopicID, moderator: User) -> BoardTopicUnhiddenEvent:
     now = datetime.utcnow()
 
     # TODO: Store who un-hid the topic.
-    db_topic.hidden = False
-    db_topic.hidden_at = None
-    db_topic.hidden_by_id = None
+    if _set_topic_hidden(topic_id, False, None, None):
+        board_aggregation_service.on_topic_unhidden(db_topic)
     db.session.commit()
 
-    board_aggregation_service.aggregate_topic(db_topic)
-
     brand = brand_service.get_brand(db_topic.category.board.brand_id)
     topic_creator = _get_user(db_topic.creator_id)
     return BoardTopicUnhiddenEvent(
@@ -313,8 +327,9 @@ def move_topic(
     db_topic.category = db_new_category
     db.session.commit()
 
-    for db_category in db_old_category, db_new_category:
-        board_aggregation_service.aggregate_category(db_category)
+    board_aggregation_service.on_topic_moved(
+        db_topic, db_old_category.id, db_new_category.id
+    )
 
     brand = brand_service.get_brand(db_topic.category.board.brand_id)
     topic_creator = _get_user(db_topic.creator_id)
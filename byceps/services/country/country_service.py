@@ -6,10 +6,17 @@ byceps.services.country.country_service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import cache
 import json
+from pathlib import Path
+from types import MappingProxyType
+
 
-from flask import current_app
+_COUNTRIES_PATH = Path(__file__).parent / 'resources' / 'countries.json'
 
 
 @dataclass(frozen=True)
@@ -19,15 +26,61 @@ class Country:
     alpha3: str
 
 
-def get_countries() -> list[Country]:
-    """Load countries from JSON file."""
-    path = 'services/country/resources/countries.json'
-    with current_app.open_resource(path) as f:
+@dataclass(frozen=True)
+class _CountryTable:
+    countries: tuple[Country, ...]
+    names: tuple[str, ...]
+    by_name: Mapping[str, Country]
+    by_alpha2: Mapping[str, Country]
+    by_alpha3: Mapping[str, Country]
+
+
+@cache
+def _get_country_table() -> _CountryTable:
+    """Load countries from JSON file (once per process) and index them."""
+    with _COUNTRIES_PATH.open('rb') as f:
         records = json.load(f)
 
-    return [Country(**record) for record in records]
+    countries = tuple(Country(**record) for record in records)
+
+    return _CountryTable(
+        countries=countries,
+        names=tuple(country.name for country in countries),
+        by_name=MappingProxyType({c.name: c for c in countries}),
+        by_alpha2=MappingProxyType({c.alpha2: c for c in countries}),
+        by_alpha3=MappingProxyType({c.alpha3: c for c in countries}),
+    )
+
+
+def get_countries() -> list[Country]:
+    """Return all countries."""
+    return list(_get_country_table().countries)
 
 
 def get_country_names() -> list[str]:
     """Return country names."""
-    return [country.name for country in get_countries()]
+    return list(_get_country_table().names)
+
+
+def find_country_by_name(name: str) -> Country | None:
+    """Return the country with that name, or `None` if not found."""
+    return _get_country_table().by_name.get(name)
+
+
+def find_country_by_alpha2(alpha2: str) -> Country | None:
+    """Return the country with that ISO 3166-1 alpha-2 code, or `None`
+    if not found.
+    """
+    return _get_country_table().by_alpha2.get(alpha2.upper())
+
+
+def find_country_by_alpha3(alpha3: str) -> Country | None:
+    """Return the country with that ISO 3166-1 alpha-3 code, or `None`
+    if not found.
+    """
+    return _get_country_table().by_alpha3.get(alpha3.upper())
+
+
+def is_country_name(name: str) -> bool:
+    """Return `True` if a country with that name is known."""
+    return name in _get_country_table().by_name
@@ -6,16 +6,53 @@ byceps.services.email.email_service
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from email.message import EmailMessage
 from email.utils import parseaddr
-from smtplib import SMTP, SMTP_SSL
+from functools import cache
+import json
+from time import monotonic
 
 from flask import current_app
+import structlog
 
-from byceps.util.jobqueue import enqueue
+from byceps.util.jobqueue import enqueue, enqueue_at
+from byceps.util.outbox import Outbox
 from byceps.util.result import Err, Ok, Result
 
 from .models import Message, NameAndAddress
+from .smtp import PooledSmtpConnection, SmtpConfig, get_smtp_config
+
+
+log = structlog.get_logger()
+
+
+_OUTBOX_KEY = 'byceps:email:outbox'
+_STATS_KEY = 'byceps:email:stats'
+
+BATCH_SIZE = 100
+
+# Stop in time before the job queue's job timeout (180 seconds by
+# default) and leave the remaining e-mails to the next job.
+JOB_TIME_LIMIT = 120  # seconds
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 60  # seconds
+
+
+class EmailSendingError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class EmailStats:
+    queued: int
+    sent: int
+    failed: int
+    smtp_connections: int
 
 
 def parse_address(address_str: str) -> Result[NameAndAddress, str]:
@@ -41,15 +78,115 @@ def enqueue_email(
     subject: str,
     body: str,
 ) -> None:
-    """Enqueue e-mail to be sent asynchronously."""
-    sender_str = sender.format()
-    enqueue(send_email, sender_str, recipients, subject, body)
+    """Enqueue e-mail to be sent asynchronously.
+
+    E-mails are collected in an outbox that is drained by one job at a
+    time, so that bursts of e-mails are sent in batches over one
+    connection.
+    """
+    data = json.dumps(
+        {
+            'sender': sender.format(),
+            'recipients': recipients,
+            'subject': subject,
+            'body': body,
+        }
+    )
+
+    if _get_outbox().push(data):
+        enqueue(send_queued_emails)
+
+
+def send_queued_emails() -> None:
+    """Send a batch of the e-mails waiting in the outbox.
+
+    An e-mail that could not be sent is put back into the outbox to be
+    retried later, up to `MAX_ATTEMPTS` times. If e-mails are left,
+    another job is scheduled (with a delay if e-mails are to be
+    retried).
+
+    Raise an exception if e-mails had to be given up on, so that the
+    job is recorded as failed.
+    """
+    outbox = _get_outbox()
+    if not outbox.start():
+        # Another job is draining the outbox and takes care of the
+        # e-mails.
+        return
+
+    connection = _get_smtp_connection(get_smtp_config(current_app.config))
+    deadline = monotonic() + JOB_TIME_LIMIT
+
+    sent_count = 0
+    requeued_count = 0
+    failed_count = 0
+    connect_count_before = connection.connect_count
+
+    for data in outbox.claim_batch(BATCH_SIZE):
+        if monotonic() >= deadline:
+            # Leave the rest to the next job.
+            break
+
+        if not outbox.keep_draining():
+            # Another job has taken over, including the claimed e-mails.
+            break
+
+        email = json.loads(data)
+        try:
+            send(
+                email['sender'],
+                email['recipients'],
+                email['subject'],
+                email['body'],
+            )
+            sent_count += 1
+        except Exception as e:
+            # Keep going to not hold up the remaining e-mails.
+            attempts = email.get('attempts', 0) + 1
+            if attempts < MAX_ATTEMPTS:
+                log.warning(
+                    'Sending email failed, retrying later',
+                    recipients=email['recipients'],
+                    attempts=attempts,
+                    error=str(e),
+                )
+                outbox.requeue(json.dumps(email | {'attempts': attempts}))
+                requeued_count += 1
+            else:
+                log.error(
+                    'Sending email failed, giving up',
+                    recipients=email['recipients'],
+                    attempts=attempts,
+                    error=str(e),
+                )
+                failed_count += 1
+
+        outbox.acknowledge()
+
+    _record_stats(
+        sent=sent_count,
+        failed=failed_count,
+        smtp_connections=connection.connect_count - connect_count_before,
+    )
+
+    if outbox.release():
+        if requeued_count > 0:
+            retry_at = datetime.utcnow() + timedelta(seconds=RETRY_DELAY)
+            enqueue_at(retry_at, send_queued_emails)
+        else:
+            enqueue(send_queued_emails)
+
+    if failed_count > 0:
+        raise EmailSendingError(f'Gave up sending {failed_count} e-mail(s).')
 
 
 def send_email(
     sender: str, recipients: list[str], subject: str, body: str
 ) -> None:
-    """Send e-mail."""
+    """Send e-mail.
+
+    Kept for jobs enqueued individually (before the outbox existed).
+    """
     send(sender, recipients, subject, body)
 
 
@@ -78,28 +215,47 @@ def _build_message(
 
 
 def _send_via_smtp(message: EmailMessage) -> None:
-    """Send email via SMTP."""
-    config = current_app.config
-
-    host = config.get('MAIL_HOST', 'localhost')
-    port = config.get('MAIL_PORT', 25)
-    starttls = config.get('MAIL_STARTTLS', False)
-    use_ssl = config.get('MAIL_USE_SSL', False)
-    username = config.get('MAIL_USERNAME', None)
-    password = config.get('MAIL_PASSWORD', None)
-
-    if use_ssl:
-        with SMTP_SSL(host, port) as smtp:
-            if username and password:
-                smtp.login(username, password)
-
-            smtp.send_message(message)
-    else:
-        with SMTP(host, port) as smtp:
-            if starttls:
-                smtp.starttls()
-
-            if username and password:
-                smtp.login(username, password)
-
-            smtp.send_message(message)
+    """Send email via SMTP.
+
+    The connection is kept open to be reused for further e-mails sent
+    by this process.
+    """
+    config = get_smtp_config(current_app.config)
+    _get_smtp_connection(config).send(message)
+
+
+@cache
+def _get_smtp_connection(config: SmtpConfig) -> PooledSmtpConnection:
+    return PooledSmtpConnection(config)
+
+
+def _get_outbox() -> Outbox:
+    return Outbox(_OUTBOX_KEY)
+
+
+# -------------------------------------------------------------------- #
+# stats
+
+
+def _record_stats(*, sent: int, failed: int, smtp_connections: int) -> None:
+    pipeline = current_app.redis_client.pipeline()
+    pipeline.hincrby(_STATS_KEY, 'sent', sent)
+    pipeline.hincrby(_STATS_KEY, 'failed', failed)
+    pipeline.hincrby(_STATS_KEY, 'smtp_connections', smtp_connections)
+    pipeline.execute()
+
+
+def get_stats() -> EmailStats:
+    """Return the number of queued e-mails as well as the total numbers
+    of sent and failed e-mails and opened SMTP connections.
+    """
+    sent, failed, smtp_connections = current_app.redis_client.hmget(
+        _STATS_KEY, ['sent', 'failed', 'smtp_connections']
+    )
+
+    return EmailStats(
+        queued=len(_get_outbox()),
+        sent=int(sent or 0),
+        failed=int(failed or 0),
+        smtp_connections=int(smtp_connections or 0),
+    )
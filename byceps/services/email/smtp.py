@@ -0,0 +1,172 @@
+"""
+byceps.services.email.smtp
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Send messages over an SMTP connection that is kept open (and
+authenticated) between messages.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.message import EmailMessage
+from smtplib import (
+    SMTP,
+    SMTP_SSL,
+    SMTPResponseException,
+    SMTPServerDisconnected,
+)
+from threading import Lock
+import time
+from typing import Any
+
+import structlog
+
+
+log = structlog.get_logger()
+
+
+# Probe the connection before using it if it has been idle for longer
+# as servers tend to close idle connections.
+DEFAULT_MAX_IDLE_SECONDS = 30
+
+# Reply code for "Service not available, closing transmission channel"
+_SERVICE_NOT_AVAILABLE = 421
+
+
+@dataclass(frozen=True)
+class SmtpConfig:
+    host: str
+    port: int
+    starttls: bool
+    use_ssl: bool
+    username: str | None
+    password: str | None
+
+
+def get_smtp_config(config: dict[str, Any]) -> SmtpConfig:
+    """Assemble SMTP configuration from application configuration."""
+    return SmtpConfig(
+        host=config.get('MAIL_HOST', 'localhost'),
+        port=config.get('MAIL_PORT', 25),
+        starttls=config.get('MAIL_STARTTLS', False),
+        use_ssl=config.get('MAIL_USE_SSL', False),
+        username=config.get('MAIL_USERNAME', None),
+        password=config.get('MAIL_PASSWORD', None),
+    )
+
+
+def connect(config: SmtpConfig) -> SMTP:
+    """Open and authenticate an SMTP connection."""
+    if config.use_ssl:
+        smtp: SMTP = SMTP_SSL(config.host, config.port)
+    else:
+        smtp = SMTP(config.host, config.port)
+        if config.starttls:
+            smtp.starttls()
+
+    if config.username and config.password:
+        smtp.login(config.username, config.password)
+
+    return smtp
+
+
+class PooledSmtpConnection:
+    """An SMTP connection that is opened on first use, reused for
+    subsequent messages, and reopened if the server has dropped it.
+    """
+
+    def __init__(
+        self,
+        config: SmtpConfig,
+        *,
+        max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+        connect: Callable[[SmtpConfig], SMTP] = connect,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._config = config
+        self._max_idle_seconds = max_idle_seconds
+        self._connect = connect
+        self._clock = clock
+        self._smtp: SMTP | None = None
+        self._last_used_at: float | None = None
+        self._lock = Lock()
+        self.connect_count = 0
+
+    def send(self, message: EmailMessage) -> None:
+        """Send the message.
+
+        Reconnect and retry once if the connection turns out to be
+        broken.
+        """
+        with self._lock:
+            try:
+                self._get_smtp().send_message(message)
+            except Exception as e:
+                if not _is_connection_error(e):
+                    raise
+
+                log.info('SMTP connection lost, reconnecting', error=str(e))
+                self._close()
+                self._get_smtp().send_message(message)
+
+            self._last_used_at = self._clock()
+
+    def close(self) -> None:
+        """Close the connection, if open."""
+        with self._lock:
+            self._close()
+
+    def _get_smtp(self) -> SMTP:
+        if (self._smtp is not None) and self._is_idle_for_too_long():
+            if not self._is_alive(self._smtp):
+                self._close()
+
+        if self._smtp is None:
+            self._smtp = self._connect(self._config)
+            self._last_used_at = self._clock()
+            self.connect_count += 1
+
+        return self._smtp
+
+    def _is_idle_for_too_long(self) -> bool:
+        return (self._last_used_at is None) or (
+            self._clock() - self._last_used_at > self._max_idle_seconds
+        )
+
+    def _is_alive(self, smtp: SMTP) -> bool:
+        try:
+            code, _ = smtp.noop()
+        except Exception as e:
+            if not _is_connection_error(e):
+                raise
+            return False
+
+        return code == 250
+
+    def _close(self) -> None:
+        if self._smtp is None:
+            return
+
+        try:
+            self._smtp.quit()
+        except Exception:
+            # The connection might already be gone.
+            self._smtp.close()
+
+        self._smtp = None
+        self._last_used_at = None
+
+
+def _is_connection_error(e: Exception) -> bool:
+    if isinstance(e, SMTPServerDisconnected | ConnectionError | TimeoutError):
+        return True
+
+    return (
+        isinstance(e, SMTPResponseException)
+        and e.smtp_code == _SERVICE_NOT_AVAILABLE
+    )
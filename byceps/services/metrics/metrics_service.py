@@ -8,6 +8,10 @@ byceps.metrics.metrics_service
 
 from collections.abc import Iterator
 
+from byceps.services.authn.api import (
+    authn_api_rate_limit_service,
+    authn_api_request_count_service,
+)
 from byceps.services.board import (
     board_posting_query_service,
     board_service,
@@ -16,15 +20,14 @@ from byceps.services.board import (
 from byceps.services.brand import brand_service
 from byceps.services.brand.models import BrandID
 from byceps.services.consent import consent_service
+from byceps.services.email import email_service
 from byceps.services.metrics.models import Label, Metric
 from byceps.services.party import party_service
 from byceps.services.party.models import Party, PartyID
-from byceps.services.seating import seat_service
+from byceps.services.party_stats import party_stats_snapshot_service
 from byceps.services.shop.article import article_service as shop_article_service
-from byceps.services.shop.order import order_service
 from byceps.services.shop.shop import shop_service
 from byceps.services.shop.shop.models import Shop, ShopID
-from byceps.services.ticketing import ticket_service
 from byceps.services.user import user_stats_service
 
 
@@ -43,8 +46,10 @@ def collect_metrics() -> Iterator[Metric]:
     active_shops = shop_service.get_active_shops()
     active_shop_ids = {shop.id for shop in active_shops}
 
+    yield from _collect_api_metrics()
     yield from _collect_board_metrics(brand_ids)
     yield from _collect_consent_metrics()
+    yield from _collect_email_metrics()
     yield from _collect_shop_ordered_article_metrics(active_shop_ids)
     yield from _collect_shop_order_metrics(active_shops)
     yield from _collect_seating_metrics(active_party_ids)
@@ -52,6 +57,33 @@ def collect_metrics() -> Iterator[Metric]:
     yield from _collect_user_metrics()
 
 
+def _collect_api_metrics() -> Iterator[Metric]:
+    """Provide request counts per API token, and counts of throttled
+    requests per API token and endpoint group.
+    """
+    request_counts = authn_api_request_count_service.get_request_counts()
+    for api_token_id, count in request_counts.items():
+        yield Metric(
+            'api_requests_total',
+            count,
+            labels=[Label('api_token', str(api_token_id))],
+        )
+
+    throttled_request_counts = (
+        authn_api_rate_limit_service.get_throttled_request_counts()
+    )
+    for key, count in throttled_request_counts.items():
+        api_token_id, endpoint_group = key
+        yield Metric(
+            'api_requests_throttled_total',
+            count,
+            labels=[
+                Label('api_token', str(api_token_id)),
+                Label('endpoint_group', endpoint_group),
+            ],
+        )
+
+
 def _collect_board_metrics(brand_ids: list[BrandID]) -> Iterator[Metric]:
     for brand_id in brand_ids:
         boards = board_service.get_boards_for_brand(brand_id)
@@ -81,6 +113,15 @@ def _collect_consent_metrics() -> Iterator[Metric]:
         )
 
 
+def _collect_email_metrics() -> Iterator[Metric]:
+    stats = email_service.get_stats()
+
+    yield Metric('email_queued_count', stats.queued)
+    yield Metric('email_sent_total', stats.sent)
+    yield Metric('email_failed_total', stats.failed)
+    yield Metric('email_smtp_connections_total', stats.smtp_connections)
+
+
 def _collect_shop_ordered_article_metrics(
     shop_ids: set[ShopID],
 ) -> Iterator[Metric]:
@@ -102,9 +143,16 @@ def _collect_shop_ordered_article_metrics(
 
 def _collect_shop_order_metrics(shops: list[Shop]) -> Iterator[Metric]:
     """Provide order counts grouped by payment state for shops."""
+    order_stats_by_shop_id = (
+        party_stats_snapshot_service.get_order_stats_for_shops(
+            shop.id for shop in shops
+        )
+    )
+
     for shop in shops:
+        order_stats = order_stats_by_shop_id[shop.id]
         order_counts_per_payment_state = (
-            order_service.count_orders_per_payment_state(shop.id)
+            order_stats.order_counts_by_payment_state
         )
 
         for payment_state, quantity in order_counts_per_payment_state.items():
@@ -122,9 +170,15 @@ def _collect_seating_metrics(
     active_party_ids: list[PartyID],
 ) -> Iterator[Metric]:
     """Provide seat occupation counts per party and category."""
+    occupied_seat_counts_by_party_id = (
+        party_stats_snapshot_service.count_occupied_seats_by_category(
+            active_party_ids
+        )
+    )
+
     for party_id in active_party_ids:
-        occupied_seat_counts_by_category = (
-            seat_service.count_occupied_seats_by_category(party_id)
+        occupied_seat_counts_by_category = occupied_seat_counts_by_party_id.get(
+            party_id, []
         )
 
         for category, count in occupied_seat_counts_by_category:
@@ -140,29 +194,28 @@ def _collect_seating_metrics(
 
 def _collect_ticket_metrics(active_parties: list[Party]) -> Iterator[Metric]:
     """Provide ticket counts for active parties."""
+    stats_by_party_id = party_stats_snapshot_service.get_stats_for_parties(
+        party.id for party in active_parties
+    )
+
     for party in active_parties:
         party_id = party.id
         labels = [Label('party', party_id)]
+        stats = stats_by_party_id[party_id]
 
         max_ticket_quantity = party.max_ticket_quantity
         if max_ticket_quantity is not None:
             yield Metric('tickets_max', max_ticket_quantity, labels=labels)
 
-        tickets_revoked_count = ticket_service.count_revoked_tickets_for_party(
-            party_id
-        )
+        tickets_revoked_count = stats.tickets_revoked
         yield Metric(
             'tickets_revoked_count', tickets_revoked_count, labels=labels
         )
 
-        tickets_sold_count = ticket_service.count_sold_tickets_for_party(
-            party_id
-        )
+        tickets_sold_count = stats.ticket_sale_stats.tickets_sold
         yield Metric('tickets_sold_count', tickets_sold_count, labels=labels)
 
-        tickets_checked_in_count = (
-            ticket_service.count_tickets_checked_in_for_party(party_id)
-        )
+        tickets_checked_in_count = stats.tickets_checked_in
         yield Metric(
             'tickets_checked_in_count', tickets_checked_in_count, labels=labels
         )
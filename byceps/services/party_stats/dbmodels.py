@@ -0,0 +1,52 @@
+"""
+byceps.services.party_stats.dbmodels
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+from byceps.services.shop.shop.models import ShopID
+
+
+class DbPartyStatsSnapshot(db.Model):
+    """Ticket and seat statistics of a party, as computed at a certain
+    time.
+    """
+
+    __tablename__ = 'party_stats_snapshots'
+
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id'), primary_key=True
+    )
+    computed_at: Mapped[datetime]
+    tickets_max: Mapped[int | None]
+    tickets_sold: Mapped[int]
+    tickets_revoked: Mapped[int]
+    tickets_checked_in: Mapped[int]
+    seats_occupied: Mapped[int]
+    seats_total: Mapped[int]
+    occupied_seats_by_category: Mapped[list[dict[str, Any]]] = mapped_column(
+        db.JSONB
+    )
+
+
+class DbShopOrderStatsSnapshot(db.Model):
+    """Order statistics of a shop, as computed at a certain time."""
+
+    __tablename__ = 'shop_order_stats_snapshots'
+
+    shop_id: Mapped[ShopID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('shops.id'), primary_key=True
+    )
+    computed_at: Mapped[datetime]
+    order_counts_by_payment_state: Mapped[dict[str, int]] = mapped_column(
+        db.JSONB
+    )
@@ -0,0 +1,36 @@
+"""
+byceps.services.party_stats.models
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from byceps.services.party.models import PartyID
+from byceps.services.seating.models import SeatUtilization
+from byceps.services.shop.order.models.order import PaymentState
+from byceps.services.shop.shop.models import ShopID
+from byceps.services.ticketing.models.ticket import TicketSaleStats
+
+
+@dataclass(frozen=True)
+class PartyStats:
+    party_id: PartyID
+    ticket_sale_stats: TicketSaleStats
+    tickets_revoked: int
+    tickets_checked_in: int
+    seat_utilization: SeatUtilization
+
+
+@dataclass(frozen=True)
+class ShopOrderStats:
+    shop_id: ShopID
+    order_counts_by_payment_state: dict[PaymentState, int]
+
+    @property
+    def open_orders(self) -> int:
+        return self.order_counts_by_payment_state.get(PaymentState.open, 0)
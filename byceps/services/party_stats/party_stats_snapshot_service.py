@@ -0,0 +1,442 @@
+"""
+byceps.services.party_stats.party_stats_snapshot_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Snapshots of party and shop order statistics, so that dashboards and
+metrics scrapes do not have to aggregate tickets, seats, and orders
+every time.
+
+Snapshots of active parties and shops are refreshed by a job that runs
+periodically, and by a job scheduled shortly after tickets have been
+sold or checked in, or orders have been placed, paid, or canceled.
+Changes without a signal (e.g. revoked tickets) show up with the next
+periodic refresh.
+
+Snapshots older than the configured maximum age are not used; the
+figures are computed live (and stored as new snapshot) instead.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from flask import current_app
+from redis.exceptions import RedisError
+from sqlalchemy import select, Table
+from sqlalchemy.dialects.postgresql import insert
+import structlog
+
+from byceps.database import db
+from byceps.services.party import party_service
+from byceps.services.party.models import PartyID
+from byceps.services.seating.models import SeatUtilization
+from byceps.services.shop.order import order_service
+from byceps.services.shop.order.models.order import PaymentState
+from byceps.services.shop.shop import shop_service
+from byceps.services.shop.shop.models import ShopID
+from byceps.services.ticketing.models.ticket import (
+    TicketCategory,
+    TicketCategoryID,
+    TicketSaleStats,
+)
+from byceps.signals import (
+    party as party_signals,
+    shop as shop_signals,
+    ticketing as ticketing_signals,
+)
+from byceps.util.jobqueue import enqueue_at
+
+from . import party_stats_service
+from .dbmodels import DbPartyStatsSnapshot, DbShopOrderStatsSnapshot
+from .models import PartyStats, ShopOrderStats
+
+
+log = structlog.get_logger()
+
+
+_REFRESH_SCHEDULED_KEY = 'byceps:party_stats:snapshots:refresh_scheduled'
+_PERIODIC_REFRESH_SCHEDULED_KEY = (
+    'byceps:party_stats:snapshots:periodic_refresh_scheduled'
+)
+
+
+def is_enabled() -> bool:
+    """Return `True` if snapshots are used."""
+    return current_app.config['PARTY_STATS_SNAPSHOTS_ENABLED']
+
+
+# -------------------------------------------------------------------- #
+# retrieval
+
+
+def get_stats_for_party(party_id: PartyID) -> PartyStats:
+    """Return ticket and seat statistics for the party."""
+    stats_by_party_id = get_stats_for_parties([party_id])
+
+    stats = stats_by_party_id.get(party_id)
+    if stats is None:
+        raise ValueError(f'Unknown party ID "{party_id}"')
+
+    return stats
+
+
+def get_stats_for_parties(
+    party_ids: Iterable[PartyID],
+) -> dict[PartyID, PartyStats]:
+    """Return ticket and seat statistics for the parties, indexed by
+    party ID.
+    """
+    party_ids = set(party_ids)
+
+    if not is_enabled():
+        return party_stats_service.get_stats_for_parties(party_ids)
+
+    snapshots = _get_current_party_snapshots(party_ids)
+
+    return {
+        party_id: _party_snapshot_to_stats(snapshot)
+        for party_id, snapshot in snapshots.items()
+    }
+
+
+def count_occupied_seats_by_category(
+    party_ids: Iterable[PartyID],
+) -> dict[PartyID, list[tuple[TicketCategory, int]]]:
+    """Count occupied seats for the parties, grouped by ticket category,
+    indexed by party ID.
+    """
+    party_ids = set(party_ids)
+
+    if not is_enabled():
+        return party_stats_service.count_occupied_seats_by_category(party_ids)
+
+    snapshots = _get_current_party_snapshots(party_ids)
+
+    return {
+        party_id: _party_snapshot_to_occupied_seat_counts(snapshot)
+        for party_id, snapshot in snapshots.items()
+        if snapshot['occupied_seats_by_category']
+    }
+
+
+def get_order_stats_for_shops(
+    shop_ids: Iterable[ShopID],
+) -> dict[ShopID, ShopOrderStats]:
+    """Return order statistics for the shops, indexed by shop ID."""
+    shop_ids = set(shop_ids)
+
+    if not is_enabled():
+        counts_by_shop_id = (
+            order_service.count_orders_per_payment_state_for_shops(shop_ids)
+        )
+        return {
+            shop_id: ShopOrderStats(
+                shop_id=shop_id, order_counts_by_payment_state=counts
+            )
+            for shop_id, counts in counts_by_shop_id.items()
+        }
+
+    snapshots = _get_current_snapshots(
+        DbShopOrderStatsSnapshot.__table__,
+        'shop_id',
+        shop_ids,
+        refresh_shop_snapshots,
+    )
+
+    return {
+        shop_id: _shop_snapshot_to_stats(snapshot)
+        for shop_id, snapshot in snapshots.items()
+    }
+
+
+def _get_current_party_snapshots(
+    party_ids: set[PartyID],
+) -> dict[PartyID, Mapping[str, Any]]:
+    return _get_current_snapshots(
+        DbPartyStatsSnapshot.__table__,
+        'party_id',
+        party_ids,
+        refresh_party_snapshots,
+    )
+
+
+def _get_current_snapshots(
+    table: Table,
+    key_column_name: str,
+    keys: set,
+    refresh: Callable[[set], None],
+) -> dict[Any, Mapping[str, Any]]:
+    """Return snapshots that are not older than allowed.
+
+    Snapshots that are missing or outdated are computed and stored
+    first.
+    """
+    if not keys:
+        return {}
+
+    snapshots = _find_snapshots(table, key_column_name, keys)
+
+    max_age = current_app.config['PARTY_STATS_SNAPSHOTS_MAX_AGE']
+    min_computed_at = datetime.utcnow() - timedelta(seconds=max_age)
+    outdated_keys = {
+        key
+        for key in keys
+        if (key not in snapshots)
+        or (snapshots[key]['computed_at'] < min_computed_at)
+    }
+
+    if outdated_keys:
+        refresh(outdated_keys)
+        snapshots.update(_find_snapshots(table, key_column_name, outdated_keys))
+
+    return snapshots
+
+
+def _find_snapshots(
+    table: Table, key_column_name: str, keys: set
+) -> dict[Any, Mapping[str, Any]]:
+    key_column = table.c[key_column_name]
+
+    rows = db.session.execute(
+        select(table).filter(key_column.in_(keys))
+    ).mappings()
+
+    return {row[key_column_name]: row for row in rows}
+
+
+def _party_snapshot_to_stats(snapshot: Mapping[str, Any]) -> PartyStats:
+    return PartyStats(
+        party_id=snapshot['party_id'],
+        ticket_sale_stats=TicketSaleStats(
+            tickets_max=snapshot['tickets_max'],
+            tickets_sold=snapshot['tickets_sold'],
+        ),
+        tickets_revoked=snapshot['tickets_revoked'],
+        tickets_checked_in=snapshot['tickets_checked_in'],
+        seat_utilization=SeatUtilization(
+            occupied=snapshot['seats_occupied'],
+            total=snapshot['seats_total'],
+        ),
+    )
+
+
+def _party_snapshot_to_occupied_seat_counts(
+    snapshot: Mapping[str, Any],
+) -> list[tuple[TicketCategory, int]]:
+    return [
+        (
+            TicketCategory(
+                id=TicketCategoryID(UUID(item['category_id'])),
+                party_id=snapshot['party_id'],
+                title=item['category_title'],
+            ),
+            item['occupied_seat_count'],
+        )
+        for item in snapshot['occupied_seats_by_category']
+    ]
+
+
+def _shop_snapshot_to_stats(snapshot: Mapping[str, Any]) -> ShopOrderStats:
+    counts = snapshot['order_counts_by_payment_state']
+
+    return ShopOrderStats(
+        shop_id=snapshot['shop_id'],
+        order_counts_by_payment_state={
+            payment_state: counts.get(payment_state.name, 0)
+            for payment_state in PaymentState
+        },
+    )
+
+
+# -------------------------------------------------------------------- #
+# refresh
+
+
+def refresh_snapshots() -> None:
+    """Refresh the snapshots of all active parties and shops."""
+    # Allow scheduling of another refresh for changes from now on.
+    try:
+        current_app.redis_client.delete(_REFRESH_SCHEDULED_KEY)
+    except RedisError as e:
+        log.warning('Could not reset snapshot refresh flag', error=str(e))
+
+    _refresh_active_snapshots()
+
+
+def refresh_snapshots_periodically() -> None:
+    """Refresh the snapshots of all active parties and shops, then
+    schedule the next periodic refresh.
+    """
+    current_app.redis_client.delete(_PERIODIC_REFRESH_SCHEDULED_KEY)
+
+    try:
+        _refresh_active_snapshots()
+    finally:
+        schedule_periodic_refresh()
+
+
+def _refresh_active_snapshots() -> None:
+    party_ids = {party.id for party in party_service.get_active_parties()}
+    refresh_party_snapshots(party_ids)
+
+    shop_ids = {shop.id for shop in shop_service.get_active_shops()}
+    refresh_shop_snapshots(shop_ids)
+
+
+def refresh_party_snapshots(party_ids: set[PartyID]) -> None:
+    """Compute and store snapshots of the parties' statistics."""
+    if not party_ids:
+        return
+
+    computed_at = datetime.utcnow()
+
+    stats_by_party_id = party_stats_service.get_stats_for_parties(party_ids)
+    occupied_seat_counts_by_party_id = (
+        party_stats_service.count_occupied_seats_by_category(party_ids)
+    )
+
+    rows = [
+        {
+            'party_id': party_id,
+            'computed_at': computed_at,
+            'tickets_max': stats.ticket_sale_stats.tickets_max,
+            'tickets_sold': stats.ticket_sale_stats.tickets_sold,
+            'tickets_revoked': stats.tickets_revoked,
+            'tickets_checked_in': stats.tickets_checked_in,
+            'seats_occupied': stats.seat_utilization.occupied,
+            'seats_total': stats.seat_utilization.total,
+            'occupied_seats_by_category': [
+                {
+                    'category_id': str(category.id),
+                    'category_title': category.title,
+                    'occupied_seat_count': count,
+                }
+                for category, count in occupied_seat_counts_by_party_id.get(
+                    party_id, []
+                )
+            ],
+        }
+        for party_id, stats in stats_by_party_id.items()
+    ]
+
+    _store_snapshots(DbPartyStatsSnapshot.__table__, rows)
+
+
+def refresh_shop_snapshots(shop_ids: set[ShopID]) -> None:
+    """Compute and store snapshots of the shops' order statistics."""
+    if not shop_ids:
+        return
+
+    computed_at = datetime.utcnow()
+
+    counts_by_shop_id = order_service.count_orders_per_payment_state_for_shops(
+        shop_ids
+    )
+
+    rows = [
+        {
+            'shop_id': shop_id,
+            'computed_at': computed_at,
+            'order_counts_by_payment_state': {
+                payment_state.name: count
+                for payment_state, count in counts.items()
+            },
+        }
+        for shop_id, counts in counts_by_shop_id.items()
+    ]
+
+    _store_snapshots(DbShopOrderStatsSnapshot.__table__, rows)
+
+
+def _store_snapshots(table: Table, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+
+    insert_stmt = insert(table).values(rows)
+    stmt = insert_stmt.on_conflict_do_update(
+        constraint=table.primary_key,
+        set_={
+            column.name: insert_stmt.excluded[column.name]
+            for column in table.columns
+            if not column.primary_key
+        },
+        # Never replace a snapshot with an older one.
+        where=(table.c.computed_at < insert_stmt.excluded.computed_at),
+    )
+    db.session.execute(stmt)
+    db.session.commit()
+
+
+# -------------------------------------------------------------------- #
+# scheduling
+
+
+def schedule_refresh() -> None:
+    """Schedule a refresh of the snapshots of all active parties and
+    shops, unless one is already pending.
+    """
+    if not is_enabled():
+        return
+
+    refresh_delay = current_app.config['PARTY_STATS_SNAPSHOTS_REFRESH_DELAY']
+
+    _schedule(_REFRESH_SCHEDULED_KEY, refresh_delay, refresh_snapshots)
+
+
+def schedule_periodic_refresh() -> None:
+    """Schedule the next periodic refresh of the snapshots, unless one
+    is already pending.
+    """
+    if not is_enabled():
+        return
+
+    refresh_interval = current_app.config[
+        'PARTY_STATS_SNAPSHOTS_REFRESH_INTERVAL'
+    ]
+
+    _schedule(
+        _PERIODIC_REFRESH_SCHEDULED_KEY,
+        refresh_interval,
+        refresh_snapshots_periodically,
+    )
+
+
+def _schedule(flag_key: str, delay: int, func: Callable[[], None]) -> None:
+    # Let the flag expire in case the job gets lost.
+    flag_ttl = delay + 60
+
+    try:
+        if current_app.redis_client.set(flag_key, 1, nx=True, ex=flag_ttl):
+            run_at = datetime.utcnow() + timedelta(seconds=delay)
+            enqueue_at(run_at, func)
+    except RedisError as e:
+        log.warning(
+            'Could not schedule party stats snapshot refresh', error=str(e)
+        )
+
+
+def enable_refresh_on_changes() -> None:
+    """Connect signals that indicate changes to the statistics."""
+    for signal in [
+        party_signals.party_updated,
+        shop_signals.order_placed,
+        shop_signals.order_canceled,
+        shop_signals.order_paid,
+        ticketing_signals.ticket_checked_in,
+        ticketing_signals.tickets_sold,
+    ]:
+        signal.connect(_on_stats_changed)
+
+
+def _on_stats_changed(sender, **kwargs) -> None:
+    schedule_refresh()
+
+    # Restart the chain of periodic refreshes should it have been
+    # interrupted.
+    schedule_periodic_refresh()
@@ -15,7 +15,10 @@ from uuid import UUID
 from pydantic import BaseModel
 
 from byceps.services.party.models import PartyID
-from byceps.services.ticketing.models.ticket import TicketCategoryID
+from byceps.services.ticketing.models.ticket import (
+    TicketCategoryID,
+    TicketID,
+)
 
 
 SeatingAreaID = NewType('SeatingAreaID', UUID)
@@ -50,6 +53,21 @@ class Seat:
 SeatGroupID = NewType('SeatGroupID', UUID)
 
 
+@dataclass(frozen=True)
+class SeatOccupancy:
+    ticket_id: TicketID
+    occupier_screen_name: str | None
+    occupier_avatar_url: str | None
+
+
+@dataclass(frozen=True)
+class SeatPlan:
+    area_id: SeatingAreaID
+    version: str | None
+    seats: list[Seat]
+    occupancies: dict[SeatID, SeatOccupancy]
+
+
 @dataclass(frozen=True)
 class SeatUtilization:
     occupied: int
@@ -0,0 +1,166 @@
+"""
+byceps.services.seating.seat_occupancy_feed_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Push changes of which seats in an area are occupied by whom to clients
+as server-sent events.
+
+Changes are published via Redis so that clients connected to any
+application process receive them.
+
+Streams end after a while (and clients then reconnect) to not tie up
+workers indefinitely. Changes made in the meantime are detected by
+comparing the seat plan version known to the client to the current one,
+in which case the client is asked to fetch the whole plan again.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+import json
+import time
+from typing import Any
+
+from flask import current_app
+from redis.exceptions import RedisError
+import structlog
+
+from .models import SeatID, SeatingAreaID, SeatOccupancy
+
+
+log = structlog.get_logger()
+
+
+_CHANNEL_PREFIX = 'byceps:seating:seat_occupancy'
+
+_STREAM_DURATION = 60  # seconds
+_KEEPALIVE_INTERVAL = 15  # seconds
+_RECONNECT_DELAY = 3000  # milliseconds
+
+
+def is_enabled() -> bool:
+    """Return `True` if changes are pushed to clients."""
+    return current_app.config['SEATING_PLAN_LIVE_UPDATES_ENABLED']
+
+
+def publish_occupancy_changes(
+    area_id: SeatingAreaID,
+    version: str | None,
+    occupancies: Mapping[SeatID, SeatOccupancy | None],
+) -> None:
+    """Publish the current occupancies of seats that have changed.
+
+    Released seats have no occupancy.
+    """
+    if not is_enabled():
+        return
+
+    message = json.dumps(
+        {
+            'version': version,
+            'changes': [
+                serialize_seat_occupancy(seat_id, occupancy)
+                for seat_id, occupancy in occupancies.items()
+            ],
+        }
+    )
+
+    try:
+        current_app.redis_client.publish(_get_channel(area_id), message)
+    except RedisError as e:
+        log.warning(
+            'Could not publish seat occupancy changes',
+            area_id=str(area_id),
+            error=str(e),
+        )
+
+
+def serialize_seat_occupancy(
+    seat_id: SeatID, occupancy: SeatOccupancy | None
+) -> dict[str, Any]:
+    """Serialize the seat's occupancy to a JSON-compatible dictionary."""
+    if occupancy is None:
+        return {
+            'seat_id': str(seat_id),
+            'ticket_id': None,
+            'occupier_screen_name': None,
+            'occupier_avatar_url': None,
+        }
+
+    return {
+        'seat_id': str(seat_id),
+        'ticket_id': str(occupancy.ticket_id),
+        'occupier_screen_name': occupancy.occupier_screen_name,
+        'occupier_avatar_url': occupancy.occupier_avatar_url,
+    }
+
+
+def stream_events(
+    area_id: SeatingAreaID,
+    last_version: str | None,
+    get_current_version: Callable[[], str | None],
+    *,
+    duration: float = _STREAM_DURATION,
+) -> Iterator[str]:
+    """Yield server-sent events for changes of seat occupancy in the
+    area, for a limited time.
+
+    A `resync` event comes first if the current seat plan version
+    differs from the last one known to the client.
+    """
+    pubsub = current_app.redis_client.pubsub(ignore_subscribe_messages=True)
+
+    try:
+        # Subscribe before comparing versions to not miss any change
+        # made in between.
+        pubsub.subscribe(_get_channel(area_id))
+
+        yield f'retry: {_RECONNECT_DELAY}\n\n'
+
+        if last_version is not None:
+            current_version = get_current_version()
+            if current_version != last_version:
+                yield _format_event('resync', {}, event_id=current_version)
+
+        deadline = time.monotonic() + duration
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=min(remaining, _KEEPALIVE_INTERVAL),
+            )
+
+            if message is None:
+                # Keep proxies from closing the idle connection.
+                yield ': keep-alive\n\n'
+                continue
+
+            data = json.loads(message['data'])
+            yield _format_event(
+                'occupancy', data['changes'], event_id=data['version']
+            )
+    except RedisError as e:
+        log.warning(
+            'Seat occupancy feed unavailable',
+            area_id=str(area_id),
+            error=str(e),
+        )
+    finally:
+        pubsub.close()
+
+
+def _format_event(name: str, data: Any, *, event_id: str | None) -> str:
+    lines = [f'event: {name}']
+
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+
+    lines.append(f'data: {json.dumps(data)}')
+
+    return '\n'.join(lines) + '\n\n'
+
+
+def _get_channel(area_id: SeatingAreaID) -> str:
+    return f'{_CHANNEL_PREFIX}:{area_id}'
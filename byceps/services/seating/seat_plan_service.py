@@ -0,0 +1,267 @@
+"""
+byceps.services.seating.seat_plan_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Provide what is needed to display the seating plan of an area.
+
+The plan consists of the seats' geometry, which hardly ever changes, and
+an overlay of which seats are occupied by which ticket (and user). Both
+are cached separately, per area.
+
+Each area's seats and occupancies have a generation of their own, which
+is bumped to invalidate them. The generations also make up the plan's
+version, which allows clients to revalidate their copy without the plan
+being loaded at all. The generations are maintained if live updates are
+enabled, too, even with the cache disabled, as clients rely on the
+version to detect changes they missed.
+
+Changes of occupancies are also pushed to clients watching the area, if
+enabled.
+
+Changes to users' screen names and avatars only show up once the cached
+occupancies have expired.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+
+from byceps.database import db
+from byceps.services.ticketing.dbmodels.ticket import DbTicket
+from byceps.services.ticketing.models.ticket import TicketID
+from byceps.services.user import user_service
+from byceps.services.user.models.user import User, UserID
+from byceps.util.cache import GenerationalCache
+
+from . import seat_occupancy_feed_service, seat_service
+from .dbmodels.seat import DbSeat
+from .models import Seat, SeatID, SeatingAreaID, SeatOccupancy, SeatPlan
+
+
+_cache = GenerationalCache(
+    'seat plan',
+    'byceps:seating:seat_plan:generation',
+    maxsize=256,
+    ttl_config_key='SEATING_PLAN_CACHE_TTL',
+    enabled_config_key='SEATING_PLAN_CACHE_ENABLED',
+)
+
+
+def is_enabled() -> bool:
+    """Return `True` if the cache is enabled."""
+    return _cache.is_enabled()
+
+
+def _is_versioning_enabled() -> bool:
+    return is_enabled() or seat_occupancy_feed_service.is_enabled()
+
+
+# -------------------------------------------------------------------- #
+# retrieval
+
+
+def get_seat_plan(area_id: SeatingAreaID) -> SeatPlan:
+    """Return the seating plan of the area."""
+    if not is_enabled():
+        # Obtain the version first so that it never claims to include
+        # changes the loaded plan is missing.
+        version = get_seat_plan_version(area_id)
+        return _load_seat_plan(area_id, version)
+
+    generations = _get_generations(area_id)
+    if generations is None:
+        return _load_seat_plan(area_id, None)
+
+    seats_generation, occupancies_generation = generations
+
+    seats = _cache.get_or_set(
+        ('seats', area_id, seats_generation),
+        lambda: _load_seats(area_id),
+    )
+
+    occupancies = _cache.get_or_set(
+        ('occupancies', area_id, occupancies_generation),
+        lambda: _load_occupancies(area_id),
+    )
+
+    return SeatPlan(
+        area_id=area_id,
+        version=_build_version(generations),
+        seats=seats,
+        occupancies=occupancies,
+    )
+
+
+def get_seat_plan_version(area_id: SeatingAreaID) -> str | None:
+    """Return the current version of the area's seating plan, or `None`
+    if it is unknown (because neither the cache nor live updates are
+    enabled, or Redis is unavailable).
+    """
+    if not _is_versioning_enabled():
+        return None
+
+    generations = _get_generations(area_id)
+    if generations is None:
+        return None
+
+    return _build_version(generations)
+
+
+def _load_seat_plan(area_id: SeatingAreaID, version: str | None) -> SeatPlan:
+    return SeatPlan(
+        area_id=area_id,
+        version=version,
+        seats=_load_seats(area_id),
+        occupancies=_load_occupancies(area_id),
+    )
+
+
+def _build_version(generations: list[int]) -> str:
+    return '.'.join(map(str, generations))
+
+
+def _load_seats(area_id: SeatingAreaID) -> list[Seat]:
+    seats = seat_service.get_seats_for_area(area_id)
+    return sorted(seats, key=lambda seat: (seat.coord_x, seat.coord_y))
+
+
+def _load_occupancies(area_id: SeatingAreaID) -> dict[SeatID, SeatOccupancy]:
+    rows = db.session.execute(
+        select(DbTicket.occupied_seat_id, DbTicket.id, DbTicket.used_by_id)
+        .join(DbSeat, DbSeat.id == DbTicket.occupied_seat_id)
+        .filter(DbSeat.area_id == area_id)
+    ).all()
+
+    users_by_id = _get_users_by_id(user_id for _, _, user_id in rows)
+
+    return {
+        seat_id: _build_occupancy(ticket_id, user_id, users_by_id)
+        for seat_id, ticket_id, user_id in rows
+    }
+
+
+def _load_occupancies_of_seats(
+    seat_ids: set[SeatID],
+) -> dict[SeatingAreaID, dict[SeatID, SeatOccupancy | None]]:
+    """Return the occupancies of the seats (`None` if unoccupied),
+    grouped by area.
+    """
+    rows = db.session.execute(
+        select(DbSeat.area_id, DbSeat.id, DbTicket.id, DbTicket.used_by_id)
+        .outerjoin(DbTicket, DbTicket.occupied_seat_id == DbSeat.id)
+        .filter(DbSeat.id.in_(seat_ids))
+    ).all()
+
+    users_by_id = _get_users_by_id(user_id for _, _, _, user_id in rows)
+
+    occupancies_by_area_id: dict[
+        SeatingAreaID, dict[SeatID, SeatOccupancy | None]
+    ] = defaultdict(dict)
+    for area_id, seat_id, ticket_id, user_id in rows:
+        occupancies_by_area_id[area_id][seat_id] = (
+            _build_occupancy(ticket_id, user_id, users_by_id)
+            if (ticket_id is not None)
+            else None
+        )
+
+    return occupancies_by_area_id
+
+
+def _get_users_by_id(user_ids: Iterable[UserID | None]) -> dict[UserID, User]:
+    return user_service.get_users_indexed_by_id(
+        {user_id for user_id in user_ids if user_id is not None},
+        include_avatars=True,
+    )
+
+
+def _build_occupancy(
+    ticket_id: TicketID, user_id: UserID | None, users_by_id: dict[UserID, User]
+) -> SeatOccupancy:
+    user = users_by_id.get(user_id) if (user_id is not None) else None
+
+    return SeatOccupancy(
+        ticket_id=ticket_id,
+        occupier_screen_name=user.screen_name if user else None,
+        occupier_avatar_url=user.avatar_url if user else None,
+    )
+
+
+# -------------------------------------------------------------------- #
+# invalidation
+
+
+def invalidate_seats(area_ids: Iterable[SeatingAreaID]) -> None:
+    """Make all processes reload the seats of the areas (after seats
+    have been created or deleted).
+    """
+    for area_id in set(area_ids):
+        _bump_generation(_get_seats_namespace(area_id))
+
+
+def handle_occupancy_changes(seat_ids: Iterable[SeatID]) -> None:
+    """Make all processes reload the occupancies of the areas the seats
+    belong to, and push the seats' current occupancies to clients.
+
+    To be called after the changes have been committed.
+    """
+    live_updates_enabled = seat_occupancy_feed_service.is_enabled()
+    if not is_enabled() and not live_updates_enabled:
+        return
+
+    seat_ids = set(seat_ids)
+    if not seat_ids:
+        return
+
+    occupancies_by_area_id = _load_occupancies_of_seats(seat_ids)
+
+    invalidate_occupancies(occupancies_by_area_id.keys())
+
+    if live_updates_enabled:
+        for area_id, occupancies in occupancies_by_area_id.items():
+            seat_occupancy_feed_service.publish_occupancy_changes(
+                area_id, get_seat_plan_version(area_id), occupancies
+            )
+
+
+def invalidate_occupancies(area_ids: Iterable[SeatingAreaID]) -> None:
+    """Make all processes reload which seats in the areas are occupied
+    by whom.
+    """
+    for area_id in set(area_ids):
+        _bump_generation(_get_occupancies_namespace(area_id))
+
+
+def _bump_generation(namespace: str) -> None:
+    if not _is_versioning_enabled():
+        return
+
+    _cache.bump(namespace)
+
+
+def clear_cache() -> None:
+    """Remove all seats and occupancies cached by this process."""
+    _cache.clear()
+
+
+# -------------------------------------------------------------------- #
+# generations
+
+
+def _get_generations(area_id: SeatingAreaID) -> list[int] | None:
+    return _cache.get_generations(
+        [_get_seats_namespace(area_id), _get_occupancies_namespace(area_id)]
+    )
+
+
+def _get_seats_namespace(area_id: SeatingAreaID) -> str:
+    return f'area:{area_id}:seats'
+
+
+def _get_occupancies_namespace(area_id: SeatingAreaID) -> str:
+    return f'area:{area_id}:occupancies'
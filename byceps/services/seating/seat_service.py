@@ -21,6 +21,7 @@ from byceps.services.ticketing.models.ticket import (
     TicketCategoryID,
 )
 
+from . import seat_plan_service
 from .dbmodels.area import DbSeatingArea
 from .dbmodels.seat import DbSeat
 from .models import Seat, SeatID, SeatingAreaID, SeatUtilization
@@ -50,6 +51,8 @@ def create_seat(
     db.session.add(db_seat)
     db.session.commit()
 
+    seat_plan_service.invalidate_seats([area_id])
+
     return _db_entity_to_seat(db_seat)
 
 
@@ -71,12 +74,19 @@ def create_seats(seats: Iterator[Seat]) -> None:
     db.session.add_all(db_seats)
     db.session.commit()
 
+    seat_plan_service.invalidate_seats(db_seat.area_id for db_seat in db_seats)
+
 
 def delete_seat(seat_id: SeatID) -> None:
     """Delete a seat."""
-    db.session.execute(delete(DbSeat).filter_by(id=seat_id))
+    area_id = db.session.execute(
+        delete(DbSeat).filter_by(id=seat_id).returning(DbSeat.area_id)
+    ).scalar_one_or_none()
     db.session.commit()
 
+    if area_id is not None:
+        seat_plan_service.invalidate_seats([area_id])
+
 
 def count_occupied_seats_by_category(
     party_id: PartyID,
@@ -181,6 +191,15 @@ def find_seats(seat_ids: set[SeatID]) -> set[Seat]:
     return {_db_entity_to_seat(db_seat) for db_seat in db_seats}
 
 
+def get_seats_for_area(area_id: SeatingAreaID) -> list[Seat]:
+    """Return the seats in that area."""
+    db_seats = db.session.scalars(
+        select(DbSeat).filter_by(area_id=area_id)
+    ).all()
+
+    return [_db_entity_to_seat(db_seat) for db_seat in db_seats]
+
+
 def get_seats_with_tickets_for_area(
     area_id: SeatingAreaID,
 ) -> list[tuple[Seat, DbTicket | None]]:
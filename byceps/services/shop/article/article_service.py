@@ -9,6 +9,9 @@ byceps.services.shop.article.article_service
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Mapping
+import dataclasses
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 
@@ -24,9 +27,10 @@ from byceps.services.shop.shop.models import ShopID
 from byceps.services.ticketing.models.ticket import TicketCategoryID
 from byceps.util.result import Err, Ok, Result
 
+from . import orderable_articles_cache
 from .dbmodels.article import DbArticle
 from .dbmodels.attached_article import DbAttachedArticle
-from .errors import NoArticlesAvailableError
+from .errors import ArticlesSoldOutError, NoArticlesAvailableError
 from .models import (
     Article,
     ArticleAttachment,
@@ -82,6 +86,8 @@ def create_article(
     db.session.add(db_article)
     db.session.commit()
 
+    orderable_articles_cache.invalidate(shop_id)
+
     return _db_entity_to_article(db_article)
 
 
@@ -193,6 +199,8 @@ def update_article(
 
     db.session.commit()
 
+    orderable_articles_cache.invalidate(db_article.shop_id)
+
     return _db_entity_to_article(db_article)
 
 
@@ -209,14 +217,27 @@ def attach_article(
     db.session.add(db_attached_article)
     db.session.commit()
 
+    orderable_articles_cache.invalidate(
+        db_attached_article.attached_to_article.shop_id
+    )
+
 
 def unattach_article(attached_article_id: AttachedArticleID) -> None:
     """Unattach an article from another."""
+    shop_id = db.session.execute(
+        select(DbArticle.shop_id)
+        .join(DbAttachedArticle, DbAttachedArticle.article_id == DbArticle.id)
+        .filter(DbAttachedArticle.id == attached_article_id)
+    ).scalar_one_or_none()
+
     db.session.execute(
         delete(DbAttachedArticle).filter_by(id=attached_article_id)
     )
     db.session.commit()
 
+    if shop_id is not None:
+        orderable_articles_cache.invalidate(shop_id)
+
 
 def increase_quantity(
     article_id: ArticleID, quantity_to_increase_by: int, *, commit: bool = True
@@ -232,25 +253,55 @@ def increase_quantity(
         db.session.commit()
 
 
-def decrease_quantity(
-    article_id: ArticleID, quantity_to_decrease_by: int, *, commit: bool = True
-) -> None:
-    """Decrease article quantity by the given value."""
-    db.session.execute(
-        update(DbArticle)
-        .where(DbArticle.id == article_id)
-        .values(quantity=DbArticle.quantity - quantity_to_decrease_by)
-    )
+def reserve_quantities(
+    quantities_by_article_id: Mapping[ArticleID, int],
+) -> Result[None, ArticlesSoldOutError]:
+    """Decrease the quantities of the articles by the given values, but
+    only if enough units of all of them are available.
 
-    if commit:
-        db.session.commit()
+    Each quantity is checked and decreased in a single statement, so
+    concurrent reservations cannot oversell an article. Articles are
+    updated in a fixed order to prevent deadlocks between concurrent
+    reservations of overlapping sets of articles.
+
+    Does not commit. On error, the caller has to roll back the
+    transaction to release the quantities that have been reserved for
+    other articles.
+    """
+    sold_out_article_ids = set()
+
+    for article_id in sorted(quantities_by_article_id):
+        quantity = quantities_by_article_id[article_id]
+
+        reserved_article_id = db.session.execute(
+            update(DbArticle)
+            .where(DbArticle.id == article_id)
+            .where(DbArticle.quantity >= quantity)
+            .values(quantity=DbArticle.quantity - quantity)
+            .returning(DbArticle.id)
+        ).scalar_one_or_none()
+
+        if reserved_article_id is None:
+            sold_out_article_ids.add(article_id)
+
+    if sold_out_article_ids:
+        return Err(ArticlesSoldOutError(frozenset(sold_out_article_ids)))
+
+    return Ok(None)
 
 
 def delete_article(article_id: ArticleID) -> None:
     """Delete an article."""
+    shop_id = db.session.execute(
+        select(DbArticle.shop_id).filter_by(id=article_id)
+    ).scalar_one_or_none()
+
     db.session.execute(delete(DbArticle).filter_by(id=article_id))
     db.session.commit()
 
+    if shop_id is not None:
+        orderable_articles_cache.invalidate(shop_id)
+
 
 def find_article(article_id: ArticleID) -> Article | None:
     """Return the article with that ID, or `None` if not found."""
@@ -415,52 +466,57 @@ def _generate_search_clauses_for_term(search_term: str) -> Select:
     )
 
 
+@dataclass(frozen=True)
+class _OrderableArticle:
+    article: Article
+    attachments: list[ArticleAttachment]
+
+
 def get_article_compilation_for_orderable_articles(
     shop_id: ShopID,
 ) -> Result[ArticleCompilation, NoArticlesAvailableError]:
     """Return a compilation of the articles which can be ordered from
     that shop, less the ones that are only orderable in a dedicated
     order.
+
+    The articles are cached. Their availability periods are checked,
+    and their quantities fetched, on every call, though.
     """
     now = datetime.utcnow()
 
-    db_orderable_articles = db.session.scalars(
-        select(DbArticle)
-        .filter_by(shop_id=shop_id)
-        .filter_by(not_directly_orderable=False)
-        .filter_by(separate_order_required=False)
-        # Select only articles that are available in between the
-        # temporal boundaries for this article, if specified.
-        .filter(
-            db.or_(
-                DbArticle.available_from.is_(None),
-                now >= DbArticle.available_from,
-            )
-        )
-        .filter(
-            db.or_(
-                DbArticle.available_until.is_(None),
-                now < DbArticle.available_until,
-            )
+    orderable_articles = [
+        orderable_article
+        for orderable_article in orderable_articles_cache.get_or_load(
+            shop_id, lambda: _get_directly_orderable_articles(shop_id)
         )
-        .order_by(DbArticle.description)
-    ).all()
+        if _is_article_available_at(orderable_article.article, now)
+    ]
 
-    if not db_orderable_articles:
+    if not orderable_articles:
         return Err(NoArticlesAvailableError())
 
-    compilation_builder = ArticleCompilationBuilder()
+    article_ids = set()
+    for orderable_article in orderable_articles:
+        article_ids.add(orderable_article.article.id)
+        for attachment in orderable_article.attachments:
+            article_ids.add(attachment.attached_article.id)
 
-    for db_article in db_orderable_articles:
-        article = _db_entity_to_article(db_article)
-        compilation_builder.append_article(article)
+    quantities_by_article_id = _get_quantities(article_ids)
+
+    def with_current_quantity(article: Article) -> Article:
+        quantity = quantities_by_article_id.get(article.id, article.quantity)
+        return dataclasses.replace(article, quantity=quantity)
+
+    compilation_builder = ArticleCompilationBuilder()
 
-        article_attachments = _get_article_attachments(
-            db_article.attached_articles
+    for orderable_article in orderable_articles:
+        compilation_builder.append_article(
+            with_current_quantity(orderable_article.article)
         )
-        for article_attachment in article_attachments:
+
+        for article_attachment in orderable_article.attachments:
             compilation_builder.append_article(
-                article_attachment.attached_article,
+                with_current_quantity(article_attachment.attached_article),
                 fixed_quantity=article_attachment.attached_quantity,
             )
 
@@ -469,6 +525,52 @@ def get_article_compilation_for_orderable_articles(
     return Ok(compilation)
 
 
+def _get_directly_orderable_articles(
+    shop_id: ShopID,
+) -> list[_OrderableArticle]:
+    """Return the articles of that shop which can be ordered, less the
+    ones that are only orderable in a dedicated order, regardless of
+    their availability periods.
+    """
+    db_articles = db.session.scalars(
+        select(DbArticle)
+        .filter_by(shop_id=shop_id)
+        .filter_by(not_directly_orderable=False)
+        .filter_by(separate_order_required=False)
+        .options(
+            db.selectinload(DbArticle.attached_articles).joinedload(
+                DbAttachedArticle.article
+            )
+        )
+        .order_by(DbArticle.description)
+    ).all()
+
+    return [
+        _OrderableArticle(
+            article=_db_entity_to_article(db_article),
+            attachments=_get_article_attachments(db_article.attached_articles),
+        )
+        for db_article in db_articles
+    ]
+
+
+def _is_article_available_at(article: Article, now: datetime) -> bool:
+    start = article.available_from
+    end = article.available_until
+
+    return (start is None or start <= now) and (end is None or now < end)
+
+
+def _get_quantities(article_ids: set[ArticleID]) -> dict[ArticleID, int]:
+    rows = db.session.execute(
+        select(DbArticle.id, DbArticle.quantity).filter(
+            DbArticle.id.in_(article_ids)
+        )
+    ).all()
+
+    return {article_id: quantity for article_id, quantity in rows}
+
+
 def get_article_compilation_for_single_article(
     article_id: ArticleID,
 ) -> ArticleCompilation:
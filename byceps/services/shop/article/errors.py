@@ -6,6 +6,12 @@ byceps.services.shop.article.errors
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .models import ArticleID
+
 
 class NoArticlesAvailableError:
     pass
@@ -13,3 +19,12 @@ class NoArticlesAvailableError:
 
 class SomeArticlesLackFixedQuantityError:
     pass
+
+
+@dataclass(frozen=True)
+class ArticlesSoldOutError:
+    """Indicate that not enough units of those articles are available
+    (anymore) to fulfill a request.
+    """
+
+    article_ids: frozenset[ArticleID]
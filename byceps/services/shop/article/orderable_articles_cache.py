@@ -0,0 +1,54 @@
+"""
+byceps.services.shop.article.orderable_articles_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cache the articles that can be ordered from a shop (including the
+articles attached to them), per shop.
+
+Whenever one of a shop's articles is changed, the shop's entries are
+invalidated in all processes.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+from byceps.services.shop.shop.models import ShopID
+from byceps.util.cache import GenerationalCache
+
+
+T = TypeVar('T')
+
+
+_cache = GenerationalCache(
+    'orderable articles',
+    'byceps:shop:orderable_articles:generation',
+    maxsize=64,
+    ttl_config_key='SHOP_ARTICLE_CACHE_TTL',
+    enabled_config_key='SHOP_ARTICLE_CACHE_ENABLED',
+)
+
+
+def get_or_load(shop_id: ShopID, load: Callable[[], T]) -> T:
+    """Return the cached value for the shop, or load, cache, and return
+    it.
+    """
+    return _cache.get_or_load(shop_id, [_get_namespace(shop_id)], load)
+
+
+def invalidate(shop_id: ShopID) -> None:
+    """Make all processes reload the shop's orderable articles."""
+    _cache.invalidate(_get_namespace(shop_id))
+
+
+def clear() -> None:
+    """Remove all entries cached by this process."""
+    _cache.clear()
+
+
+def _get_namespace(shop_id: ShopID) -> str:
+    return f'shop:{shop_id}'
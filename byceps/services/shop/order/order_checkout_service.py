@@ -8,6 +8,7 @@ byceps.services.shop.order.order_checkout_service
 
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Iterator
 from datetime import datetime
 
@@ -18,6 +19,8 @@ import structlog
 from byceps.database import db
 from byceps.events.shop import ShopOrderPlacedEvent
 from byceps.services.shop.article import article_service
+from byceps.services.shop.article.errors import ArticlesSoldOutError
+from byceps.services.shop.article.models import ArticleID
 from byceps.services.shop.cart.models import Cart, CartItem
 from byceps.services.shop.shop import shop_service
 from byceps.services.shop.shop.models import ShopID
@@ -48,8 +51,12 @@ def place_order(
     cart: Cart,
     *,
     created_at: datetime | None = None,
-) -> Result[tuple[Order, ShopOrderPlacedEvent], None]:
-    """Place an order for one or more articles."""
+) -> Result[tuple[Order, ShopOrderPlacedEvent], ArticlesSoldOutError | None]:
+    """Place an order for one or more articles.
+
+    Fail with an `ArticlesSoldOutError` if not enough units of any of
+    the articles are available.
+    """
     shop = shop_service.get_shop(storefront.shop_id)
 
     order_number_sequence = order_sequence_service.get_order_number_sequence(
@@ -81,7 +88,16 @@ def place_order(
     db.session.add(db_order)
     db.session.add_all(db_line_items)
 
-    _reduce_article_stock(incoming_order)
+    stock_reduction_result = _reduce_article_stock(incoming_order)
+    if stock_reduction_result.is_err():
+        db.session.rollback()
+        sold_out_error = stock_reduction_result.unwrap_err()
+        log.info(
+            'Order placement failed; articles sold out',
+            order_number=order_number,
+            article_ids=[str(id) for id in sold_out_error.article_ids],
+        )
+        return Err(sold_out_error)
 
     try:
         db.session.commit()
@@ -208,9 +224,12 @@ def _build_db_line_items(
         )
 
 
-def _reduce_article_stock(incoming_order: IncomingOrder) -> None:
+def _reduce_article_stock(
+    incoming_order: IncomingOrder,
+) -> Result[None, ArticlesSoldOutError]:
     """Reduce article stock according to what is in the cart."""
+    quantities_by_article_id: Counter[ArticleID] = Counter()
     for line_item in incoming_order.line_items:
-        article_service.decrease_quantity(
-            line_item.article_id, line_item.quantity, commit=False
-        )
+        quantities_by_article_id[line_item.article_id] += line_item.quantity
+
+    return article_service.reserve_quantities(quantities_by_article_id)
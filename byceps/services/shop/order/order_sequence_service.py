@@ -8,7 +8,11 @@ byceps.services.shop.order.order_sequence_service
 
 from __future__ import annotations
 
-from sqlalchemy import delete, select
+from dataclasses import dataclass
+from threading import Lock
+
+from flask import current_app
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
 
 from byceps.database import db
@@ -47,6 +51,9 @@ def delete_order_number_sequence(sequence_id: OrderNumberSequenceID) -> None:
     db.session.execute(delete(DbOrderNumberSequence).filter_by(id=sequence_id))
     db.session.commit()
 
+    with _blocks_lock:
+        _blocks.pop(sequence_id, None)
+
 
 def get_order_number_sequence(
     sequence_id: OrderNumberSequenceID,
@@ -76,27 +83,100 @@ def get_order_number_sequences_for_shop(
     ]
 
 
+@dataclass
+class _NumberBlock:
+    """A range of sequence values reserved by this process."""
+
+    prefix: str
+    next_value: int
+    last_value: int
+
+    def is_exhausted(self) -> bool:
+        return self.next_value > self.last_value
+
+
+_blocks: dict[OrderNumberSequenceID, _NumberBlock] = {}
+_blocks_lock = Lock()
+
+
 def generate_order_number(
     sequence_id: OrderNumberSequenceID,
 ) -> Result[OrderNumber, str]:
     """Generate and reserve an unused, unique order number from this
     sequence.
+
+    If a block size greater than 1 is configured, a block of numbers is
+    reserved at once and numbers are handed out from it without
+    accessing the database. Numbers of a block that are not used before
+    the process ends are skipped, so the block size is the number of
+    gaps tolerated per process.
     """
-    db_sequence = db.session.execute(
-        select(DbOrderNumberSequence)
-        .filter_by(id=sequence_id)
-        .with_for_update()
-    ).scalar_one_or_none()
+    block_size = current_app.config.get('SHOP_ORDER_NUMBER_BLOCK_SIZE', 1)
 
-    if db_sequence is None:
-        return Err(f'No order number sequence found for ID "{sequence_id}".')
+    if block_size <= 1:
+        reservation = _reserve_values(sequence_id, 1)
+        if reservation is None:
+            return _build_unknown_sequence_error(sequence_id)
+
+        prefix, value = reservation
+        return Ok(_build_order_number(prefix, value))
+
+    with _blocks_lock:
+        block = _blocks.get(sequence_id)
 
-    db_sequence.value = DbOrderNumberSequence.value + 1
+        if (block is None) or block.is_exhausted():
+            reservation = _reserve_values(sequence_id, block_size)
+            if reservation is None:
+                return _build_unknown_sequence_error(sequence_id)
+
+            prefix, last_value = reservation
+            block = _NumberBlock(
+                prefix=prefix,
+                next_value=last_value - block_size + 1,
+                last_value=last_value,
+            )
+            _blocks[sequence_id] = block
+
+        value = block.next_value
+        block.next_value += 1
+
+    return Ok(_build_order_number(block.prefix, value))
+
+
+def _reserve_values(
+    sequence_id: OrderNumberSequenceID, count: int
+) -> tuple[str, int] | None:
+    """Advance the sequence by that many values.
+
+    Return the sequence's prefix and its new (i.e. the highest
+    reserved) value, or `None` if the sequence does not exist.
+
+    A single statement is used to hold the row lock only as long as
+    necessary.
+    """
+    row = db.session.execute(
+        update(DbOrderNumberSequence)
+        .filter_by(id=sequence_id)
+        .values(value=DbOrderNumberSequence.value + count)
+        .returning(DbOrderNumberSequence.prefix, DbOrderNumberSequence.value)
+    ).one_or_none()
     db.session.commit()
 
-    order_number = OrderNumber(f'{db_sequence.prefix}{db_sequence.value:05d}')
+    if row is None:
+        return None
+
+    prefix, value = row
+    return prefix, value
+
 
-    return Ok(order_number)
+def _build_order_number(prefix: str, value: int) -> OrderNumber:
+    return OrderNumber(f'{prefix}{value:05d}')
+
+
+def _build_unknown_sequence_error(
+    sequence_id: OrderNumberSequenceID,
+) -> Err[str]:
+    return Err(f'No order number sequence found for ID "{sequence_id}".')
 
 
 def _db_entity_to_order_number_sequence(
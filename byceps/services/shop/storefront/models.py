@@ -26,3 +26,9 @@ class Storefront:
     catalog_id: CatalogID | None
     order_number_sequence_id: OrderNumberSequenceID
     closed: bool
+
+
+@dataclass(frozen=True)
+class StorefrontAdmission:
+    admitted: bool
+    queue_position: int | None
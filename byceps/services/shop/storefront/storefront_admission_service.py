@@ -0,0 +1,200 @@
+"""
+byceps.services.shop.storefront.storefront_admission_service
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Admit only a limited number of buyers to a storefront at a time.
+
+When ticket sales open, lots of users try to order at the same moment.
+Instead of letting all of them through to the database at once, each
+user draws a number and waits in line until one of a limited number of
+slots becomes available. A slot is held until an order has been placed
+or for a limited time, whichever comes first.
+
+Waiting users have to keep checking their position. Those that stop
+doing so are assumed to have left and are skipped.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+
+from flask import current_app
+from redis.exceptions import RedisError
+import structlog
+
+from byceps.services.user.models.user import UserID
+
+from .models import StorefrontAdmission, StorefrontID
+
+
+log = structlog.get_logger()
+
+
+_KEY_PREFIX = 'byceps:shop:admission'
+
+# Waiting users are expected to check their position at this interval.
+WAITING_ROOM_REFRESH_INTERVAL = 15  # seconds
+
+# Waiting users that have not checked their position for this long are
+# skipped when the next users are admitted.
+_WAITING_TIMEOUT = WAITING_ROOM_REFRESH_INTERVAL * 4
+
+# Should a process crash while admitting users, allow another one to
+# take over.
+_ADMISSION_LOCK_TTL = 5  # seconds
+
+_ADMITTED = StorefrontAdmission(admitted=True, queue_position=None)
+
+
+@dataclass(frozen=True)
+class _Keys:
+    ticket_counter: str
+    waiting: str
+    last_seen: str
+    admitted: str
+    admission_lock: str
+
+
+def is_enabled() -> bool:
+    """Return `True` if the number of concurrent buyers is limited."""
+    return _get_max_admitted_users() is not None
+
+
+def get_admission(
+    storefront_id: StorefrontID, user_id: UserID, *, now: float | None = None
+) -> StorefrontAdmission:
+    """Return whether the user is admitted to order from the storefront
+    or, if not, their position in line.
+
+    Users not yet in line are put at its end.
+    """
+    max_admitted_users = _get_max_admitted_users()
+    if max_admitted_users is None:
+        return _ADMITTED
+
+    if now is None:
+        now = time.time()
+
+    try:
+        return _get_admission(
+            _get_keys(storefront_id), str(user_id), now, max_admitted_users
+        )
+    except RedisError as e:
+        # Rather let everybody in than nobody.
+        log.warning('Storefront admission queue unavailable', error=str(e))
+        return _ADMITTED
+
+
+def _get_admission(
+    keys: _Keys, member: str, now: float, max_admitted_users: int
+) -> StorefrontAdmission:
+    redis_client = current_app.redis_client
+
+    # Free slots of users whose admission has expired.
+    redis_client.zremrangebyscore(keys.admitted, '-inf', now)
+
+    if redis_client.zscore(keys.admitted, member) is not None:
+        return _ADMITTED
+
+    _line_up(keys, member, now)
+
+    _admit_waiting_users(keys, now, max_admitted_users)
+
+    rank = redis_client.zrank(keys.waiting, member)
+    if rank is not None:
+        return StorefrontAdmission(admitted=False, queue_position=rank + 1)
+
+    if redis_client.zscore(keys.admitted, member) is not None:
+        return _ADMITTED
+
+    # Skipped by another process in the meantime. Line up again on the
+    # next check.
+    queue_length = redis_client.zcard(keys.waiting)
+    return StorefrontAdmission(admitted=False, queue_position=queue_length + 1)
+
+
+def _line_up(keys: _Keys, member: str, now: float) -> None:
+    """Put the user at the end of the line, unless already waiting."""
+    redis_client = current_app.redis_client
+
+    if redis_client.zscore(keys.waiting, member) is None:
+        ticket_number = redis_client.incr(keys.ticket_counter)
+        redis_client.zadd(keys.waiting, {member: ticket_number}, nx=True)
+
+    redis_client.zadd(keys.last_seen, {member: now})
+
+
+def _admit_waiting_users(
+    keys: _Keys, now: float, max_admitted_users: int
+) -> None:
+    """Admit as many waiting users as there are free slots, in order."""
+    redis_client = current_app.redis_client
+
+    # Only one process at a time must hand out slots.
+    if not redis_client.set(
+        keys.admission_lock, 1, nx=True, ex=_ADMISSION_LOCK_TTL
+    ):
+        return
+
+    try:
+        admitted_until = now + _get_admission_ttl()
+        free_slots = max_admitted_users - redis_client.zcard(keys.admitted)
+
+        while free_slots > 0:
+            popped = redis_client.zpopmin(keys.waiting, free_slots)
+            if not popped:
+                break
+
+            for member, _ in popped:
+                last_seen = redis_client.zscore(keys.last_seen, member)
+                redis_client.zrem(keys.last_seen, member)
+
+                if (last_seen is None) or (last_seen < now - _WAITING_TIMEOUT):
+                    continue
+
+                redis_client.zadd(keys.admitted, {member: admitted_until})
+                free_slots -= 1
+    finally:
+        redis_client.delete(keys.admission_lock)
+
+
+def release_admission(storefront_id: StorefrontID, user_id: UserID) -> None:
+    """Free the user's slot, e.g. after an order has been placed."""
+    if not is_enabled():
+        return
+
+    keys = _get_keys(storefront_id)
+
+    try:
+        current_app.redis_client.zrem(keys.admitted, str(user_id))
+    except RedisError as e:
+        # The slot is going to be freed once the admission expires.
+        log.warning(
+            'Could not release storefront admission',
+            storefront_id=storefront_id,
+            error=str(e),
+        )
+
+
+def _get_keys(storefront_id: StorefrontID) -> _Keys:
+    prefix = f'{_KEY_PREFIX}:{storefront_id}'
+
+    return _Keys(
+        ticket_counter=f'{prefix}:ticket_counter',
+        waiting=f'{prefix}:waiting',
+        last_seen=f'{prefix}:last_seen',
+        admitted=f'{prefix}:admitted',
+        admission_lock=f'{prefix}:admission_lock',
+    )
+
+
+def _get_max_admitted_users() -> int | None:
+    return current_app.config['SHOP_ORDER_ADMISSION_LIMIT']
+
+
+def _get_admission_ttl() -> int:
+    return current_app.config['SHOP_ORDER_ADMISSION_TTL']
@@ -0,0 +1,28 @@
+"""
+byceps.services.ticketing.dbmodels.code_sequence
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
+
+
+class DbTicketCodeSequence(db.Model):
+    """The number of ticket codes of a given length generated for a
+    party, which also is the index of the next one to derive.
+    """
+
+    __tablename__ = 'ticket_code_sequences'
+
+    party_id: Mapped[PartyID] = mapped_column(
+        db.UnicodeText, db.ForeignKey('parties.id'), primary_key=True
+    )
+    code_length: Mapped[int] = mapped_column(primary_key=True)
+    next_index: Mapped[int]
@@ -38,3 +38,14 @@ TicketBundleID = NewType('TicketBundleID', UUID)
 class TicketSaleStats:
     tickets_max: int | None
     tickets_sold: int
+
+
+@dataclass(frozen=True)
+class TicketCodeSpaceOccupancy:
+    code_length: int
+    capacity: int
+    used: int
+
+    @property
+    def fill_ratio(self) -> float:
+        return self.used / self.capacity
@@ -11,6 +11,7 @@ from __future__ import annotations
 from collections.abc import Sequence
 
 from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
 from byceps.database import db, paginate, Pagination
@@ -23,7 +24,11 @@ from .dbmodels.category import DbTicketCategory
 from .dbmodels.ticket import DbTicket
 from .dbmodels.ticket_bundle import DbTicketBundle
 from .models.ticket import TicketBundleID, TicketCategoryID
-from .ticket_creation_service import build_tickets, TicketCreationFailedError
+from .ticket_creation_service import (
+    insert_tickets,
+    TicketCreationFailedError,
+    TicketCreationFailedWithConflictError,
+)
 from .ticket_revocation_service import build_ticket_revoked_log_entry
 
 
@@ -51,20 +56,24 @@ def create_bundle(
     )
     db.session.add(db_bundle)
 
-    db_tickets = list(
-        build_tickets(
+    try:
+        # Obtain the bundle's ID.
+        db.session.flush()
+
+        insert_tickets(
             party_id,
             category_id,
             owner,
             ticket_quantity,
-            bundle=db_bundle,
+            bundle_id=db_bundle.id,
             order_number=order_number,
             user=user,
         )
-    )
-    db.session.add_all(db_tickets)
 
-    db.session.commit()
+        db.session.commit()
+    except IntegrityError as exc:
+        db.session.rollback()
+        raise TicketCreationFailedWithConflictError(exc) from exc
 
     return db_bundle
 
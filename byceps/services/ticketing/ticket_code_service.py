@@ -2,26 +2,322 @@
 byceps.services.ticketing.ticket_code_service
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+Ticket codes are either picked at random (five distinct letters) or
+derived from a per-party counter via a keyed permutation. The latter
+are unique by construction and cannot be guessed from one another.
+
+Once too many of the codes of a given length are taken for a party,
+longer ones (always derived via permutation) are generated instead.
+
+How many codes of each length have been generated for a party is kept
+in the party's code sequences, which also provide the indexes to derive
+codes from.
+
 :Copyright: 2014-2023 Jochen Kupperschmidt
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import hmac
+from math import perm
 from random import sample
 from string import ascii_uppercase, digits
+from typing import Literal
 
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from byceps.database import db
+from byceps.services.party.models import PartyID
 from byceps.util.result import Err, Ok, Result
 
-from .models.ticket import TicketCode
+from .dbmodels.code_sequence import DbTicketCodeSequence
+from .dbmodels.ticket import DbTicket
+from .models.ticket import TicketCode, TicketCodeSpaceOccupancy
+
+
+TicketCodeGenerator = Literal['random', 'permutation']
+
+
+_CODE_ALPHABET = 'BCDFGHJKLMNPQRSTVWXYZ'
+_CODE_LENGTH = 5
+_MAX_CODE_LENGTH = 8
+
+_FEISTEL_ROUNDS = 4
+
+
+@dataclass(frozen=True)
+class _CodeSpace:
+    code_length: int
+    generator: TicketCodeGenerator
+
+
+def generate_ticket_codes_for_party(
+    party_id: PartyID,
+    requested_quantity: int,
+    *,
+    excluded_codes: set[TicketCode] | None = None,
+) -> Result[set[TicketCode], str]:
+    """Generate a number of ticket codes for the party.
+
+    The codes are as long as necessary to keep the occupancy of their
+    code space below the configured maximum.
+
+    Derived codes never repeat, so excluded codes only need to be
+    avoided when picking codes at random.
+    """
+    code_space_result = _select_code_space(party_id, requested_quantity)
+    if code_space_result.is_err():
+        return Err(code_space_result.unwrap_err())
+
+    code_space, used = code_space_result.unwrap()
+
+    if code_space.generator == 'permutation':
+        start_index = _count_generated_codes(
+            party_id, code_space.code_length, used, requested_quantity
+        )
+        return Ok(
+            _derive_ticket_codes(
+                party_id,
+                code_space.code_length,
+                start_index,
+                requested_quantity,
+            )
+        )
+
+    generation_result = generate_ticket_codes(
+        requested_quantity, excluded_codes=excluded_codes
+    )
+
+    if generation_result.is_ok():
+        _count_generated_codes(
+            party_id, code_space.code_length, used, requested_quantity
+        )
+
+    return generation_result
+
+
+# -------------------------------------------------------------------- #
+# occupancy
+
+
+def get_code_space_occupancies(
+    party_id: PartyID,
+) -> list[TicketCodeSpaceOccupancy]:
+    """Return how many of the codes of each length in use for the party
+    are taken.
+    """
+    used_by_length = _get_used_code_counts_by_length(party_id)
+    code_lengths = sorted(used_by_length.keys() | {_CODE_LENGTH})
+
+    return [
+        TicketCodeSpaceOccupancy(
+            code_length=code_length,
+            capacity=_get_capacity(code_length, _get_generator(code_length)),
+            used=used_by_length.get(code_length, 0),
+        )
+        for code_length in code_lengths
+    ]
+
+
+def _select_code_space(
+    party_id: PartyID, requested_quantity: int
+) -> Result[tuple[_CodeSpace, int], str]:
+    """Select the shortest code length whose code space is not too full
+    (including the requested codes).
+
+    Return it along with the number of its codes already taken.
+    """
+    used_by_length = _get_used_code_counts_by_length(party_id)
+    max_fill_ratio = current_app.config['TICKET_CODE_MAX_FILL_RATIO']
+
+    for code_length in range(_CODE_LENGTH, _MAX_CODE_LENGTH + 1):
+        generator = _get_generator(code_length)
+        capacity = _get_capacity(code_length, generator)
+        used = used_by_length.get(code_length, 0)
+        if (used + requested_quantity) / capacity <= max_fill_ratio:
+            return Ok((_CodeSpace(code_length, generator), used))
+
+    return Err('Ticket code space is exhausted.')
+
+
+def _get_used_code_counts_by_length(party_id: PartyID) -> dict[int, int]:
+    """Return the number of codes generated for the party, per length.
+
+    Parties without code sequences (i.e. whose tickets all have been
+    created before codes were counted) have their tickets counted
+    instead.
+    """
+    rows = db.session.execute(
+        select(
+            DbTicketCodeSequence.code_length, DbTicketCodeSequence.next_index
+        ).filter_by(party_id=party_id)
+    ).all()
+
+    if not rows:
+        return _count_used_codes_by_length(party_id)
+
+    return {code_length: next_index for code_length, next_index in rows}
+
+
+def _count_used_codes_by_length(party_id: PartyID) -> dict[int, int]:
+    code_length = func.length(DbTicket.code)
+
+    rows = db.session.execute(
+        select(code_length, func.count(DbTicket.id))
+        .filter_by(party_id=party_id)
+        .group_by(code_length)
+    ).all()
+
+    return {code_length: count for code_length, count in rows}
+
+
+def _get_generator(code_length: int) -> TicketCodeGenerator:
+    if code_length > _CODE_LENGTH:
+        return 'permutation'
+
+    return current_app.config['TICKET_CODE_GENERATOR']
+
+
+def _get_capacity(code_length: int, generator: TicketCodeGenerator) -> int:
+    alphabet_length = len(_CODE_ALPHABET)
+
+    if generator == 'permutation':
+        return alphabet_length**code_length
+
+    # Random codes consist of distinct symbols.
+    return perm(alphabet_length, code_length)
+
+
+def _count_generated_codes(
+    party_id: PartyID, code_length: int, used: int, count: int
+) -> int:
+    """Add a number of generated codes to the party's sequence for that
+    code length, and return the index of the first of them.
+
+    The sequence is created, starting at the number of codes already
+    taken, if it does not exist yet.
+
+    Does not commit. The sequence stays locked for other transactions
+    until then.
+    """
+    table = DbTicketCodeSequence.__table__
+
+    insert_stmt = insert(table).values(
+        party_id=party_id, code_length=code_length, next_index=used + count
+    )
+    stmt = insert_stmt.on_conflict_do_update(
+        constraint=table.primary_key,
+        set_={'next_index': table.c.next_index + count},
+    ).returning(table.c.next_index)
+
+    next_index = db.session.execute(stmt).scalar_one()
+
+    return next_index - count
+
+
+# -------------------------------------------------------------------- #
+# derivation via keyed permutation
+
+
+def _derive_ticket_codes(
+    party_id: PartyID, code_length: int, start_index: int, quantity: int
+) -> set[TicketCode]:
+    """Derive codes from consecutive indexes of the party's sequence
+    for that code length.
+    """
+    key = _get_permutation_key(party_id, code_length)
+
+    return {
+        derive_ticket_code(index, code_length, key)
+        for index in range(start_index, start_index + quantity)
+    }
+
+
+def _get_permutation_key(party_id: PartyID, code_length: int) -> bytes:
+    secret_key = current_app.config['SECRET_KEY']
+
+    return hmac.digest(
+        secret_key.encode(),
+        f'ticket-codes:{party_id}:{code_length}'.encode(),
+        hashlib.sha256,
+    )
+
+
+def derive_ticket_code(index: int, code_length: int, key: bytes) -> TicketCode:
+    """Derive the ticket code with that index.
+
+    Different indexes (below the number of possible codes of that
+    length) result in different codes.
+    """
+    alphabet_length = len(_CODE_ALPHABET)
+    capacity = alphabet_length**code_length
+
+    if not (0 <= index < capacity):
+        raise ValueError(f'Index must be in range [0, {capacity}).')
+
+    value = _permute(index, capacity, key)
+
+    symbols = []
+    for _ in range(code_length):
+        value, symbol_index = divmod(value, alphabet_length)
+        symbols.append(_CODE_ALPHABET[symbol_index])
+
+    return TicketCode(''.join(reversed(symbols)))
+
+
+def _permute(value: int, domain_size: int, key: bytes) -> int:
+    """Map the value to another one in the range [0, domain_size).
+
+    A Feistel network permutes the values of the smallest even-bit-sized
+    range that covers the domain. Results outside of the domain are
+    permuted again (cycle walking) until they lie within.
+    """
+    half_bits = ((domain_size - 1).bit_length() + 1) // 2
+
+    while True:
+        value = _feistel(value, half_bits, key)
+        if value < domain_size:
+            return value
+
+
+def _feistel(value: int, half_bits: int, key: bytes) -> int:
+    mask = (1 << half_bits) - 1
+    left, right = value >> half_bits, value & mask
+
+    for round_number in range(_FEISTEL_ROUNDS):
+        digest = hmac.digest(
+            key, f'{round_number}:{right}'.encode(), hashlib.sha256
+        )
+        round_value = int.from_bytes(digest[:8], 'big') & mask
+        left, right = right, left ^ round_value
+
+    return (left << half_bits) | right
+
+
+# -------------------------------------------------------------------- #
+# random generation
 
 
 def generate_ticket_codes(
     requested_quantity: int,
+    *,
+    excluded_codes: set[TicketCode] | None = None,
 ) -> Result[set[TicketCode], str]:
-    """Generate a number of ticket codes."""
+    """Generate a number of random ticket codes, none of which is among
+    the excluded ones.
+    """
+    if excluded_codes is None:
+        excluded_codes = set()
+
     codes: set[TicketCode] = set()
 
     for _ in range(requested_quantity):
-        generation_result = _generate_ticket_code_not_in(codes)
+        generation_result = _generate_ticket_code_not_in(codes, excluded_codes)
 
         if generation_result.is_err():
             return Err(generation_result.unwrap_err())
@@ -41,12 +337,15 @@ def generate_ticket_codes(
 
 
 def _generate_ticket_code_not_in(
-    codes: set[TicketCode], *, max_attempts: int = 4
+    codes: set[TicketCode],
+    excluded_codes: set[TicketCode],
+    *,
+    max_attempts: int = 4,
 ) -> Result[TicketCode, str]:
-    """Generate ticket codes and return the first one not in the set."""
+    """Generate ticket codes and return the first one in neither set."""
     for _ in range(max_attempts):
         code = _generate_ticket_code()
-        if code not in codes:
+        if (code not in codes) and (code not in excluded_codes):
             return Ok(code)
 
     return Err(
@@ -54,10 +353,6 @@ def _generate_ticket_code_not_in(
     )
 
 
-_CODE_ALPHABET = 'BCDFGHJKLMNPQRSTVWXYZ'
-_CODE_LENGTH = 5
-
-
 def _generate_ticket_code() -> TicketCode:
     """Generate a ticket code.
 
@@ -66,11 +361,16 @@ def _generate_ticket_code() -> TicketCode:
     return TicketCode(''.join(sample(_CODE_ALPHABET, _CODE_LENGTH)))
 
 
+# -------------------------------------------------------------------- #
+# validation
+
+
 _ALLOWED_CODE_SYMBOLS = frozenset(_CODE_ALPHABET + ascii_uppercase + digits)
 
 
 def is_ticket_code_wellformed(code: str) -> bool:
     """Determine if the ticket code is well-formed."""
-    return len(code) == _CODE_LENGTH and set(code).issubset(
-        _ALLOWED_CODE_SYMBOLS
-    )
+    if not (_CODE_LENGTH <= len(code) <= _MAX_CODE_LENGTH):
+        return False
+
+    return set(code).issubset(_ALLOWED_CODE_SYMBOLS)
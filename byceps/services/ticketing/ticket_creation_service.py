@@ -8,8 +8,7 @@ byceps.services.ticketing.ticket_creation_service
 
 from __future__ import annotations
 
-from collections.abc import Iterator
-
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
@@ -20,8 +19,12 @@ from byceps.services.user.models.user import User
 
 from . import ticket_code_service
 from .dbmodels.ticket import DbTicket
-from .dbmodels.ticket_bundle import DbTicketBundle
-from .models.ticket import TicketCategoryID
+from .models.ticket import TicketBundleID, TicketCategoryID, TicketCode
+
+
+# Rounds of checking generated codes against those already in use and
+# replacing the ones found to be in use.
+_MAX_CODE_REPLACEMENT_ROUNDS = 4
 
 
 class TicketCreationFailedError(Exception):
@@ -72,8 +75,8 @@ def create_tickets(
     user: User | None = None,
 ) -> list[DbTicket]:
     """Create a number of tickets of the same category for a single owner."""
-    db_tickets = list(
-        build_tickets(
+    try:
+        db_tickets = insert_tickets(
             party_id,
             category_id,
             owner,
@@ -81,11 +84,6 @@ def create_tickets(
             order_number=order_number,
             user=user,
         )
-    )
-
-    db.session.add_all(db_tickets)
-
-    try:
         db.session.commit()
     except IntegrityError as exc:
         db.session.rollback()
@@ -94,33 +92,103 @@ def create_tickets(
     return db_tickets
 
 
-def build_tickets(
+def insert_tickets(
     party_id: PartyID,
     category_id: TicketCategoryID,
     owner: User,
     quantity: int,
     *,
-    bundle: DbTicketBundle | None = None,
+    bundle_id: TicketBundleID | None = None,
     order_number: OrderNumber | None = None,
     user: User | None = None,
-) -> Iterator[DbTicket]:
+) -> list[DbTicket]:
+    """Insert a number of tickets of the same category for a single
+    owner, with a single statement.
+
+    Does not commit.
+    """
     if quantity < 1:
         raise ValueError('Ticket quantity must be positive.')
 
-    generation_result = ticket_code_service.generate_ticket_codes(quantity)
+    codes = _generate_unused_ticket_codes(party_id, quantity)
+
+    used_by_id = user.id if user else None
+
+    rows = [
+        {
+            'party_id': party_id,
+            'code': code,
+            'bundle_id': bundle_id,
+            'category_id': category_id,
+            'owned_by_id': owner.id,
+            'order_number': order_number,
+            'used_by_id': used_by_id,
+        }
+        for code in codes
+    ]
+
+    return list(db.session.scalars(insert(DbTicket).returning(DbTicket), rows))
+
+
+def _generate_unused_ticket_codes(
+    party_id: PartyID, quantity: int
+) -> set[TicketCode]:
+    """Generate ticket codes that are not yet in use for the party.
+
+    Only codes that turn out to be in use are replaced.
+    """
+    codes = _generate_ticket_codes(party_id, quantity)
+    used_codes: set[TicketCode] = set()
+    replacement_rounds = 0
+
+    while newly_used_codes := _find_used_ticket_codes(party_id, codes):
+        if replacement_rounds == _MAX_CODE_REPLACEMENT_ROUNDS:
+            raise TicketCreationFailedWithConflictError(
+                'Could not generate ticket codes not yet in use after '
+                f'{replacement_rounds} attempts.'
+            )
+
+        codes -= newly_used_codes
+        used_codes |= newly_used_codes
+
+        try:
+            codes |= _generate_ticket_codes(
+                party_id,
+                len(newly_used_codes),
+                excluded_codes=codes | used_codes,
+            )
+        except TicketCreationFailedError as exc:
+            raise TicketCreationFailedWithConflictError(*exc.args) from exc
+
+        replacement_rounds += 1
+
+    return codes
+
+
+def _generate_ticket_codes(
+    party_id: PartyID,
+    quantity: int,
+    *,
+    excluded_codes: set[TicketCode] | None = None,
+) -> set[TicketCode]:
+    generation_result = ticket_code_service.generate_ticket_codes_for_party(
+        party_id, quantity, excluded_codes=excluded_codes
+    )
 
     if generation_result.is_err():
         raise TicketCreationFailedError(generation_result.unwrap_err())
 
-    codes = generation_result.unwrap()
+    return generation_result.unwrap()
 
-    for code in codes:
-        yield DbTicket(
-            party_id,
-            code,
-            category_id,
-            owner.id,
-            bundle=bundle,
-            order_number=order_number,
-            used_by_id=user.id if user else None,
-        )
+
+def _find_used_ticket_codes(
+    party_id: PartyID, codes: set[TicketCode]
+) -> set[TicketCode]:
+    """Return those of the codes that are already in use for the party."""
+    return set(
+        db.session.scalars(
+            select(DbTicket.code)
+            .filter_by(party_id=party_id)
+            .filter(DbTicket.code.in_(codes))
+        ).all()
+    )
@@ -7,7 +7,11 @@ byceps.services.ticketing.ticket_seat_management_service
 """
 
 from byceps.database import db
-from byceps.services.seating import seat_group_service, seat_service
+from byceps.services.seating import (
+    seat_group_service,
+    seat_plan_service,
+    seat_service,
+)
 
 # Load `Seat.assignment` backref.
 from byceps.services.seating.dbmodels.seat_group import DbSeatGroup  # noqa: F401
@@ -129,6 +133,11 @@ def occupy_seat(
 
     db.session.commit()
 
+    changed_seat_ids = {seat.id}
+    if previous_seat_id is not None:
+        changed_seat_ids.add(previous_seat_id)
+    seat_plan_service.handle_occupancy_changes(changed_seat_ids)
+
     return Ok(None)
 
 
@@ -172,6 +181,8 @@ def release_seat(
 
     db.session.commit()
 
+    seat_plan_service.handle_occupancy_changes([seat.id])
+
     return Ok(None)
 
 
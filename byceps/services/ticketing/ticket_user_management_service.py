@@ -7,6 +7,7 @@ byceps.services.ticketing.ticket_user_management_service
 """
 
 from byceps.database import db
+from byceps.services.seating import seat_plan_service
 from byceps.services.user import user_service
 from byceps.services.user.models.user import UserID
 from byceps.util.result import Err, Ok, Result
@@ -120,6 +121,9 @@ def appoint_user(
 
     db.session.commit()
 
+    if db_ticket.occupied_seat_id is not None:
+        seat_plan_service.handle_occupancy_changes([db_ticket.occupied_seat_id])
+
     return Ok(None)
 
 
@@ -154,4 +158,7 @@ def withdraw_user(
 
     db.session.commit()
 
+    if db_ticket.occupied_seat_id is not None:
+        seat_plan_service.handle_occupancy_changes([db_ticket.occupied_seat_id])
+
     return Ok(None)
@@ -12,5 +12,7 @@ from blinker import Namespace
 authn_signals = Namespace()
 
 
+all_session_tokens_deleted = authn_signals.signal('all-session-tokens-deleted')
 password_updated = authn_signals.signal('password-updated')
+session_tokens_deleted = authn_signals.signal('session-tokens-deleted')
 user_logged_in = authn_signals.signal('user-logged-in')
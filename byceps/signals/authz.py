@@ -14,3 +14,10 @@ authz_signals = Namespace()
 
 role_assigned_to_user = authz_signals.signal('role-assigned-to-user')
 role_deassigned_from_user = authz_signals.signal('role-deassigned-from-user')
+permission_assigned_to_role = authz_signals.signal(
+    'permission-assigned-to-role'
+)
+permission_deassigned_from_role = authz_signals.signal(
+    'permission-deassigned-from-role'
+)
+role_deleted = authz_signals.signal('role-deleted')
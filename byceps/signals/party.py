@@ -0,0 +1,15 @@
+"""
+byceps.signals.party
+~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from blinker import Namespace
+
+
+party_signals = Namespace()
+
+
+party_updated = party_signals.signal('party-updated')
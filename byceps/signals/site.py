@@ -0,0 +1,15 @@
+"""
+byceps.signals.site
+~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from blinker import Namespace
+
+
+site_signals = Namespace()
+
+
+site_updated = site_signals.signal('site-updated')
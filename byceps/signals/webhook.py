@@ -0,0 +1,17 @@
+"""
+byceps.signals.webhook
+~~~~~~~~~~~~~~~~~~~~~~
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from blinker import Namespace
+
+
+webhook_signals = Namespace()
+
+
+webhook_created = webhook_signals.signal('webhook-created')
+webhook_updated = webhook_signals.signal('webhook-updated')
+webhook_deleted = webhook_signals.signal('webhook-deleted')
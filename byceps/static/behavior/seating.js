@@ -244,9 +244,14 @@ function mark_seats_as_occupiable() {
 
 
 function init_occupiable_seats() {
-  document.querySelectorAll('.seat--occupiable')
+  document.querySelectorAll('.seat')
     .forEach(seat => {
       seat.addEventListener('click', () => {
+        // Seats can become (un)occupiable while the page is shown.
+        if (!seat.classList.contains('seat--occupiable')) {
+          return false;
+        }
+
         const seat_label = seat.parentNode.dataset.label;
         const confirmation_label = seat_label + ' mit Ticket ' + get_selected_ticket_code() + ' reservieren?';
         if (confirm(confirmation_label)) {
@@ -264,6 +269,84 @@ function init_occupiable_seats() {
 }
 
 
+/**
+ * Apply changes of seat occupancy pushed by the server.
+ *
+ * The whole seat plan is fetched again if changes might have been
+ * missed (e.g. while reconnecting).
+ */
+function init_seat_occupancy_updates(updates_url, seat_plan_url, avatar_url_fallback) {
+  const event_source = new EventSource(updates_url);
+
+  event_source.addEventListener('occupancy', event => {
+    JSON.parse(event.data)
+      .forEach(occupancy => update_seat_occupancy(occupancy, avatar_url_fallback));
+  });
+
+  event_source.addEventListener('resync', () => {
+    fetch(seat_plan_url)
+      .then(response => response.json())
+      .then(seat_plan => {
+        const occupancies = new Map(
+          seat_plan.occupied_seats.map(occupancy => [occupancy.seat_id, occupancy])
+        );
+
+        document.querySelectorAll('.seat-with-tooltip')
+          .forEach(seat_container => {
+            const seat_id = seat_container.dataset.seatId;
+            const occupancy = occupancies.get(seat_id) ?? {seat_id: seat_id, ticket_id: null};
+            update_seat_occupancy(occupancy, avatar_url_fallback);
+          });
+      });
+  });
+}
+
+
+function update_seat_occupancy(occupancy, avatar_url_fallback) {
+  const seat_container = document.getElementById('seat-' + occupancy.seat_id);
+  if (seat_container === null) {
+    return;
+  }
+
+  const dataset = seat_container.dataset;
+  const seat = seat_container.querySelector('.seat');
+  const seat_management_active = is_seat_management_active();
+
+  delete dataset.ticketId;
+  delete dataset.occupierAvatar;
+  delete dataset.occupierName;
+  seat.classList.remove('seat--occupied', 'seat--managed', 'seat--managed-current');
+
+  if (occupancy.ticket_id === null) {
+    if (seat_management_active) {
+      seat.classList.add('seat--occupiable');
+    }
+    return;
+  }
+
+  dataset.ticketId = occupancy.ticket_id;
+  if (occupancy.occupier_screen_name !== null) {
+    dataset.occupierAvatar = occupancy.occupier_avatar_url ?? avatar_url_fallback;
+    dataset.occupierName = occupancy.occupier_screen_name;
+  }
+
+  seat.classList.remove('seat--occupiable');
+  seat.classList.add('seat--occupied');
+
+  if (seat_management_active && get_managed_ticket_ids().has(occupancy.ticket_id)) {
+    seat.classList.add('seat--managed');
+    if (occupancy.ticket_id === get_selected_ticket_id()) {
+      seat.classList.add('seat--managed-current');
+    }
+  }
+}
+
+
+function is_seat_management_active() {
+  return document.querySelector('#ticket-selection .ticket') !== null;
+}
+
+
 function reload_with_selected_ticket(ticket_id) {
   location.href = location.href.split('?')[0] + '?ticket_id=' + ticket_id;
 }
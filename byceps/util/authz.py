@@ -2,10 +2,16 @@
 byceps.util.authz
 ~~~~~~~~~~~~~~~~~
 
+Registered permissions are indexed, so that a set of permissions can be
+represented as an integer bitmask and checked with bit operations.
+
 :Copyright: 2014-2023 Jochen Kupperschmidt
 :License: Revised BSD (see `LICENSE` file for details)
 """
 
+from __future__ import annotations
+
+from collections.abc import Iterable
 from importlib import import_module
 import pkgutil
 
@@ -26,6 +32,8 @@ def load_permissions() -> None:
     for mod_name in mod_names:
         import_module(f'{pkg_name}.{mod_name}')
 
+    permission_registry.assign_indexes()
+
 
 def register_permissions(
     group: str, names_and_labels: list[tuple[str, LazyString]]
@@ -38,16 +46,13 @@ def register_permissions(
 
 def get_permissions_for_user(user_id: UserID) -> frozenset[str]:
     """Return the permissions this user has been granted."""
-    registered_permission_ids = (
-        permission_registry.get_registered_permission_ids()
-    )
     user_permission_ids = authz_service.get_permission_ids_for_user(user_id)
 
     # Ignore unregistered permission IDs.
     return frozenset(
         str(permission_id)
-        for permission_id in registered_permission_ids
-        if permission_id in user_permission_ids
+        for permission_id in user_permission_ids
+        if permission_registry.is_permission_registered(permission_id)
     )
 
 
@@ -56,6 +61,7 @@ class PermissionRegistry:
 
     def __init__(self) -> None:
         self._permissions: dict[PermissionID, LazyString] = {}
+        self._bits: dict[str, int] | None = None
 
     def register_permission(
         self, permission_id: PermissionID, label: LazyString
@@ -63,6 +69,65 @@ class PermissionRegistry:
         """Add permission to the registry."""
         self._permissions[permission_id] = label
 
+        # Have indexes reassigned to include the new permission.
+        self._bits = None
+
+    def assign_indexes(self) -> dict[str, int]:
+        """Assign an index to each registered permission, and return
+        the resulting bit for each permission.
+
+        Indexes follow the order of permission IDs, so processes that
+        registered the same permissions agree on them.
+        """
+        bits: dict[str, int] = {
+            permission_id: 1 << index
+            for index, permission_id in enumerate(sorted(self._permissions))
+        }
+        self._bits = bits
+        return bits
+
+    def get_bit(self, permission_id: str) -> int:
+        """Return the bit that represents the permission in masks, or 0
+        if the permission is not registered.
+        """
+        return self._get_bits().get(permission_id, 0)
+
+    def build_mask(self, permission_ids: Iterable[str]) -> int:
+        """Return a bitmask of the permissions.
+
+        Unregistered permissions are ignored.
+        """
+        bits = self._get_bits()
+
+        mask = 0
+        for permission_id in permission_ids:
+            mask |= bits.get(permission_id, 0)
+        return mask
+
+    def find_mask(self, permission_ids: Iterable[str]) -> int | None:
+        """Return a bitmask of the permissions, or `None` if any of them
+        is not registered.
+        """
+        bits = self._get_bits()
+
+        mask = 0
+        for permission_id in permission_ids:
+            bit = bits.get(permission_id)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def _get_bits(self) -> dict[str, int]:
+        if self._bits is None:
+            return self.assign_indexes()
+
+        return self._bits
+
+    def is_permission_registered(self, permission_id: PermissionID) -> bool:
+        """Return `True` if the permission is registered."""
+        return permission_id in self._permissions
+
     def get_registered_permission_ids(self) -> frozenset[PermissionID]:
         """Return all registered permission IDs."""
         return frozenset(self._permissions.keys())
@@ -78,11 +143,55 @@ class PermissionRegistry:
 permission_registry = PermissionRegistry()
 
 
+def has_any_permission(mask: int, required_mask: int) -> bool:
+    """Return `True` if the mask contains any of the required
+    permissions.
+    """
+    return (mask & required_mask) != 0
+
+
+def has_all_permissions(mask: int, required_mask: int) -> bool:
+    """Return `True` if the mask contains all of the required
+    permissions.
+    """
+    return (mask & required_mask) == required_mask
+
+
+def get_current_user_permission_mask() -> int:
+    """Return the permissions of the current user as bitmask.
+
+    The mask is built once per request (and current user).
+    """
+    permissions = g.user.permissions
+
+    cached = g.get('current_user_permission_mask')
+    if (cached is not None) and (cached[0] is permissions):
+        return cached[1]
+
+    mask = permission_registry.build_mask(permissions)
+    g.current_user_permission_mask = (permissions, mask)
+    return mask
+
+
 def has_current_user_permission(permission: str) -> bool:
     """Return `True` if the current user has this permission."""
-    return permission in g.user.permissions
+    bit = permission_registry.get_bit(permission)
+    return has_any_permission(get_current_user_permission_mask(), bit)
 
 
 def has_current_user_any_permission(*permissions: str) -> bool:
     """Return `True` if the current user has any of these permissions."""
-    return any(map(has_current_user_permission, permissions))
+    required_mask = permission_registry.build_mask(permissions)
+    return has_any_permission(get_current_user_permission_mask(), required_mask)
+
+
+def has_current_user_all_permissions(*permissions: str) -> bool:
+    """Return `True` if the current user has all of these permissions."""
+    required_mask = permission_registry.find_mask(permissions)
+    if required_mask is None:
+        # Unregistered permissions cannot have been granted.
+        return False
+
+    return has_all_permissions(
+        get_current_user_permission_mask(), required_mask
+    )
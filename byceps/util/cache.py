@@ -0,0 +1,403 @@
+"""
+byceps.util.cache
+~~~~~~~~~~~~~~~~~
+
+Building blocks for caching: a process-local LRU cache with
+time-to-live, a Redis-backed tier, generation counters to invalidate
+entries across processes, and a combination of the local cache
+(optionally backed by the Redis tier) and generation counters.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+import pickle
+from threading import Lock
+import time
+from typing import Any
+
+from flask import current_app, g
+from redis import Redis
+from redis.exceptions import RedisError
+import structlog
+
+
+log = structlog.get_logger()
+
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+
+
+class LocalCache:
+    """A process-local, size-bounded LRU cache whose entries expire
+    after a time-to-live.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[
+            Hashable, tuple[Any, float | None]
+        ] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for the key, or the default if the key is
+        unknown or its entry has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+
+            value, expires_at = entry
+            if (expires_at is not None) and (expires_at <= self._clock()):
+                del self._entries[key]
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, *, ttl: float | None = None
+    ) -> None:
+        """Store the value for the key.
+
+        The cache-wide time-to-live applies unless one is given.
+        """
+        if ttl is None:
+            ttl = self._ttl
+
+        expires_at = (self._clock() + ttl) if (ttl is not None) else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        load: Callable[[], Any],
+        *,
+        ttl: float | None = None,
+    ) -> Any:
+        """Return the cached value for the key, or load, store, and
+        return it if not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = load()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        """Remove the entry for the key, if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> CacheStats:
+        """Return hit and miss counts as well as the current size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._entries),
+            )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """A cache tier that stores pickled values in Redis.
+
+    Only put values in here that originate from BYCEPS itself as they
+    are unpickled when read.
+    """
+
+    def __init__(self, redis_client: Redis, key_prefix: str, ttl: int) -> None:
+        self._redis_client = redis_client
+        self._key_prefix = key_prefix
+        self._ttl = ttl
+
+    def _build_key(self, key: str) -> str:
+        return f'{self._key_prefix}:{key}'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for the key, or the default if not found."""
+        data = self._redis_client.get(self._build_key(key))
+        if data is None:
+            return default
+
+        return pickle.loads(data)  # noqa: S301
+
+    def set(self, key: str, value: Any, *, ttl: int | None = None) -> None:
+        """Store the value for the key."""
+        if ttl is None:
+            ttl = self._ttl
+
+        data = pickle.dumps(value)
+        self._redis_client.set(self._build_key(key), data, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for the key, if present."""
+        self._redis_client.delete(self._build_key(key))
+
+
+class GenerationCounters:
+    """Counters stored in Redis, one per namespace, to invalidate cache
+    entries across all application processes.
+
+    Cache keys should include the current generations of the namespaces
+    the cached value depends on. Bumping a generation then makes those
+    keys unreachable.
+
+    Generations are fetched from Redis at most once per namespace and
+    application context (i.e. request).
+    """
+
+    def __init__(self, key_prefix: str) -> None:
+        self._key_prefix = key_prefix
+        self._context_attr_name = f'cache_generations:{key_prefix}'
+
+    def get(
+        self, namespaces: list[str], *, prefetch: Iterable[str] = ()
+    ) -> list[int]:
+        """Return the current generations of the namespaces.
+
+        Additional namespaces to prefetch (with the same round trip)
+        can be specified.
+        """
+        known = self._get_context_generations()
+
+        missing = [ns for ns in namespaces if ns not in known]
+        if missing:
+            missing.extend(
+                ns
+                for ns in prefetch
+                if (ns not in known) and (ns not in missing)
+            )
+
+            keys = [self._build_key(ns) for ns in missing]
+            values = current_app.redis_client.mget(keys)
+            for namespace, value in zip(missing, values, strict=True):
+                known[namespace] = int(value or 0)
+
+        return [known[ns] for ns in namespaces]
+
+    def bump(self, namespace: str, *, ttl: int | None = None) -> None:
+        """Increment the generation of the namespace.
+
+        Specify a time-to-live for namespaces that only exist
+        temporarily (e.g. one per user). It has to exceed that of the
+        cache entries depending on them.
+        """
+        key = self._build_key(namespace)
+
+        pipeline = current_app.redis_client.pipeline()
+        pipeline.incr(key)
+        if ttl is not None:
+            pipeline.expire(key, ttl)
+        pipeline.execute()
+
+        # Drop the generations remembered in the current context.
+        g.pop(self._context_attr_name, None)
+
+    def _get_context_generations(self) -> dict[str, int]:
+        return g.setdefault(self._context_attr_name, {})
+
+    def _build_key(self, namespace: str) -> str:
+        return f'{self._key_prefix}:{namespace}'
+
+
+class GenerationalCache:
+    """A process-local cache whose entries are invalidated in all
+    application processes by bumping generation counters.
+
+    Keys of entries have to include the current generations of the
+    namespaces their values depend on.
+
+    A function can be given that returns a Redis tier (or `None` if
+    that is disabled) to share entries between processes. Only string
+    keys are supported then.
+
+    Redis errors are logged but not raised: Generations that cannot be
+    fetched make callers load values without caching them, an
+    unavailable Redis tier is skipped, and failed bumps leave entries to
+    expire after their time-to-live.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        generation_key_prefix: str,
+        *,
+        maxsize: int,
+        ttl_config_key: str,
+        enabled_config_key: str | None = None,
+        prefetch_namespaces: Iterable[str] = (),
+        get_redis_cache: Callable[[], RedisCache | None] | None = None,
+    ) -> None:
+        self._name = name
+        self._local_cache = LocalCache(maxsize)
+        self._generation_counters = GenerationCounters(generation_key_prefix)
+        self._ttl_config_key = ttl_config_key
+        self._enabled_config_key = enabled_config_key
+        self._prefetch_namespaces = tuple(prefetch_namespaces)
+        self._get_redis_cache = get_redis_cache
+
+    def is_enabled(self) -> bool:
+        """Return `True` if the cache is enabled (or cannot be
+        disabled).
+        """
+        if self._enabled_config_key is None:
+            return True
+
+        return current_app.config[self._enabled_config_key]
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        namespaces: list[str],
+        load: Callable[[], Any],
+        *,
+        cache_none: bool = True,
+    ) -> Any:
+        """Return the cached value for the key and the current
+        generations of the namespaces, or load, cache, and return it.
+
+        Loaded values of `None` are not cached unless `cache_none` is
+        set.
+        """
+        if not self.is_enabled():
+            return load()
+
+        generations = self.get_generations(namespaces)
+        if generations is None:
+            return load()
+
+        versioned_key = (key, *generations)
+
+        value = self._local_cache.get(versioned_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        redis_cache = self._find_redis_cache()
+        redis_key = ':'.join(map(str, versioned_key))
+
+        if redis_cache is not None:
+            try:
+                value = redis_cache.get(redis_key, _MISSING)
+            except RedisError as e:
+                log.warning('Cache unavailable', cache=self._name, error=str(e))
+                redis_cache = None
+
+        if value is _MISSING:
+            value = load()
+            if (value is None) and not cache_none:
+                return value
+
+            if redis_cache is not None:
+                try:
+                    redis_cache.set(redis_key, value)
+                except RedisError as e:
+                    log.warning(
+                        'Could not store value in cache',
+                        cache=self._name,
+                        error=str(e),
+                    )
+
+        self._local_cache.set(versioned_key, value, ttl=self._get_ttl())
+
+        return value
+
+    def get_or_set(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Return the cached value for the key (which has to include
+        the generations), or load, cache, and return it.
+        """
+        return self._local_cache.get_or_set(key, load, ttl=self._get_ttl())
+
+    def get_generations(self, namespaces: list[str]) -> list[int] | None:
+        """Return the current generations of the namespaces, or `None`
+        if Redis is unavailable.
+        """
+        try:
+            return self._generation_counters.get(
+                namespaces, prefetch=self._prefetch_namespaces
+            )
+        except RedisError as e:
+            log.warning('Cache unavailable', cache=self._name, error=str(e))
+            return None
+
+    def invalidate(self, namespace: str, *, ttl: int | None = None) -> None:
+        """Make all processes reload the entries depending on the
+        namespace, if the cache is enabled.
+
+        See `GenerationCounters.bump` regarding the time-to-live.
+        """
+        if not self.is_enabled():
+            return
+
+        self.bump(namespace, ttl=ttl)
+
+    def bump(self, namespace: str, *, ttl: int | None = None) -> None:
+        """Increment the generation of the namespace, regardless of
+        whether the cache is enabled.
+        """
+        try:
+            self._generation_counters.bump(namespace, ttl=ttl)
+        except RedisError as e:
+            log.error(
+                'Could not invalidate cache',
+                cache=self._name,
+                namespace=namespace,
+                error=str(e),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries from this process."""
+        self._local_cache.clear()
+
+    def _find_redis_cache(self) -> RedisCache | None:
+        if self._get_redis_cache is None:
+            return None
+
+        return self._get_redis_cache()
+
+    def _get_ttl(self) -> int:
+        return current_app.config[self._ttl_config_key]
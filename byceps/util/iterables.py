@@ -9,7 +9,7 @@ byceps.util.iterables
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
-from itertools import tee
+from itertools import islice, tee
 from typing import TypeVar
 
 
@@ -18,6 +18,17 @@ T = TypeVar('T')
 Predicate = Callable[[T], bool]
 
 
+def chunk(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split the iterable into lists of (at most) `size` elements.
+
+    Example (with size 2):
+        x0, x1, x2, x3, x4 -> [x0, x1], [x2, x3], [x4]
+    """
+    iterator = iter(iterable)
+    while elements := list(islice(iterator, size)):
+        yield elements
+
+
 def find(iterable: Iterable[T], predicate: Predicate) -> T | None:
     """Return the first element in the iterable that matches the
     predicate.
@@ -12,7 +12,11 @@ from dataclasses import dataclass
 
 from typing_extensions import Self
 
-from .authz import has_current_user_permission
+from .authz import (
+    get_current_user_permission_mask,
+    has_any_permission,
+    permission_registry,
+)
 
 
 @dataclass(frozen=True)
@@ -61,12 +65,16 @@ class Navigation:
 
     def get_items(self) -> list[NavigationItem]:
         """Return the navigation items the current user is allowed to see."""
+        user_permission_mask = get_current_user_permission_mask()
 
         def user_has_permission(item: NavigationItem) -> bool:
             required_permission = item.required_permission
             if required_permission is None:
                 return True
 
-            return has_current_user_permission(required_permission)
+            return has_any_permission(
+                user_permission_mask,
+                permission_registry.get_bit(required_permission),
+            )
 
         return list(filter(user_has_permission, self.items))
@@ -0,0 +1,197 @@
+"""
+byceps.util.outbox
+~~~~~~~~~~~~~~~~~~
+
+A queue in Redis that is processed by at most one job at a time.
+
+Items are added to a Redis list. Whoever adds an item to an outbox that
+no job is responsible for yet has to schedule a job that processes it.
+
+A flag marks that a job is responsible for the outbox. A job takes it
+over when it starts, stating that it is the one draining the outbox,
+and refreshes it before each item. A job that finds another one
+draining the outbox leaves the items to that one. This way, a job that
+has been waiting in the queue for longer than the flag lives cannot
+handle items concurrently with a job scheduled in the meantime.
+
+Each job claims a batch of items by moving them to a processing list,
+and acknowledges each item once it has been handled. Items a job did
+not get to (because it stopped early or crashed) stay in the processing
+list and are claimed first by the next job. After its batch, a job
+releases the outbox, learning whether it has to schedule a follow-up
+job for the remaining items.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+from flask import current_app
+
+
+# Should a job crash, allow another one to take over eventually. Has to
+# exceed the time a job takes to handle a single item.
+DEFAULT_DRAIN_FLAG_TTL = 300
+
+# The drain flag's value while a job is scheduled but has not started
+# yet. A draining job sets it to its token instead.
+_SCHEDULED = b'scheduled'
+
+
+class Outbox:
+    def __init__(
+        self, key: str, *, drain_flag_ttl: int = DEFAULT_DRAIN_FLAG_TTL
+    ) -> None:
+        # Items are added on the left and taken from the right, so
+        # both lists are ordered from newest to oldest.
+        self._key = key
+        self._processing_key = f'{key}:processing'
+        self._drain_flag_key = f'{key}:draining'
+        self._drain_flag_ttl = drain_flag_ttl
+        self._job_token = uuid4().hex.encode()
+
+    def push(self, item: bytes | str) -> bool:
+        """Add the item.
+
+        Return `True` if the caller has to schedule a job to process the
+        outbox, `False` if one already is scheduled or running.
+        """
+        self.requeue(item)
+        return self._acquire_drain_flag()
+
+    def start(self) -> bool:
+        """Take over the outbox for the job this instance is used by.
+
+        Return `False` if another job is draining the outbox. That job
+        is going to take care of all items, so the caller has to stop.
+        """
+        return self._take_over_drain_flag()
+
+    def keep_draining(self) -> bool:
+        """Refresh the job's hold on the outbox. To be called before
+        handling each claimed item.
+
+        Return `False` if another job has taken over the outbox (because
+        this one did not refresh its hold in time). That job is going to
+        handle the claimed items, so the caller has to stop right away.
+        """
+        return self._take_over_drain_flag()
+
+    def requeue(self, item: bytes | str) -> None:
+        """Add the item again (e.g. to retry it), behind all waiting
+        items.
+
+        To be called by the job processing the outbox.
+        """
+        current_app.redis_client.lpush(self._key, item)
+
+    def claim_batch(self, batch_size: int) -> list[bytes]:
+        """Claim up to `batch_size` items, oldest first.
+
+        Items claimed, but not acknowledged, by an earlier job are
+        included.
+        """
+        redis_client = current_app.redis_client
+
+        missing_count = batch_size - redis_client.llen(self._processing_key)
+        if missing_count > 0:
+            pipeline = redis_client.pipeline()
+            for _ in range(missing_count):
+                pipeline.rpoplpush(self._key, self._processing_key)
+            pipeline.execute()
+
+        items = redis_client.lrange(self._processing_key, 0, -1)
+        items.reverse()
+        return items[:batch_size]
+
+    def acknowledge(self, count: int = 1) -> None:
+        """Remove the oldest `count` claimed items as they have been
+        handled.
+        """
+        if count < 1:
+            return
+
+        current_app.redis_client.ltrim(self._processing_key, 0, -(count + 1))
+
+    def replace_oldest_claimed(self, item: bytes | str) -> None:
+        """Replace the oldest claimed item (e.g. to record a failed
+        attempt to handle it).
+        """
+        current_app.redis_client.lset(self._processing_key, -1, item)
+
+    def release(self) -> bool:
+        """Mark the end of a job's batch.
+
+        Return `True` if the caller has to schedule a follow-up job for
+        the items that are left, `False` if the outbox is empty or
+        another job has taken it over.
+        """
+
+        def release_drain_flag(pipeline) -> bool | None:
+            if pipeline.get(self._drain_flag_key) != self._job_token:
+                return None
+
+            items_left = (
+                pipeline.llen(self._key) + pipeline.llen(self._processing_key)
+            ) > 0
+
+            pipeline.multi()
+            if items_left:
+                pipeline.set(
+                    self._drain_flag_key, _SCHEDULED, ex=self._drain_flag_ttl
+                )
+            else:
+                pipeline.delete(self._drain_flag_key)
+
+            return items_left
+
+        items_left = current_app.redis_client.transaction(
+            release_drain_flag,
+            self._drain_flag_key,
+            value_from_callable=True,
+        )
+
+        if items_left is None:
+            return False
+
+        if items_left:
+            return True
+
+        # Items added after the outbox has been found empty but before
+        # the flag has been removed did not schedule a job.
+        return (len(self) > 0) and self._acquire_drain_flag()
+
+    def _acquire_drain_flag(self) -> bool:
+        return bool(
+            current_app.redis_client.set(
+                self._drain_flag_key,
+                _SCHEDULED,
+                nx=True,
+                ex=self._drain_flag_ttl,
+            )
+        )
+
+    def _take_over_drain_flag(self) -> bool:
+        def take_over(pipeline) -> bool:
+            holder = pipeline.get(self._drain_flag_key)
+            if holder not in {None, _SCHEDULED, self._job_token}:
+                return False
+
+            pipeline.multi()
+            pipeline.set(
+                self._drain_flag_key, self._job_token, ex=self._drain_flag_ttl
+            )
+            return True
+
+        return current_app.redis_client.transaction(
+            take_over, self._drain_flag_key, value_from_callable=True
+        )
+
+    def __len__(self) -> int:
+        redis_client = current_app.redis_client
+        return redis_client.llen(self._key) + redis_client.llen(
+            self._processing_key
+        )
@@ -0,0 +1,243 @@
+"""
+byceps.util.request_context_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cache the objects every request needs to get started (site, party,
+current user, session validity, permissions) so that they do not have
+to be fetched from the database each time.
+
+Values are kept in a process-local LRU cache and, optionally, in Redis.
+Each cache key carries the current generation of the namespaces it
+depends on. Those generations are counters stored in Redis, so bumping
+one (triggered by signals) invalidates the respective entries in all
+application processes at once.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from hashlib import sha256
+from typing import Any
+
+from flask import current_app
+
+from byceps.services.authn.session import authn_session_service
+from byceps.services.party import party_service
+from byceps.services.party.models import Party, PartyID
+from byceps.services.site import site_service
+from byceps.services.site.models import Site, SiteID
+from byceps.services.user.models.user import User, UserID
+from byceps.signals import (
+    authn as authn_signals,
+    authz as authz_signals,
+    party as party_signals,
+    site as site_signals,
+    user as user_signals,
+)
+
+from .authz import get_permissions_for_user as _get_permissions_for_user
+from .cache import GenerationalCache, RedisCache
+
+
+_GENERATION_KEY_PREFIX = 'byceps:request_context_cache:generation'
+_VALUE_KEY_PREFIX = 'byceps:request_context_cache:value'
+
+_NAMESPACE_SITES = 'sites'
+_NAMESPACE_PARTIES = 'parties'
+_NAMESPACE_AUTHZ = 'authz'
+_NAMESPACE_SESSIONS = 'sessions'
+_GLOBAL_NAMESPACES = (
+    _NAMESPACE_SITES,
+    _NAMESPACE_PARTIES,
+    _NAMESPACE_AUTHZ,
+    _NAMESPACE_SESSIONS,
+)
+
+# Keep per-user generation counters well beyond any entry's lifetime.
+_USER_GENERATION_TTL = 86400
+
+
+def _get_redis_cache() -> RedisCache | None:
+    if not current_app.config.get('REQUEST_CONTEXT_CACHE_REDIS_ENABLED', False):
+        return None
+
+    ttl = current_app.config['REQUEST_CONTEXT_CACHE_TTL']
+    return RedisCache(current_app.redis_client, _VALUE_KEY_PREFIX, ttl)
+
+
+# The global namespaces are fetched together on first access so that a
+# request usually needs only one round trip.
+_cache = GenerationalCache(
+    'request_context',
+    _GENERATION_KEY_PREFIX,
+    maxsize=4096,
+    ttl_config_key='REQUEST_CONTEXT_CACHE_TTL',
+    enabled_config_key='REQUEST_CONTEXT_CACHE_ENABLED',
+    prefetch_namespaces=_GLOBAL_NAMESPACES,
+    get_redis_cache=_get_redis_cache,
+)
+
+
+def is_enabled() -> bool:
+    """Return `True` if the request context cache is enabled."""
+    return _cache.is_enabled()
+
+
+# -------------------------------------------------------------------- #
+# lookup
+
+
+def get_site(site_id: SiteID) -> Site:
+    """Return the site with that ID."""
+    return _cache.get_or_load(
+        f'site:{site_id}',
+        [_NAMESPACE_SITES],
+        lambda: site_service.get_site(site_id),
+    )
+
+
+def get_party(party_id: PartyID) -> Party:
+    """Return the party with that ID."""
+    return _cache.get_or_load(
+        f'party:{party_id}',
+        [_NAMESPACE_PARTIES],
+        lambda: party_service.get_party(party_id),
+    )
+
+
+def find_active_user_with_valid_session(
+    user_id: UserID, auth_token: str
+) -> User | None:
+    """Return the active user with that ID (including avatar) if the
+    client session is valid, or `None` otherwise.
+
+    Deleting the user's session tokens as well as suspending or deleting
+    the account invalidates the cached entry immediately. Invalid
+    sessions are not cached as they might become valid without any
+    signal being sent.
+    """
+    if not auth_token:
+        return None
+
+    # Do not put the token itself into cache keys.
+    token_hash = sha256(auth_token.encode()).hexdigest()
+
+    return _cache.get_or_load(
+        f'session:{user_id}:{token_hash}',
+        [_NAMESPACE_SESSIONS, _get_user_namespace(user_id)],
+        lambda: authn_session_service.find_active_user_with_valid_session(
+            user_id, auth_token
+        ),
+        cache_none=False,
+    )
+
+
+def get_permissions_for_user(user_id: UserID) -> frozenset[str]:
+    """Return the permissions this user has been granted.
+
+    Users without any permission are cached as well, as changes to
+    roles and their permissions are signaled.
+    """
+    return _cache.get_or_load(
+        f'permissions:{user_id}',
+        [_NAMESPACE_AUTHZ, _get_user_namespace(user_id)],
+        lambda: _get_permissions_for_user(user_id),
+    )
+
+
+# -------------------------------------------------------------------- #
+# invalidation
+
+
+def invalidate_sites() -> None:
+    """Invalidate all cached sites."""
+    _cache.invalidate(_NAMESPACE_SITES)
+
+
+def invalidate_parties() -> None:
+    """Invalidate all cached parties."""
+    _cache.invalidate(_NAMESPACE_PARTIES)
+
+
+def invalidate_permissions() -> None:
+    """Invalidate all users' cached permissions."""
+    _cache.invalidate(_NAMESPACE_AUTHZ)
+
+
+def invalidate_sessions() -> None:
+    """Invalidate all users' cached session validity."""
+    _cache.invalidate(_NAMESPACE_SESSIONS)
+
+
+def invalidate_user(user_id: UserID) -> None:
+    """Invalidate everything cached for that user."""
+    _cache.invalidate(_get_user_namespace(user_id), ttl=_USER_GENERATION_TTL)
+
+
+def clear() -> None:
+    """Remove all entries cached by this process."""
+    _cache.clear()
+
+
+def _get_user_namespace(user_id: UserID) -> str:
+    return f'user:{user_id}'
+
+
+def enable_invalidation() -> None:
+    """Connect signals that indicate changes to cached objects."""
+    site_signals.site_updated.connect(_on_site_updated)
+    party_signals.party_updated.connect(_on_party_updated)
+    authn_signals.all_session_tokens_deleted.connect(
+        _on_all_session_tokens_deleted
+    )
+
+    for signal in [
+        authz_signals.permission_assigned_to_role,
+        authz_signals.permission_deassigned_from_role,
+        authz_signals.role_deleted,
+    ]:
+        signal.connect(_on_role_permissions_changed)
+
+    for signal in [
+        authn_signals.password_updated,
+        authn_signals.session_tokens_deleted,
+        authz_signals.role_assigned_to_user,
+        authz_signals.role_deassigned_from_user,
+        user_signals.avatar_updated,
+        user_signals.details_updated,
+        user_signals.account_suspended,
+        user_signals.account_unsuspended,
+        user_signals.account_deleted,
+        user_signals.screen_name_changed,
+    ]:
+        signal.connect(_on_user_changed)
+
+
+def _on_site_updated(sender, **kwargs) -> None:
+    invalidate_sites()
+
+
+def _on_party_updated(sender, **kwargs) -> None:
+    invalidate_parties()
+
+
+def _on_all_session_tokens_deleted(sender, **kwargs) -> None:
+    invalidate_sessions()
+
+
+def _on_role_permissions_changed(sender, **kwargs) -> None:
+    # Finding the users that have the role is not worth it as role
+    # permissions rarely change.
+    invalidate_permissions()
+
+
+def _on_user_changed(
+    sender, *, event: Any = None, user_id: UserID | None = None
+) -> None:
+    if event is not None:
+        user_id = event.user_id
+
+    if user_id is not None:
+        invalidate_user(user_id)
@@ -11,7 +11,10 @@ Templating utilities
 from __future__ import annotations
 
 from collections.abc import Callable
+from functools import cache
+from hashlib import sha256
 from pathlib import Path
+from types import CodeType
 from typing import Any
 
 from flask import g
@@ -25,20 +28,61 @@ from jinja2 import (
 )
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 
+from .cache import CacheStats, LocalCache
+
 
 SITES_PATH = Path('sites')
 
 
+# Maximum number of compiled templates to keep per process.
+COMPILED_TEMPLATE_CACHE_MAXSIZE = 1024
+
+
+# Compiled template code, indexed by hash of the template source.
+_compiled_template_cache = LocalCache(maxsize=COMPILED_TEMPLATE_CACHE_MAXSIZE)
+
+
 def load_template(
     source: str, *, template_globals: dict[str, Any] | None = None
 ) -> Template:
-    """Load a template from source, using the sandboxed environment."""
-    env = create_sandboxed_environment()
+    """Load a template from source, using the sandboxed environment.
+
+    The environment is shared, and the compiled code for a source is
+    cached, so repeatedly loading the same source is cheap. Template
+    globals are bound to the returned template only.
+    """
+    env = _get_sandboxed_environment()
+    code = _get_compiled_template_code(env, source)
+    globals_ = env.make_globals(template_globals)
+
+    return env.template_class.from_code(env, code, globals_)
+
+
+@cache
+def _get_sandboxed_environment() -> Environment:
+    """Return the shared sandboxed environment, creating it on first
+    use.
+    """
+    return create_sandboxed_environment()
+
+
+def _get_compiled_template_code(env: Environment, source: str) -> CodeType:
+    """Return the compiled code for the template source.
+
+    Compile the source only if not found in the cache.
+    """
+    key = sha256(source.encode()).hexdigest()
+    return _compiled_template_cache.get_or_set(key, lambda: env.compile(source))
+
+
+def get_compiled_template_cache_stats() -> CacheStats:
+    """Return statistics on the compiled template cache."""
+    return _compiled_template_cache.get_stats()
 
-    if template_globals is not None:
-        env.globals.update(template_globals)
 
-    return env.from_string(source)
+def clear_compiled_template_cache() -> None:
+    """Remove all compiled templates from the cache."""
+    _compiled_template_cache.clear()
 
 
 def create_sandboxed_environment(
@@ -15,10 +15,9 @@ from flask import session
 
 from byceps.services.authn.session import authn_session_service
 from byceps.services.authn.session.models import CurrentUser
-from byceps.services.user import user_service
 from byceps.services.user.models.user import User, UserID
 
-from .authz import get_permissions_for_user
+from . import request_context_cache
 
 
 KEY_LOCALE = 'locale'
@@ -51,7 +50,7 @@ def get_current_user(required_permissions: set[str]) -> CurrentUser:
     if user is None:
         return authn_session_service.get_anonymous_current_user(session_locale)
 
-    permissions = get_permissions_for_user(user.id)
+    permissions = request_context_cache.get_permissions_for_user(user.id)
     if not required_permissions.issubset(permissions):
         return authn_session_service.get_anonymous_current_user(session_locale)
 
@@ -81,19 +80,13 @@ def _find_user() -> User | None:
     except ValueError:
         return None
 
-    user = user_service.find_active_user(user_id, include_avatar=True)
-
-    if user is None:
+    if auth_token is None:
         return None
 
     # Validate auth token.
-    if (auth_token is None) or not authn_session_service.is_session_valid(
-        user.id, auth_token
-    ):
-        # Bad auth token, not logging in.
-        return None
-
-    return user
+    return request_context_cache.find_active_user_with_valid_session(
+        user_id, auth_token
+    )
 
 
 def _get_session_locale() -> str | None:
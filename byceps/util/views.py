@@ -95,6 +95,27 @@ def textified(f):
     return wrapper
 
 
+def event_streamed(f):
+    """Send the server-sent events yielded by the decorated function as
+    they come.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        events = f(*args, **kwargs)
+        return Response(
+            stream_with_context(events),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                # Keep nginx from buffering the events.
+                'X-Accel-Buffering': 'no',
+            },
+        )
+
+    return wrapper
+
+
 def respond_created(f):
     """Send a ``201 Created`` response.
 
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""Measure how long it takes to create large ticket bundles.
+
+The bundles are deleted afterwards unless requested otherwise.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import time
+from uuid import UUID
+
+from _util import call_with_app_context
+from _validators import validate_user_screen_name
+import click
+
+from byceps.services.ticketing import (
+    ticket_bundle_service,
+    ticket_category_service,
+)
+from byceps.services.ticketing.models.ticket import (
+    TicketCategory,
+    TicketCategoryID,
+)
+from byceps.services.user.models.user import User
+
+
+def validate_ticket_category(
+    ctx, param, ticket_category_id_value: str
+) -> TicketCategory:
+    try:
+        ticket_category_id = TicketCategoryID(UUID(ticket_category_id_value))
+    except ValueError as exc:
+        raise click.BadParameter(
+            f'Invalid ticket category ID "{ticket_category_id_value}": {exc}'
+        ) from exc
+
+    ticket_category = ticket_category_service.find_category(ticket_category_id)
+
+    if not ticket_category:
+        raise click.BadParameter(
+            f'Unknown ticket category ID "{ticket_category_id}".'
+        )
+
+    return ticket_category
+
+
+@click.command()
+@click.argument('ticket_category', callback=validate_ticket_category)
+@click.argument('owner', callback=validate_user_screen_name)
+@click.option(
+    '--quantity',
+    type=int,
+    default=10_000,
+    show_default=True,
+    help='number of tickets per bundle',
+)
+@click.option(
+    '--runs',
+    type=int,
+    default=3,
+    show_default=True,
+    help='number of bundles to create',
+)
+@click.option('--keep', is_flag=True, help='do not delete created bundles')
+def execute(
+    ticket_category: TicketCategory,
+    owner: User,
+    quantity: int,
+    runs: int,
+    keep: bool,
+) -> None:
+    click.secho(
+        f'Creating {runs} bundle(s) of {quantity} tickets each '
+        f'for party "{ticket_category.party_id}" ...'
+    )
+
+    bundle_ids = []
+    durations = []
+
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        db_bundle = ticket_bundle_service.create_bundle(
+            ticket_category.party_id,
+            ticket_category.id,
+            quantity,
+            owner,
+            label='benchmark',
+        )
+        duration = time.perf_counter() - started_at
+
+        bundle_ids.append(db_bundle.id)
+        durations.append(duration)
+
+        click.secho(
+            f'Created bundle {db_bundle.id} in {duration:.2f} seconds '
+            f'({quantity / duration:.0f} tickets/second).'
+        )
+
+    click.secho(
+        f'Fastest: {min(durations):.2f} seconds, '
+        f'slowest: {max(durations):.2f} seconds.'
+    )
+
+    if not keep:
+        for bundle_id in bundle_ids:
+            ticket_bundle_service.delete_bundle(bundle_id)
+        click.secho(f'Deleted {len(bundle_ids)} bundle(s).')
+
+
+if __name__ == '__main__':
+    call_with_app_context(execute)
@@ -0,0 +1,83 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from flask import Flask
+from flask.ctx import AppContext
+from flask_babel import Babel
+import pytest
+
+from byceps.announce import announce
+from byceps.blueprints.site.snippet import rendering_cache
+from byceps.services.authn.api import api_token_cache
+from byceps.services.seating import seat_plan_service
+from byceps.services.shop.article import orderable_articles_cache
+from byceps.util import request_context_cache
+
+from tests.helpers.fake_redis import FakeRedis
+
+
+@pytest.fixture(scope='session')
+def make_app():
+    def _wrapper(
+        *,
+        additional_config: dict[str, Any] | None = None,
+    ) -> Flask:
+        app = Flask('byceps')
+
+        if additional_config is not None:
+            app.config.update(additional_config)
+
+        Babel(app)
+
+        return app
+
+    return _wrapper
+
+
+@pytest.fixture()
+def make_redis_app(make_app) -> Iterator:
+    """Return a function to create an application with an in-memory
+    Redis, and push its context.
+
+    Process-level caches are cleared before and after the test as their
+    entries would otherwise outlive the Redis data they depend on.
+    """
+    app_contexts: list[AppContext] = []
+
+    def _wrapper(
+        *,
+        additional_config: dict[str, Any] | None = None,
+    ) -> Flask:
+        app = make_app(additional_config=additional_config)
+        app.redis_client = FakeRedis()
+
+        app_context = app.app_context()
+        app_context.push()
+        app_contexts.append(app_context)
+
+        return app
+
+    _clear_process_level_caches()
+
+    yield _wrapper
+
+    for app_context in reversed(app_contexts):
+        app_context.pop()
+
+    _clear_process_level_caches()
+
+
+def _clear_process_level_caches() -> None:
+    announce.clear_webhook_cache()
+    api_token_cache.clear()
+    orderable_articles_cache.clear()
+    rendering_cache.clear()
+    request_context_cache.clear()
+    seat_plan_service.clear_cache()
@@ -0,0 +1,317 @@
+"""
+tests.helpers.fake_redis
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+A minimal in-memory stand-in for the parts of the Redis client API
+BYCEPS uses, for unit tests.
+
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from redis.exceptions import ResponseError
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self._subscriptions: list[FakePubSub] = []
+
+    def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def mget(self, keys: list[str]) -> list[Any]:
+        return [self.data.get(key) for key in keys]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        ex: int | None = None,
+        nx: bool = False,
+    ) -> bool | None:
+        if nx and (key in self.data):
+            return None
+
+        self.data[key] = _encode(value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def exists(self, *keys: str) -> int:
+        return sum(key in self.data for key in keys)
+
+    def rename(self, src: str, dst: str) -> bool:
+        if src not in self.data:
+            raise ResponseError('no such key')
+
+        self.data[dst] = self.data.pop(src)
+        return True
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        value = int(self.data.get(key, 0)) + amount
+        self.data[key] = _encode(value)
+        return value
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+    def hset(
+        self,
+        key: str,
+        field: str | None = None,
+        value: Any = None,
+        mapping: dict[str, Any] | None = None,
+    ) -> int:
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+
+        hash_ = self.data.setdefault(key, {})
+        new_count = 0
+        for item_field, item_value in items.items():
+            new_count += item_field.encode() not in hash_
+            hash_[item_field.encode()] = _encode(item_value)
+        return new_count
+
+    def hsetnx(self, key: str, field: bytes | str, value: Any) -> int:
+        hash_ = self.data.setdefault(key, {})
+        field_bytes = _encode(field)
+        if field_bytes in hash_:
+            return 0
+
+        hash_[field_bytes] = _encode(value)
+        return 1
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        hash_ = self.data.setdefault(key, {})
+        value = int(hash_.get(field.encode(), 0)) + amount
+        hash_[field.encode()] = _encode(value)
+        return value
+
+    def hmget(self, key: str, fields: list[str]) -> list[Any]:
+        hash_ = self.data.get(key, {})
+        return [hash_.get(field.encode()) for field in fields]
+
+    def hgetall(self, key: str) -> dict[bytes, Any]:
+        return dict(self.data.get(key, {}))
+
+    def hdel(self, key: str, *fields: str) -> int:
+        hash_ = self.data.get(key, {})
+        return sum(
+            hash_.pop(field.encode(), None) is not None for field in fields
+        )
+
+    def rpush(self, key: str, *values: Any) -> int:
+        list_ = self.data.setdefault(key, [])
+        list_.extend(_encode(value) for value in values)
+        return len(list_)
+
+    def lpush(self, key: str, *values: Any) -> int:
+        list_ = self.data.setdefault(key, [])
+        for value in values:
+            list_.insert(0, _encode(value))
+        return len(list_)
+
+    def rpoplpush(self, src: str, dst: str) -> bytes | None:
+        src_list = self.data.get(src)
+        if not src_list:
+            return None
+
+        value = src_list.pop()
+        if not src_list:
+            del self.data[src]
+        self.data.setdefault(dst, []).insert(0, value)
+        return value
+
+    def lset(self, key: str, index: int, value: Any) -> bool:
+        self.data[key][index] = _encode(value)
+        return True
+
+    def lrange(self, key: str, start: int, end: int) -> list[bytes]:
+        list_ = self.data.get(key, [])
+        return list_[start:] if (end == -1) else list_[start : end + 1]
+
+    def ltrim(self, key: str, start: int, end: int) -> bool:
+        list_ = self.lrange(key, start, end)
+        if list_:
+            self.data[key] = list_
+        else:
+            self.data.pop(key, None)
+        return True
+
+    def llen(self, key: str) -> int:
+        return len(self.data.get(key, []))
+
+    def zadd(
+        self, key: str, mapping: dict[str, float], *, nx: bool = False
+    ) -> int:
+        zset = self.data.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            member_bytes = _encode(member)
+            if member_bytes not in zset:
+                added += 1
+            elif nx:
+                continue
+            zset[member_bytes] = float(score)
+        return added
+
+    def zscore(self, key: str, member: str) -> float | None:
+        return self.data.get(key, {}).get(_encode(member))
+
+    def zrank(self, key: str, member: str) -> int | None:
+        member_bytes = _encode(member)
+        members = [m for m, _ in self._sorted_zset(key)]
+        return members.index(member_bytes) if member_bytes in members else None
+
+    def zrange(self, key: str, start: int, end: int) -> list[bytes]:
+        members = [m for m, _ in self._sorted_zset(key)]
+        return members[start:] if (end == -1) else members[start : end + 1]
+
+    def zrangebyscore(
+        self, key: str, min_: float | str, max_: float | str
+    ) -> list[bytes]:
+        min_score, max_score = float(min_), float(max_)
+        return [
+            m for m, s in self._sorted_zset(key) if min_score <= s <= max_score
+        ]
+
+    def zcard(self, key: str) -> int:
+        return len(self.data.get(key, {}))
+
+    def zrem(self, key: str, *members: str) -> int:
+        zset = self.data.get(key, {})
+        return sum(zset.pop(_encode(m), None) is not None for m in members)
+
+    def zremrangebyscore(
+        self, key: str, min_: float | str, max_: float | str
+    ) -> int:
+        min_score, max_score = float(min_), float(max_)
+        zset = self.data.get(key, {})
+        members = [m for m, s in zset.items() if min_score <= s <= max_score]
+        for member in members:
+            del zset[member]
+        return len(members)
+
+    def zpopmin(self, key: str, count: int = 1) -> list[tuple[bytes, float]]:
+        popped = self._sorted_zset(key)[:count]
+        for member, _ in popped:
+            del self.data[key][member]
+        return popped
+
+    def _sorted_zset(self, key: str) -> list[tuple[bytes, float]]:
+        zset = self.data.get(key, {})
+        return sorted(zset.items(), key=lambda item: (item[1], item[0]))
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
+
+    def transaction(
+        self,
+        func: Callable[[FakePipeline], Any],
+        *watches: str,
+        value_from_callable: bool = False,
+    ) -> Any:
+        """Run without watching as there are no concurrent clients."""
+        pipe = FakeTransactionPipeline(self)
+        value = func(pipe)
+        results = pipe.execute()
+        return value if value_from_callable else results
+
+    def publish(self, channel: str, message: Any) -> int:
+        receivers = [
+            pubsub
+            for pubsub in self._subscriptions
+            if channel in pubsub.channels
+        ]
+        for pubsub in receivers:
+            pubsub.messages.append(
+                {
+                    'type': 'message',
+                    'channel': channel.encode(),
+                    'data': _encode(message),
+                }
+            )
+        return len(receivers)
+
+    def pubsub(self, *, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        pubsub = FakePubSub()
+        self._subscriptions.append(pubsub)
+        return pubsub
+
+
+class FakePubSub:
+    """Messages are queued instead of being waited for."""
+
+    def __init__(self) -> None:
+        self.channels: set[str] = set()
+        self.messages: list[dict[str, Any]] = []
+
+    def subscribe(self, *channels: str) -> None:
+        self.channels.update(channels)
+
+    def get_message(
+        self, *, ignore_subscribe_messages: bool = False, timeout: float = 0.0
+    ) -> dict[str, Any] | None:
+        if not self.messages:
+            return None
+
+        return self.messages.pop(0)
+
+    def close(self) -> None:
+        self.channels.clear()
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs) -> FakePipeline:
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        results = [
+            getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._commands
+        ]
+        self._commands.clear()
+        return results
+
+
+class FakeTransactionPipeline(FakePipeline):
+    """Execute commands immediately until `multi` is called, then
+    queue them.
+    """
+
+    def __init__(self, redis: FakeRedis) -> None:
+        super().__init__(redis)
+        self._buffering = False
+
+    def multi(self) -> None:
+        self._buffering = True
+
+    def __getattr__(self, name: str):
+        if not self._buffering:
+            return getattr(self._redis, name)
+
+        return super().__getattr__(name)
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+
+    return str(value).encode()
@@ -0,0 +1,139 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from sqlalchemy import update
+
+from byceps.database import db
+from byceps.services.board import (
+    board_aggregation_service,
+    board_posting_command_service,
+    board_topic_command_service,
+)
+from byceps.services.board.board_aggregation_service import (
+    CategoryAggregationInconsistency,
+    TopicAggregationInconsistency,
+)
+from byceps.services.board.dbmodels.category import DbBoardCategory
+from byceps.services.board.dbmodels.topic import DbTopic
+
+from .helpers import create_category, create_posting, create_topic, find_topic
+
+
+def test_incremental_aggregation_matches_recount(
+    site_app, board, board_poster, moderator
+):
+    category1 = create_category(board.id, number=3)
+    category2 = create_category(board.id, number=4)
+
+    topic1 = create_topic(category1.id, board_poster, number=1)
+    topic2 = create_topic(category1.id, board_poster, number=2)
+    posting1 = create_posting(topic1.id, board_poster, number=1)
+    latest_posting = create_posting(topic2.id, board_poster, number=2)
+
+    board_posting_command_service.hide_posting(latest_posting.id, moderator)
+    board_posting_command_service.hide_posting(posting1.id, moderator)
+    board_posting_command_service.unhide_posting(posting1.id, moderator)
+    board_topic_command_service.hide_topic(topic1.id, moderator)
+    board_topic_command_service.move_topic(topic2.id, category2.id, moderator)
+
+    db.session.expire_all()
+
+    assert board_aggregation_service.find_inconsistencies(board.id) == []
+
+    topic2_afterwards = find_topic(topic2.id)
+    assert topic2_afterwards.posting_count == 1
+
+    category1_afterwards = db.session.get(DbBoardCategory, category1.id)
+    assert category1_afterwards.topic_count == 0
+    assert category1_afterwards.posting_count == 2
+    assert category1_afterwards.last_posting_updated_at is None
+
+    category2_afterwards = db.session.get(DbBoardCategory, category2.id)
+    assert category2_afterwards.topic_count == 1
+    assert category2_afterwards.posting_count == 1
+    assert (
+        category2_afterwards.last_posting_updated_at
+        == topic2_afterwards.last_updated_at
+    )
+
+
+def test_repeated_hiding_and_unhiding_changes_counts_once(
+    site_app, board, board_poster, moderator
+):
+    category = create_category(board.id, number=6)
+    topic1 = create_topic(category.id, board_poster, number=1)
+    topic2 = create_topic(category.id, board_poster, number=2)
+    posting = create_posting(topic1.id, board_poster, number=1)
+
+    board_posting_command_service.hide_posting(posting.id, moderator)
+    board_posting_command_service.hide_posting(posting.id, moderator)
+    board_topic_command_service.hide_topic(topic2.id, moderator)
+    board_topic_command_service.hide_topic(topic2.id, moderator)
+
+    db.session.expire_all()
+
+    assert board_aggregation_service.find_inconsistencies(board.id) == []
+
+    assert find_topic(topic1.id).posting_count == 1
+    category_afterwards = db.session.get(DbBoardCategory, category.id)
+    assert category_afterwards.topic_count == 1
+    assert category_afterwards.posting_count == 2
+
+    board_posting_command_service.unhide_posting(posting.id, moderator)
+    board_posting_command_service.unhide_posting(posting.id, moderator)
+    board_topic_command_service.unhide_topic(topic2.id, moderator)
+    board_topic_command_service.unhide_topic(topic2.id, moderator)
+
+    db.session.expire_all()
+
+    assert board_aggregation_service.find_inconsistencies(board.id) == []
+
+    assert find_topic(topic1.id).posting_count == 2
+    category_afterwards = db.session.get(DbBoardCategory, category.id)
+    assert category_afterwards.topic_count == 2
+    assert category_afterwards.posting_count == 3
+
+
+def test_reaggregate_board_fixes_inconsistencies(site_app, board, board_poster):
+    category = create_category(board.id, number=5)
+    topic = create_topic(category.id, board_poster)
+
+    db.session.execute(
+        update(DbTopic).filter_by(id=topic.id).values(posting_count=23)
+    )
+    db.session.commit()
+
+    inconsistencies = board_aggregation_service.find_inconsistencies(board.id)
+    assert {type(inconsistency) for inconsistency in inconsistencies} == {
+        TopicAggregationInconsistency,
+    }
+
+    fixed = board_aggregation_service.reaggregate_board(board.id)
+    assert fixed == inconsistencies
+
+    db.session.expire_all()
+
+    assert find_topic(topic.id).posting_count == 1
+    assert board_aggregation_service.find_inconsistencies(board.id) == []
+
+
+def test_find_inconsistencies_in_category(site_app, board, board_poster):
+    category = create_category(board.id, number=6)
+    create_topic(category.id, board_poster)
+
+    db.session.execute(
+        update(DbBoardCategory).filter_by(id=category.id).values(topic_count=0)
+    )
+    db.session.commit()
+
+    inconsistencies = board_aggregation_service.find_inconsistencies(board.id)
+    assert len(inconsistencies) == 1
+    inconsistency = inconsistencies[0]
+    assert isinstance(inconsistency, CategoryAggregationInconsistency)
+    assert inconsistency.category_id == category.id
+    assert inconsistency.stored.topic_count == 0
+    assert inconsistency.actual.topic_count == 1
+
+    board_aggregation_service.reaggregate_board(board.id)
@@ -0,0 +1,46 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.board import (
+    board_last_view_service,
+    board_topic_query_service,
+)
+
+from .helpers import create_topic
+
+
+def test_contains_topics_unseen_postings(
+    site_app, category, board_poster, make_user
+):
+    viewer = make_user()
+
+    topic1 = create_topic(category.id, board_poster, number=1)
+    topic2 = create_topic(category.id, board_poster, number=2)
+    topic3 = create_topic(category.id, board_poster, number=3)
+    db_topics = [
+        board_topic_query_service.get_db_topic(topic.id)
+        for topic in [topic1, topic2, topic3]
+    ]
+
+    board_last_view_service.mark_topic_as_just_viewed(topic2.id, viewer.id)
+
+    actual = board_last_view_service.contains_topics_unseen_postings(
+        db_topics, viewer.id
+    )
+
+    assert actual == {
+        topic1.id: True,
+        topic2.id: False,
+        topic3.id: True,
+    }
+
+
+def test_find_topics_last_viewed_at_without_topics(site_app, make_user):
+    viewer = make_user()
+
+    assert (
+        board_last_view_service.find_topics_last_viewed_at(set(), viewer.id)
+        == {}
+    )
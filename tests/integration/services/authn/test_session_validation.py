@@ -0,0 +1,60 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.authn.session import authn_session_service
+
+
+def test_find_active_user_with_valid_session(admin_app, make_user):
+    user = make_user()
+    session_token = authn_session_service.get_session_token(user.id)
+    auth_token = str(session_token.token)
+
+    actual = authn_session_service.find_active_user_with_valid_session(
+        user.id, auth_token
+    )
+
+    assert actual is not None
+    assert actual.id == user.id
+    assert actual.screen_name == user.screen_name
+
+
+def test_find_active_user_with_deleted_session(admin_app, make_user):
+    user = make_user()
+    session_token = authn_session_service.get_session_token(user.id)
+    auth_token = str(session_token.token)
+
+    authn_session_service.delete_session_tokens_for_user(user.id)
+
+    assert (
+        authn_session_service.find_active_user_with_valid_session(
+            user.id, auth_token
+        )
+        is None
+    )
+
+
+def test_find_active_user_with_session_of_other_user(admin_app, make_user):
+    user = make_user()
+    other_user = make_user()
+    other_session_token = authn_session_service.get_session_token(other_user.id)
+
+    assert (
+        authn_session_service.find_active_user_with_valid_session(
+            user.id, str(other_session_token.token)
+        )
+        is None
+    )
+
+
+def test_find_suspended_user_with_valid_session(admin_app, make_user):
+    user = make_user(suspended=True)
+    session_token = authn_session_service.get_session_token(user.id)
+
+    assert (
+        authn_session_service.find_active_user_with_valid_session(
+            user.id, str(session_token.token)
+        )
+        is None
+    )
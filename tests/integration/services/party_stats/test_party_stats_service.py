@@ -0,0 +1,84 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.party_stats import party_stats_service
+from byceps.services.seating import seat_service, seating_area_service
+from byceps.services.seating.models import SeatUtilization
+from byceps.services.ticketing import (
+    ticket_creation_service,
+    ticket_revocation_service,
+    ticket_seat_management_service,
+)
+from byceps.services.ticketing.models.ticket import TicketSaleStats
+
+
+@pytest.fixture(scope='module')
+def party_with_tickets(make_party, brand):
+    return make_party(brand.id, max_ticket_quantity=10)
+
+
+@pytest.fixture(scope='module')
+def party_without_tickets(make_party, brand):
+    return make_party(brand.id)
+
+
+@pytest.fixture(scope='module')
+def category(make_ticket_category, party_with_tickets):
+    return make_ticket_category(party_with_tickets.id, 'Standard')
+
+
+@pytest.fixture(scope='module')
+def ticket_owner(make_user):
+    return make_user()
+
+
+def test_get_stats_for_parties(
+    admin_app,
+    party_with_tickets,
+    party_without_tickets,
+    category,
+    ticket_owner,
+):
+    area = seating_area_service.create_area(
+        party_with_tickets.id, 'hall', 'Hall'
+    )
+    seat1 = seat_service.create_seat(area.id, 0, 0, category.id)
+    seat_service.create_seat(area.id, 0, 1, category.id)
+
+    tickets = ticket_creation_service.create_tickets(
+        party_with_tickets.id, category.id, ticket_owner, 3
+    )
+
+    ticket_seat_management_service.occupy_seat(
+        tickets[0].id, seat1.id, ticket_owner.id
+    ).unwrap()
+    ticket_revocation_service.revoke_ticket(tickets[2].id, ticket_owner.id)
+
+    stats_by_party_id = party_stats_service.get_stats_for_parties(
+        [party_with_tickets.id, party_without_tickets.id]
+    )
+
+    stats = stats_by_party_id[party_with_tickets.id]
+    assert stats.ticket_sale_stats == TicketSaleStats(
+        tickets_max=10, tickets_sold=2
+    )
+    assert stats.tickets_revoked == 1
+    assert stats.tickets_checked_in == 0
+    assert stats.seat_utilization == SeatUtilization(occupied=1, total=2)
+
+    stats = stats_by_party_id[party_without_tickets.id]
+    assert stats.ticket_sale_stats == TicketSaleStats(
+        tickets_max=None, tickets_sold=0
+    )
+    assert stats.tickets_revoked == 0
+    assert stats.tickets_checked_in == 0
+    assert stats.seat_utilization == SeatUtilization(occupied=0, total=0)
+
+    counts_by_party_id = party_stats_service.count_occupied_seats_by_category(
+        [party_with_tickets.id, party_without_tickets.id]
+    )
+    assert counts_by_party_id == {party_with_tickets.id: [(category, 1)]}
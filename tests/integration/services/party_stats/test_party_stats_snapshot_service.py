@@ -0,0 +1,90 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.party_stats import party_stats_snapshot_service
+from byceps.services.shop.order.models.order import PaymentState
+from byceps.services.ticketing import ticket_creation_service
+
+
+@pytest.fixture()
+def snapshots_enabled(admin_app, monkeypatch):
+    monkeypatch.setitem(admin_app.config, 'PARTY_STATS_SNAPSHOTS_ENABLED', True)
+
+
+@pytest.fixture(scope='module')
+def party(make_party, brand):
+    return make_party(brand.id, max_ticket_quantity=20)
+
+
+@pytest.fixture(scope='module')
+def category(make_ticket_category, party):
+    return make_ticket_category(party.id, 'Standard')
+
+
+@pytest.fixture(scope='module')
+def ticket_owner(make_user):
+    return make_user()
+
+
+@pytest.fixture(scope='module')
+def shop(make_brand, make_shop):
+    brand = make_brand()
+    return make_shop(brand.id)
+
+
+def test_stats_are_read_from_snapshot_until_refreshed(
+    admin_app, snapshots_enabled, party, category, ticket_owner
+):
+    ticket_creation_service.create_tickets(
+        party.id, category.id, ticket_owner, 2
+    )
+
+    stats = party_stats_snapshot_service.get_stats_for_party(party.id)
+    assert stats.ticket_sale_stats.tickets_max == 20
+    assert stats.ticket_sale_stats.tickets_sold == 2
+
+    ticket_creation_service.create_tickets(
+        party.id, category.id, ticket_owner, 3
+    )
+
+    # The snapshot has been stored on first read and is still current.
+    stats = party_stats_snapshot_service.get_stats_for_party(party.id)
+    assert stats.ticket_sale_stats.tickets_sold == 2
+
+    party_stats_snapshot_service.refresh_party_snapshots({party.id})
+
+    stats = party_stats_snapshot_service.get_stats_for_party(party.id)
+    assert stats.ticket_sale_stats.tickets_sold == 5
+
+
+def test_outdated_snapshot_is_not_used(
+    admin_app, snapshots_enabled, monkeypatch, party, category, ticket_owner
+):
+    party_stats_snapshot_service.refresh_party_snapshots({party.id})
+    tickets_sold_before = party_stats_snapshot_service.get_stats_for_party(
+        party.id
+    ).ticket_sale_stats.tickets_sold
+
+    ticket_creation_service.create_tickets(
+        party.id, category.id, ticket_owner, 1
+    )
+
+    monkeypatch.setitem(admin_app.config, 'PARTY_STATS_SNAPSHOTS_MAX_AGE', 0)
+
+    stats = party_stats_snapshot_service.get_stats_for_party(party.id)
+    assert stats.ticket_sale_stats.tickets_sold == tickets_sold_before + 1
+
+
+def test_get_order_stats_for_shops(admin_app, snapshots_enabled, shop):
+    order_stats_by_shop_id = (
+        party_stats_snapshot_service.get_order_stats_for_shops([shop.id])
+    )
+
+    order_stats = order_stats_by_shop_id[shop.id]
+    assert order_stats.shop_id == shop.id
+    assert set(order_stats.order_counts_by_payment_state) == set(PaymentState)
+    assert order_stats.open_orders == 0
@@ -0,0 +1,90 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from byceps.database import db
+from byceps.services.shop.article import article_service
+from byceps.services.shop.article.models import Article
+
+
+@pytest.fixture()
+def cache_enabled(admin_app, monkeypatch):
+    monkeypatch.setitem(admin_app.config, 'SHOP_ARTICLE_CACHE_ENABLED', True)
+
+
+def test_only_currently_available_articles_are_included(
+    admin_app, shop, make_article
+):
+    now = datetime.utcnow()
+
+    available_article = make_article(shop.id)
+    make_article(shop.id, available_from=now + timedelta(days=1))
+    make_article(shop.id, available_until=now - timedelta(days=1))
+
+    assert get_article_ids(shop.id) == [available_article.id]
+
+
+def test_current_quantities_are_included(
+    admin_app, cache_enabled, shop, make_article
+):
+    article = make_article(shop.id, total_quantity=10)
+
+    assert get_quantities(shop.id) == [10]
+
+    article_service.reserve_quantities({article.id: 3}).unwrap()
+    db.session.commit()
+
+    assert get_quantities(shop.id) == [7]
+
+
+def test_article_changes_are_included(
+    admin_app, cache_enabled, shop, make_article
+):
+    article = make_article(shop.id)
+
+    assert get_descriptions(shop.id) == [article.description]
+
+    update_description(article, 'Updated description')
+
+    assert get_descriptions(shop.id) == ['Updated description']
+
+
+# helpers
+
+
+def get_compilation(shop_id):
+    return article_service.get_article_compilation_for_orderable_articles(
+        shop_id
+    ).unwrap()
+
+
+def get_article_ids(shop_id):
+    return [item.article.id for item in get_compilation(shop_id)]
+
+
+def get_quantities(shop_id):
+    return [item.article.quantity for item in get_compilation(shop_id)]
+
+
+def get_descriptions(shop_id):
+    return [item.article.description for item in get_compilation(shop_id)]
+
+
+def update_description(article: Article, description: str) -> None:
+    article_service.update_article(
+        article.id,
+        description,
+        article.price,
+        article.tax_rate,
+        article.available_from,
+        article.available_until,
+        article.total_quantity,
+        article.max_quantity_per_order,
+        article.not_directly_orderable,
+        article.separate_order_required,
+    )
@@ -0,0 +1,114 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from moneyed import EUR
+import pytest
+
+from byceps.services.shop.article import article_service
+from byceps.services.shop.article.errors import ArticlesSoldOutError
+from byceps.services.shop.article.models import Article
+from byceps.services.shop.cart.models import Cart
+from byceps.services.shop.order import order_checkout_service
+
+
+PARALLEL_CHECKOUTS = 20
+
+
+@pytest.fixture(scope='module')
+def orderer(make_user, make_orderer):
+    user = make_user()
+    return make_orderer(user)
+
+
+def test_sold_out_article_is_not_ordered(
+    admin_app, shop, storefront, orderer, make_article
+):
+    article = make_article(shop.id, total_quantity=2)
+
+    cart = _create_cart([(article, 3)])
+
+    result = order_checkout_service.place_order(storefront, orderer, cart)
+
+    assert result.is_err()
+    assert result.unwrap_err() == ArticlesSoldOutError(frozenset([article.id]))
+    assert _get_quantity(article) == 2
+
+
+def test_parallel_checkouts_do_not_oversell(
+    admin_app, shop, storefront, orderer, make_article
+):
+    quantity = 5
+    article = make_article(shop.id, total_quantity=quantity)
+
+    results = _place_orders_in_parallel(
+        admin_app,
+        storefront,
+        orderer,
+        [[(article, 1)] for _ in range(PARALLEL_CHECKOUTS)],
+    )
+
+    successes = [result for result in results if result.is_ok()]
+    failures = [result.unwrap_err() for result in results if result.is_err()]
+
+    assert len(successes) == quantity
+    assert len(failures) == PARALLEL_CHECKOUTS - quantity
+    assert all(isinstance(e, ArticlesSoldOutError) for e in failures)
+    assert _get_quantity(article) == 0
+
+
+def test_parallel_checkouts_of_same_articles_in_different_order(
+    admin_app, shop, storefront, orderer, make_article
+):
+    article1 = make_article(shop.id, total_quantity=100)
+    article2 = make_article(shop.id, total_quantity=100)
+
+    results = _place_orders_in_parallel(
+        admin_app,
+        storefront,
+        orderer,
+        [
+            [(article1, 1), (article2, 1)]
+            if i % 2
+            else [(article2, 1), (article1, 1)]
+            for i in range(PARALLEL_CHECKOUTS)
+        ],
+    )
+
+    assert all(result.is_ok() for result in results)
+    assert _get_quantity(article1) == 100 - PARALLEL_CHECKOUTS
+    assert _get_quantity(article2) == 100 - PARALLEL_CHECKOUTS
+
+
+# helpers
+
+
+def _create_cart(items: list[tuple[Article, int]]) -> Cart:
+    cart = Cart(EUR)
+    for article, quantity in items:
+        cart.add_item(article, quantity)
+    return cart
+
+
+def _place_orders_in_parallel(app, storefront, orderer, carts_items):
+    barrier = Barrier(len(carts_items))
+
+    def place_order(items):
+        # Each application context gets a database session of its own.
+        with app.app_context():
+            cart = _create_cart(items)
+            barrier.wait()
+            return order_checkout_service.place_order(storefront, orderer, cart)
+
+    with ThreadPoolExecutor(max_workers=len(carts_items)) as executor:
+        return list(executor.map(place_order, carts_items))
+
+
+def _get_quantity(article: Article) -> int:
+    return article_service.get_article(article.id).quantity
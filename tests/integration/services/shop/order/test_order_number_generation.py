@@ -46,3 +46,38 @@ def test_generate_order_number_custom(admin_app, shop2):
     actual = order_sequence_service.generate_order_number(sequence.id).unwrap()
 
     assert actual == 'LOL-03-B00207'
+
+
+@pytest.fixture(scope='module')
+def shop3(make_brand, make_shop):
+    brand = make_brand()
+
+    return make_shop(brand.id)
+
+
+def test_generate_order_numbers_from_block(admin_app, shop3, monkeypatch):
+    shop = shop3
+
+    monkeypatch.setitem(admin_app.config, 'SHOP_ORDER_NUMBER_BLOCK_SIZE', 3)
+
+    sequence = order_sequence_service.create_order_number_sequence(
+        shop.id, 'BLK-01-B', value=10
+    ).unwrap()
+
+    actual = [
+        order_sequence_service.generate_order_number(sequence.id).unwrap()
+        for _ in range(4)
+    ]
+
+    assert actual == [
+        'BLK-01-B00011',
+        'BLK-01-B00012',
+        'BLK-01-B00013',
+        'BLK-01-B00014',
+    ]
+
+    # Two blocks have been reserved.
+    sequence_afterwards = order_sequence_service.get_order_number_sequence(
+        sequence.id
+    )
+    assert sequence_afterwards.value == 16
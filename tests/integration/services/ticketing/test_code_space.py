@@ -0,0 +1,91 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from math import perm
+
+import pytest
+from sqlalchemy import delete
+
+from byceps.database import db
+from byceps.services.ticketing import (
+    ticket_code_service,
+    ticket_creation_service,
+)
+from byceps.services.ticketing.dbmodels.code_sequence import (
+    DbTicketCodeSequence,
+)
+from byceps.services.ticketing.models.ticket import TicketCodeSpaceOccupancy
+
+
+@pytest.fixture()
+def category(brand, make_party, make_ticket_category):
+    # Use a party of its own to not be affected by other tests' tickets.
+    party = make_party(brand.id)
+    return make_ticket_category(party.id, 'Standard')
+
+
+@pytest.fixture()
+def derived_codes(admin_app, monkeypatch):
+    monkeypatch.setitem(
+        admin_app.config, 'TICKET_CODE_GENERATOR', 'permutation'
+    )
+
+
+def test_derived_codes(derived_codes, category, ticket_owner):
+    tickets = ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, 10
+    )
+
+    codes = {ticket.code for ticket in tickets}
+    assert len(codes) == 10
+    assert all(len(code) == 5 for code in codes)
+
+
+def test_longer_codes_once_code_space_gets_full(
+    admin_app, monkeypatch, derived_codes, category, ticket_owner
+):
+    # Allow for only four tickets with five-letter codes.
+    monkeypatch.setitem(admin_app.config, 'TICKET_CODE_MAX_FILL_RATIO', 1e-6)
+
+    tickets1 = ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, 4
+    )
+    assert {len(ticket.code) for ticket in tickets1} == {5}
+
+    tickets2 = ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, 2
+    )
+    assert {len(ticket.code) for ticket in tickets2} == {6}
+
+    assert ticket_code_service.get_code_space_occupancies(
+        category.party_id
+    ) == [
+        TicketCodeSpaceOccupancy(code_length=5, capacity=21**5, used=4),
+        TicketCodeSpaceOccupancy(code_length=6, capacity=21**6, used=2),
+    ]
+
+
+def test_tickets_created_before_codes_were_counted_are_included(
+    admin_app, category, ticket_owner
+):
+    ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, 3
+    )
+
+    # Forget the counts as if the tickets had been created earlier.
+    db.session.execute(
+        delete(DbTicketCodeSequence).filter_by(party_id=category.party_id)
+    )
+    db.session.commit()
+
+    ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, 2
+    )
+
+    assert ticket_code_service.get_code_space_occupancies(
+        category.party_id
+    ) == [
+        TicketCodeSpaceOccupancy(code_length=5, capacity=perm(21, 5), used=5),
+    ]
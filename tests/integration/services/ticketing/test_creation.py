@@ -71,6 +71,26 @@ def test_create_tickets_with_clashing_generated_codes(
     )
 
 
+@patch('byceps.services.ticketing.ticket_code_service._generate_ticket_code')
+def test_create_tickets_replaces_only_codes_in_use(
+    generate_ticket_code_mock, admin_app, category, ticket_owner
+):
+    codes = iter(['INUSE', 'FRESH', 'INUSE', 'NEWER'])
+    generate_ticket_code_mock.side_effect = lambda: next(codes)
+
+    existing_ticket = ticket_creation_service.create_ticket(
+        category.party_id, category.id, ticket_owner
+    )
+    assert existing_ticket.code == 'INUSE'
+
+    quantity = 2
+    tickets = ticket_creation_service.create_tickets(
+        category.party_id, category.id, ticket_owner, quantity
+    )
+
+    assert {ticket.code for ticket in tickets} == {'FRESH', 'NEWER'}
+
+
 def assert_created_ticket(ticket, expected_category_id, expected_owner_id):
     assert ticket is not None
     assert ticket.created_at is not None
@@ -0,0 +1,90 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from sqlalchemy import select
+
+from byceps.database import (
+    db,
+    execute_upsert_many,
+    insert_ignore_many_on_conflict,
+    upsert_many,
+)
+from byceps.services.global_setting.dbmodels import DbGlobalSetting
+
+
+TABLE = DbGlobalSetting.__table__
+
+
+def test_upsert_many_inserts_and_updates(admin_app):
+    db.session.add(DbGlobalSetting('upsert_many_1', 'old'))
+    db.session.commit()
+
+    upsert_many(
+        TABLE,
+        [{'name': 'upsert_many_1'}, {'name': 'upsert_many_2'}],
+        {'value': 'new'},
+    )
+
+    assert get_values(['upsert_many_1', 'upsert_many_2']) == {
+        'upsert_many_1': 'new',
+        'upsert_many_2': 'new',
+    }
+
+
+def test_upsert_many_accepts_repeated_identifiers(admin_app):
+    upsert_many(
+        TABLE,
+        [{'name': 'upsert_many_3'}, {'name': 'upsert_many_3'}],
+        {'value': 'value'},
+    )
+
+    assert get_values(['upsert_many_3']) == {'upsert_many_3': 'value'}
+
+
+def test_execute_upsert_many_lets_last_repeated_row_win(admin_app):
+    execute_upsert_many(
+        TABLE,
+        [
+            {'name': 'upsert_many_4', 'value': 'first'},
+            {'name': 'upsert_many_5', 'value': 'other'},
+            {'name': 'upsert_many_4', 'value': 'last'},
+        ],
+        ['value'],
+    )
+    db.session.commit()
+
+    assert get_values(['upsert_many_4', 'upsert_many_5']) == {
+        'upsert_many_4': 'last',
+        'upsert_many_5': 'other',
+    }
+
+
+def test_insert_ignore_many_on_conflict_keeps_existing_rows(admin_app):
+    db.session.add(DbGlobalSetting('insert_ignore_many_1', 'old'))
+    db.session.commit()
+
+    insert_ignore_many_on_conflict(
+        TABLE,
+        [
+            {'name': 'insert_ignore_many_1', 'value': 'new'},
+            {'name': 'insert_ignore_many_2', 'value': 'first'},
+            {'name': 'insert_ignore_many_2', 'value': 'last'},
+        ],
+    )
+
+    assert get_values(['insert_ignore_many_1', 'insert_ignore_many_2']) == {
+        'insert_ignore_many_1': 'old',
+        'insert_ignore_many_2': 'first',
+    }
+
+
+def get_values(names: list[str]) -> dict[str, str]:
+    rows = db.session.execute(
+        select(DbGlobalSetting.name, DbGlobalSetting.value).filter(
+            DbGlobalSetting.name.in_(names)
+        )
+    ).all()
+
+    return dict(rows)
@@ -0,0 +1,220 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+
+from byceps.announce import dispatch
+from byceps.services.webhooks.models import AnnouncementRequest, WebhookID
+
+from tests.helpers import generate_uuid
+
+
+WEBHOOK_ID = WebhookID(generate_uuid())
+URL = 'https://webhooks.example/123'
+
+
+@pytest.fixture()
+def dispatch_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'WEBHOOK_MIN_CALL_INTERVAL': 0,
+            'WEBHOOK_MAX_RETRIES': 2,
+        }
+    )
+
+
+@pytest.fixture()
+def enqueued_jobs(monkeypatch) -> list:
+    enqueued_jobs = []
+
+    def enqueue(func, *args, **kwargs):
+        enqueued_jobs.append((func, args))
+
+    monkeypatch.setattr(dispatch, 'enqueue', enqueue)
+
+    return enqueued_jobs
+
+
+@pytest.fixture()
+def scheduled_jobs(monkeypatch) -> list:
+    scheduled_jobs = []
+
+    def enqueue_at(dt, func, *args, **kwargs):
+        delay = round((dt - datetime.utcnow()).total_seconds())
+        scheduled_jobs.append((delay, func, args))
+
+    monkeypatch.setattr(dispatch, 'enqueue_at', enqueue_at)
+
+    return scheduled_jobs
+
+
+@pytest.fixture()
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(dispatch, '_get_session', lambda: session)
+    return session
+
+
+def test_requests_to_same_endpoint_are_delivered_together(
+    dispatch_app, enqueued_jobs, session
+):
+    dispatch.dispatch(build_request('first'))
+    dispatch.dispatch(build_request('second'))
+
+    # Only one job to drain the outbox has been enqueued.
+    assert len(enqueued_jobs) == 1
+    func, args = enqueued_jobs[0]
+    assert func == dispatch.drain_outbox
+
+    session.responses = [FakeResponse(204), FakeResponse(204)]
+    func(*args)
+
+    assert session.calls == [
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'second'}),
+    ]
+
+    # A job will be enqueued again for the next request.
+    dispatch.dispatch(build_request('third'))
+    assert len(enqueued_jobs) == 2
+
+
+def test_job_delivers_single_batch(
+    dispatch_app, enqueued_jobs, session, monkeypatch
+):
+    monkeypatch.setattr(dispatch, '_BATCH_SIZE', 1)
+    session.responses = [FakeResponse(204), FakeResponse(204)]
+
+    dispatch.dispatch(build_request('first'))
+    dispatch.dispatch(build_request('second'))
+    func, args = enqueued_jobs[0]
+    func(*args)
+
+    assert session.calls == [(URL, {'content': 'first'})]
+
+    # A follow-up job takes care of the rest.
+    assert enqueued_jobs == [(func, args), (func, args)]
+    func(*args)
+
+    assert session.calls == [
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'second'}),
+    ]
+    assert len(enqueued_jobs) == 2
+
+
+def test_temporary_error_is_retried_by_later_job(
+    dispatch_app, enqueued_jobs, scheduled_jobs, session
+):
+    session.responses = [
+        FakeResponse(503),
+        FakeResponse(429, headers={'Retry-After': '5'}),
+        FakeResponse(204),
+        FakeResponse(204),
+    ]
+
+    dispatch.dispatch(build_request('first'))
+    dispatch.dispatch(build_request('second'))
+    func, args = enqueued_jobs[0]
+    func(*args)
+
+    # Later requests wait for the one to be retried.
+    assert session.calls == [(URL, {'content': 'first'})]
+    assert scheduled_jobs == [(1, func, args)]
+
+    func(*args)
+
+    assert scheduled_jobs == [(1, func, args), (5, func, args)]
+
+    func(*args)
+
+    assert session.calls == [
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'second'}),
+    ]
+    assert len(scheduled_jobs) == 2
+    assert len(enqueued_jobs) == 1
+
+
+def test_retries_are_limited(
+    dispatch_app, enqueued_jobs, scheduled_jobs, session
+):
+    session.responses = [FakeResponse(503)] * 3 + [FakeResponse(204)]
+
+    dispatch.dispatch(build_request('first'))
+    dispatch.dispatch(build_request('second'))
+    func, args = enqueued_jobs[0]
+    func(*args)
+    func(*args)
+
+    # Initial call plus two retries for the first request, then the
+    # second request is delivered nonetheless, and the job fails.
+    with pytest.raises(dispatch.WebhookError):
+        func(*args)
+
+    assert session.calls == [
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'first'}),
+        (URL, {'content': 'second'}),
+    ]
+    assert [delay for delay, _, _ in scheduled_jobs] == [1, 2]
+
+
+def test_unexpected_status_is_not_retried(
+    dispatch_app, enqueued_jobs, scheduled_jobs, session
+):
+    session.responses = [FakeResponse(400)]
+
+    dispatch.dispatch(build_request('hello'))
+    func, args = enqueued_jobs[0]
+
+    with pytest.raises(dispatch.WebhookError):
+        func(*args)
+
+    assert len(session.calls) == 1
+    assert scheduled_jobs == []
+
+
+def test_call_webhook_raises_on_unexpected_status(dispatch_app, session):
+    session.responses = [FakeResponse(200)]
+
+    with pytest.raises(dispatch.WebhookError):
+        dispatch.call_webhook(build_request('hello'))
+
+
+# helpers
+
+
+def build_request(text: str) -> AnnouncementRequest:
+    return AnnouncementRequest(
+        webhook_id=WEBHOOK_ID,
+        url=URL,
+        data={'content': text},
+        expected_response_status_code=HTTPStatus.NO_CONTENT,
+    )
+
+
+class FakeResponse:
+    def __init__(
+        self, status_code: int, *, headers: dict[str, str] | None = None
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.responses: list[FakeResponse] = []
+        self.calls: list[tuple[str, dict]] = []
+
+    def post(self, url, *, json, timeout):
+        self.calls.append((url, json))
+        return self.responses.pop(0)
@@ -0,0 +1,61 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.announce import announce
+from byceps.services.webhooks.models import OutgoingWebhook, WebhookID
+
+from tests.helpers import generate_uuid
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(additional_config={'WEBHOOK_CACHE_TTL': 300})
+
+
+@pytest.fixture()
+def loaded_event_names(monkeypatch) -> list[str]:
+    loaded_event_names = []
+
+    def get_enabled_outgoing_webhooks(event_type):
+        loaded_event_names.append(event_type)
+        return [build_webhook(event_type)]
+
+    monkeypatch.setattr(
+        announce.webhook_service,
+        'get_enabled_outgoing_webhooks',
+        get_enabled_outgoing_webhooks,
+    )
+
+    return loaded_event_names
+
+
+def test_webhooks_are_cached_until_invalidated(cache_app, loaded_event_names):
+    event_name = f'event-{generate_uuid()}'
+
+    webhooks1 = announce._get_webhooks(event_name)
+    webhooks2 = announce._get_webhooks(event_name)
+    assert webhooks1 == webhooks2
+    assert loaded_event_names == [event_name]
+
+    announce.invalidate_webhook_cache()
+
+    announce._get_webhooks(event_name)
+    assert loaded_event_names == [event_name, event_name]
+
+
+def build_webhook(event_type: str) -> OutgoingWebhook:
+    return OutgoingWebhook(
+        id=WebhookID(generate_uuid()),
+        event_types={event_type},
+        event_filters={},
+        format='discord',
+        text_prefix=None,
+        extra_fields={},
+        url='https://webhooks.example/123',
+        description='',
+        enabled=True,
+    )
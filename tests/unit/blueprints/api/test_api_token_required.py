@@ -0,0 +1,71 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from flask import Blueprint
+import pytest
+
+from byceps.blueprints.api.decorators import api_token_required
+from byceps.services.authn.api.models import ApiToken
+from byceps.services.user.models.user import UserID
+
+from tests.helpers import generate_uuid
+
+
+@pytest.fixture()
+def api_token() -> ApiToken:
+    return ApiToken(
+        id=generate_uuid(),
+        created_at=datetime.utcnow(),
+        creator_id=UserID(generate_uuid()),
+        token='api_abc123',
+        permissions=frozenset(),
+        description=None,
+        suspended=False,
+        rate_limit=2,
+    )
+
+
+@pytest.fixture()
+def client(make_redis_app):
+    app = make_redis_app(
+        additional_config={
+            'API_RATE_LIMIT_ENABLED': True,
+            'API_RATE_LIMIT': 60,
+        }
+    )
+
+    blueprint = Blueprint('example', __name__)
+
+    @blueprint.get('/example')
+    @api_token_required
+    def example():
+        return 'ok'
+
+    app.register_blueprint(blueprint)
+
+    return app.test_client()
+
+
+@patch('byceps.services.authn.api.authn_api_service.find_api_token_by_token')
+def test_requests_beyond_rate_limit_are_rejected(find, client, api_token):
+    find.return_value = api_token
+    headers = [('Authorization', f'Bearer {api_token.token}')]
+
+    assert client.get('/example', headers=headers).status_code == 200
+    assert client.get('/example', headers=headers).status_code == 200
+
+    response = client.get('/example', headers=headers)
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '30'
+
+
+def test_request_without_token_is_rejected(client):
+    response = client.get('/example')
+
+    assert response.status_code == 401
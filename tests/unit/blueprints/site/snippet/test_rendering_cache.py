@@ -0,0 +1,133 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from flask import g
+import pytest
+from redis.exceptions import ConnectionError
+
+from byceps.blueprints.site.snippet import rendering_cache
+from byceps.blueprints.site.snippet.templating import render_snippet_as_partial
+from byceps.services.snippet import snippet_service
+from byceps.services.snippet.models import SnippetScope
+
+from tests.helpers import generate_uuid
+
+
+SITE_ID = 'acmecon-2014-website'
+SCOPE = SnippetScope.for_site(SITE_ID)
+
+
+@dataclass(frozen=True)
+class FakeSnippetVersion:
+    id: UUID
+    body: str
+
+
+class FakeSnippetStore(dict):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups: list[str] = []
+
+    def find_current_version(self, scope, name, language_code):
+        self.lookups.append(name)
+        return self.get(name)
+
+
+@pytest.fixture()
+def snippets(monkeypatch) -> FakeSnippetStore:
+    store = FakeSnippetStore()
+
+    monkeypatch.setattr(
+        snippet_service,
+        'find_current_version_of_snippet_with_name',
+        store.find_current_version,
+    )
+
+    return store
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'LOCALE': 'en',
+            'RENDERING_CACHE_BACKEND': 'local',
+            'RENDERING_CACHE_TTL': 60,
+        }
+    )
+
+
+def test_rendered_snippet_is_served_from_cache(cache_app, snippets):
+    snippets['outer'] = create_version('[{{ render_snippet("inner") }}]')
+    snippets['inner'] = create_version('inner v1')
+
+    assert render_in_request(cache_app) == '[inner v1]'
+    assert render_in_request(cache_app) == '[inner v1]'
+
+    # Name lookups only happened for the first rendering.
+    assert snippets.lookups == ['outer', 'inner']
+
+
+def test_update_of_nested_snippet_invalidates_outer_snippet(
+    cache_app, snippets
+):
+    snippets['outer'] = create_version('[{{ render_snippet("inner") }}]')
+    snippets['inner'] = create_version('inner v1')
+
+    assert render_in_request(cache_app) == '[inner v1]'
+
+    snippets['inner'] = create_version('inner v2')
+    with cache_app.test_request_context():
+        rendering_cache.invalidate_snippet_scope(SCOPE)
+
+    assert render_in_request(cache_app) == '[inner v2]'
+
+
+def test_rendering_is_not_cached_if_disabled(make_app, snippets):
+    app = make_app(additional_config={'LOCALE': 'en'})
+    snippets['outer'] = create_version('outer')
+
+    render_in_request(app)
+    render_in_request(app)
+
+    assert snippets.lookups == ['outer', 'outer']
+
+
+def test_redis_tier_failure_is_treated_as_miss(
+    make_redis_app, snippets, monkeypatch
+):
+    app = make_redis_app(
+        additional_config={
+            'LOCALE': 'en',
+            'RENDERING_CACHE_BACKEND': 'redis',
+            'RENDERING_CACHE_TTL': 60,
+        }
+    )
+
+    def fail(*args, **kwargs):
+        raise ConnectionError('Redis went away')
+
+    # Generations can still be read (or have been prefetched).
+    monkeypatch.setattr(app.redis_client, 'get', fail)
+    monkeypatch.setattr(app.redis_client, 'set', fail)
+
+    snippets['outer'] = create_version('outer')
+
+    assert render_in_request(app) == 'outer'
+
+
+def render_in_request(app) -> str:
+    with app.test_request_context():
+        g.site_id = SITE_ID
+        g.user = None
+        g.locales = []
+        return render_snippet_as_partial('outer', 'en')
+
+
+def create_version(body: str) -> FakeSnippetVersion:
+    return FakeSnippetVersion(id=generate_uuid(), body=body)
@@ -0,0 +1,121 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from byceps.services.authn.api import authn_api_rate_limit_service
+from byceps.services.authn.api.models import ApiToken
+from byceps.services.user.models.user import UserID
+
+from tests.helpers import generate_uuid
+
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture()
+def rate_limit_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'API_RATE_LIMIT_ENABLED': True,
+            'API_RATE_LIMIT': 60,
+        }
+    )
+
+
+@pytest.fixture()
+def make_api_token():
+    def _wrapper(*, rate_limit: int | None = None) -> ApiToken:
+        return ApiToken(
+            id=generate_uuid(),
+            created_at=datetime.utcnow(),
+            creator_id=UserID(generate_uuid()),
+            token='api_abc123',
+            permissions=frozenset(),
+            description=None,
+            suspended=False,
+            rate_limit=rate_limit,
+        )
+
+    return _wrapper
+
+
+def test_get_rate_limit_falls_back_to_default(rate_limit_app, make_api_token):
+    assert authn_api_rate_limit_service.get_rate_limit(make_api_token()) == 60
+    assert (
+        authn_api_rate_limit_service.get_rate_limit(
+            make_api_token(rate_limit=6)
+        )
+        == 6
+    )
+
+
+@patch('byceps.services.authn.api.authn_api_rate_limit_service.time')
+def test_requests_beyond_burst_are_throttled(
+    time, rate_limit_app, make_api_token
+):
+    time.return_value = NOW
+    api_token = make_api_token(rate_limit=3)
+
+    retry_afters = [
+        authn_api_rate_limit_service.consume_request(api_token, 'api_v1.user')
+        for _ in range(4)
+    ]
+
+    # Refills one request every 20 seconds.
+    assert retry_afters == [None, None, None, 20]
+
+
+@patch('byceps.services.authn.api.authn_api_rate_limit_service.time')
+def test_bucket_refills_over_time(time, rate_limit_app, make_api_token):
+    api_token = make_api_token(rate_limit=3)
+
+    time.return_value = NOW
+    for _ in range(3):
+        authn_api_rate_limit_service.consume_request(api_token, 'api_v1.user')
+
+    time.return_value = NOW + 5
+    assert (
+        authn_api_rate_limit_service.consume_request(api_token, 'api_v1.user')
+        == 15
+    )
+
+    time.return_value = NOW + 20
+    assert (
+        authn_api_rate_limit_service.consume_request(api_token, 'api_v1.user')
+        is None
+    )
+
+
+@patch('byceps.services.authn.api.authn_api_rate_limit_service.time')
+def test_buckets_are_separate_per_token_and_endpoint_group(
+    time, rate_limit_app, make_api_token
+):
+    time.return_value = NOW
+    api_token1 = make_api_token(rate_limit=1)
+    api_token2 = make_api_token(rate_limit=1)
+
+    consume = authn_api_rate_limit_service.consume_request
+
+    assert consume(api_token1, 'api_v1.user') is None
+    assert consume(api_token1, 'api_v1.user') is not None
+    assert consume(api_token1, 'api_v1.ticketing') is None
+    assert consume(api_token2, 'api_v1.user') is None
+
+
+@patch('byceps.services.authn.api.authn_api_rate_limit_service.time')
+def test_throttled_requests_are_counted(time, rate_limit_app, make_api_token):
+    time.return_value = NOW
+    api_token = make_api_token(rate_limit=1)
+
+    for _ in range(3):
+        authn_api_rate_limit_service.consume_request(api_token, 'api_v1.user')
+
+    assert authn_api_rate_limit_service.get_throttled_request_counts() == {
+        (api_token.id, 'api_v1.user'): 2,
+    }
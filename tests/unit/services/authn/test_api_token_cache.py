@@ -0,0 +1,118 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from byceps.services.authn.api import (
+    authn_api_domain_service,
+    authn_api_request_count_service,
+    authn_api_service,
+)
+from byceps.services.authn.api.models import ApiToken
+from byceps.services.user.models.user import UserID
+
+from tests.helpers import generate_uuid
+
+
+TOKEN = 'api_abc123'
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'API_TOKEN_CACHE_ENABLED': True,
+            'API_TOKEN_CACHE_TTL': 60,
+        }
+    )
+
+
+@pytest.fixture()
+def api_token() -> ApiToken:
+    return ApiToken(
+        id=generate_uuid(),
+        created_at=datetime.utcnow(),
+        creator_id=UserID(generate_uuid()),
+        token=TOKEN,
+        permissions=frozenset(),
+        description=None,
+        suspended=False,
+        rate_limit=None,
+    )
+
+
+@patch(
+    'byceps.services.authn.api.authn_api_service._find_api_token_by_token_hash'
+)
+def test_token_is_looked_up_by_hash_and_cached(find, cache_app, api_token):
+    find.return_value = api_token
+
+    assert authn_api_service.find_api_token_by_token(TOKEN) == api_token
+    assert authn_api_service.find_api_token_by_token(TOKEN) == api_token
+
+    find.assert_called_once_with(authn_api_domain_service.hash_token(TOKEN))
+
+
+@patch(
+    'byceps.services.authn.api.authn_api_service._find_api_token_by_token_hash'
+)
+def test_unknown_token_is_not_cached(find, cache_app):
+    find.return_value = None
+
+    assert authn_api_service.find_api_token_by_token('api_unknown') is None
+    assert authn_api_service.find_api_token_by_token('api_unknown') is None
+
+    assert find.call_count == 2
+
+
+@patch('byceps.services.authn.api.authn_api_service.db')
+@patch(
+    'byceps.services.authn.api.authn_api_service._find_api_token_by_token_hash'
+)
+def test_deletion_invalidates_cached_tokens(find, db, cache_app, api_token):
+    find.return_value = api_token
+
+    authn_api_service.find_api_token_by_token(TOKEN)
+    authn_api_service.delete_api_token(api_token.id)
+    authn_api_service.find_api_token_by_token(TOKEN)
+
+    assert find.call_count == 2
+
+
+@patch(
+    'byceps.services.authn.api.authn_api_service._find_api_token_by_token_hash'
+)
+def test_token_is_not_cached_if_cache_is_disabled(find, make_app, api_token):
+    app = make_app(additional_config={'API_TOKEN_CACHE_ENABLED': False})
+    find.return_value = api_token
+
+    with app.app_context():
+        authn_api_service.find_api_token_by_token(TOKEN)
+        authn_api_service.find_api_token_by_token(TOKEN)
+
+    assert find.call_count == 2
+
+
+def test_request_counts(cache_app):
+    api_token_id1 = generate_uuid()
+    api_token_id2 = generate_uuid()
+
+    authn_api_request_count_service.increment_request_count(api_token_id1)
+    authn_api_request_count_service.increment_request_count(api_token_id2)
+    authn_api_request_count_service.increment_request_count(api_token_id1)
+
+    assert authn_api_request_count_service.get_request_counts() == {
+        api_token_id1: 2,
+        api_token_id2: 1,
+    }
+
+    authn_api_request_count_service.delete_request_count(api_token_id1)
+
+    assert authn_api_request_count_service.get_request_counts() == {
+        api_token_id2: 1,
+    }
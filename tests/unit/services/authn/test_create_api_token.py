@@ -15,9 +15,14 @@ def test_create_api_token():
     permissions = set([PermissionID('do_this'), PermissionID('do_that')])
     num_bytes = 64
     description = 'For this and that'
+    rate_limit = 120
 
     actual = authn_api_domain_service.create_api_token(
-        creator_id, permissions, num_bytes=num_bytes, description=description
+        creator_id,
+        permissions,
+        num_bytes=num_bytes,
+        description=description,
+        rate_limit=rate_limit,
     )
 
     assert actual.id is not None
@@ -27,3 +32,4 @@ def test_create_api_token():
     assert actual.permissions == permissions
     assert actual.description == description
     assert not actual.suspended
+    assert actual.rate_limit == rate_limit
@@ -0,0 +1,22 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from byceps.services.authn.api import authn_api_domain_service
+
+
+def test_hash_token_is_deterministic():
+    token = 'api_abc123'
+
+    actual = authn_api_domain_service.hash_token(token)
+
+    assert actual == authn_api_domain_service.hash_token(token)
+    assert actual != token
+    assert len(actual) == 64
+
+
+def test_hash_token_differs_for_different_tokens():
+    assert authn_api_domain_service.hash_token(
+        'api_abc123'
+    ) != authn_api_domain_service.hash_token('api_abc124')
@@ -0,0 +1,189 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime
+
+from freezegun import freeze_time
+import pytest
+
+from byceps.services.board import board_last_view_service
+from byceps.services.board.models import TopicID
+from byceps.services.user.models.user import UserID
+
+from tests.helpers import generate_uuid
+
+
+USER_ID = UserID(generate_uuid())
+TOPIC_ID_1 = TopicID(generate_uuid())
+TOPIC_ID_2 = TopicID(generate_uuid())
+
+
+@pytest.fixture()
+def scheduled_jobs(monkeypatch) -> list:
+    scheduled_jobs = []
+
+    def enqueue_at(dt, func, *args, **kwargs):
+        scheduled_jobs.append((dt, func))
+
+    monkeypatch.setattr(board_last_view_service, 'enqueue_at', enqueue_at)
+
+    return scheduled_jobs
+
+
+@pytest.fixture()
+def buffering_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'BOARD_TOPIC_VIEWS_WRITE_BEHIND': True,
+            'BOARD_TOPIC_VIEWS_FLUSH_DELAY': 10,
+        }
+    )
+
+
+def test_views_are_buffered_and_flushed_once(buffering_app, scheduled_jobs):
+    with freeze_time('2023-11-04 18:00:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+    with freeze_time('2023-11-04 18:00:05'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_2, USER_ID)
+
+    assert scheduled_jobs == [
+        (
+            datetime(2023, 11, 4, 18, 0, 10),
+            board_last_view_service.flush_buffered_topic_views,
+        )
+    ]
+
+
+def test_latest_buffered_view_is_found(buffering_app, scheduled_jobs):
+    with freeze_time('2023-11-04 18:00:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+    with freeze_time('2023-11-04 18:03:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+    actual = board_last_view_service._find_buffered_topic_views(
+        {TOPIC_ID_1, TOPIC_ID_2}, USER_ID
+    )
+
+    assert actual == {TOPIC_ID_1: datetime(2023, 11, 4, 18, 3, 0)}
+
+
+def test_views_are_kept_if_writing_them_fails(
+    buffering_app, scheduled_jobs, monkeypatch
+):
+    def write_topic_views(buffered_views):
+        raise Exception('database unavailable')
+
+    monkeypatch.setattr(
+        board_last_view_service, '_write_topic_views', write_topic_views
+    )
+
+    with freeze_time('2023-11-04 18:00:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+    with freeze_time('2023-11-04 18:00:10'):
+        with pytest.raises(Exception, match='database unavailable'):
+            board_last_view_service.flush_buffered_topic_views()
+
+    actual = board_last_view_service._find_buffered_topic_views(
+        {TOPIC_ID_1}, USER_ID
+    )
+    assert actual == {TOPIC_ID_1: datetime(2023, 11, 4, 18, 0, 0)}
+
+    # Another flush has been scheduled.
+    assert scheduled_jobs[-1] == (
+        datetime(2023, 11, 4, 18, 0, 20),
+        board_last_view_service.flush_buffered_topic_views,
+    )
+
+
+def test_views_left_over_by_crashed_flush_are_flushed(
+    buffering_app, scheduled_jobs, monkeypatch
+):
+    written_views = []
+
+    def write_topic_views(buffered_views):
+        written_views.append(buffered_views)
+        return len(buffered_views)
+
+    monkeypatch.setattr(
+        board_last_view_service, '_write_topic_views', write_topic_views
+    )
+
+    with freeze_time('2023-11-04 18:00:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_2, USER_ID)
+
+        # Claim the views as a flush would before crashing.
+        assert board_last_view_service._claim_buffered_topic_views()
+
+    with freeze_time('2023-11-04 18:05:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+    # Views that are being flushed are still found.
+    actual = board_last_view_service._find_buffered_topic_views(
+        {TOPIC_ID_1, TOPIC_ID_2}, USER_ID
+    )
+    assert actual == {
+        TOPIC_ID_1: datetime(2023, 11, 4, 18, 5, 0),
+        TOPIC_ID_2: datetime(2023, 11, 4, 18, 0, 0),
+    }
+
+    with freeze_time('2023-11-04 18:15:00'):
+        assert board_last_view_service.flush_buffered_topic_views() == 2
+
+    field_1 = f'{USER_ID}:{TOPIC_ID_1}'.encode()
+    field_2 = f'{USER_ID}:{TOPIC_ID_2}'.encode()
+    assert written_views == [
+        {
+            # The more recent view wins.
+            field_1: b'2023-11-04T18:05:00',
+            field_2: b'2023-11-04T18:00:00',
+        }
+    ]
+
+    assert (
+        board_last_view_service._find_buffered_topic_views(
+            {TOPIC_ID_1, TOPIC_ID_2}, USER_ID
+        )
+        == {}
+    )
+    assert board_last_view_service.flush_buffered_topic_views() == 0
+
+
+def test_overlapping_flushes_handle_their_own_views(
+    buffering_app, scheduled_jobs, monkeypatch
+):
+    written_views = []
+
+    def write_topic_views(buffered_views):
+        written_views.append(buffered_views)
+        return len(buffered_views)
+
+    monkeypatch.setattr(
+        board_last_view_service, '_write_topic_views', write_topic_views
+    )
+
+    with freeze_time('2023-11-04 18:00:00'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_1, USER_ID)
+
+        # Claim the views as a flush would that is still writing them.
+        assert board_last_view_service._claim_buffered_topic_views()
+
+    with freeze_time('2023-11-04 18:00:05'):
+        board_last_view_service.mark_topic_as_just_viewed(TOPIC_ID_2, USER_ID)
+
+    with freeze_time('2023-11-04 18:00:15'):
+        assert board_last_view_service.flush_buffered_topic_views() == 1
+
+    field_2 = f'{USER_ID}:{TOPIC_ID_2}'.encode()
+    assert written_views == [{field_2: b'2023-11-04T18:00:05'}]
+
+    # The views claimed by the other flush are left alone.
+    actual = board_last_view_service._find_buffered_topic_views(
+        {TOPIC_ID_1, TOPIC_ID_2}, USER_ID
+    )
+    assert actual == {TOPIC_ID_1: datetime(2023, 11, 4, 18, 0, 0)}
@@ -62,6 +62,44 @@ def test_get_country_names_contains_no_duplicates(app: Flask):
     assert len(actual) == len(set(actual))
 
 
+def test_find_country_by_name(app: Flask):
+    country = country_service.find_country_by_name('Deutschland')
+
+    assert country == Country(name='Deutschland', alpha2='DE', alpha3='DEU')
+
+
+def test_find_country_by_alpha2(app: Flask):
+    country = country_service.find_country_by_alpha2('at')
+
+    assert country is not None
+    assert country.name == 'Österreich'
+
+
+def test_find_country_by_alpha3(app: Flask):
+    country = country_service.find_country_by_alpha3('AUT')
+
+    assert country is not None
+    assert country.name == 'Österreich'
+
+
+def test_find_unknown_country(app: Flask):
+    assert country_service.find_country_by_name('Atlantis') is None
+    assert country_service.find_country_by_alpha2('XX') is None
+    assert country_service.find_country_by_alpha3('XXX') is None
+
+
+def test_is_country_name(app: Flask):
+    assert country_service.is_country_name('Schweiz')
+    assert not country_service.is_country_name('Atlantis')
+
+
+def test_get_countries_returns_independent_lists(app: Flask):
+    countries = country_service.get_countries()
+    countries.clear()
+
+    assert country_service.get_countries() != []
+
+
 # helpers
 
 
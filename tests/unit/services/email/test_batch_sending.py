@@ -0,0 +1,165 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.email import email_service
+from byceps.services.email.email_service import EmailStats
+from byceps.services.email.models import NameAndAddress
+
+
+SENDER = NameAndAddress('ACME', 'noreply@acme.test')
+
+
+@pytest.fixture()
+def email_app(make_redis_app):
+    return make_redis_app(additional_config={'MAIL_SUPPRESS_SEND': True})
+
+
+@pytest.fixture()
+def enqueued_jobs(monkeypatch) -> list:
+    enqueued_jobs = []
+
+    def enqueue(func, *args, **kwargs):
+        enqueued_jobs.append(func)
+
+    monkeypatch.setattr(email_service, 'enqueue', enqueue)
+
+    return enqueued_jobs
+
+
+@pytest.fixture()
+def scheduled_jobs(monkeypatch) -> list:
+    scheduled_jobs = []
+
+    def enqueue_at(dt, func, *args, **kwargs):
+        scheduled_jobs.append(func)
+
+    monkeypatch.setattr(email_service, 'enqueue_at', enqueue_at)
+
+    return scheduled_jobs
+
+
+@pytest.fixture()
+def sent_emails(monkeypatch) -> list:
+    sent_emails = []
+
+    def send(sender, recipients, subject, body):
+        if subject == 'fail':
+            raise OSError('boom')
+
+        sent_emails.append((sender, recipients, subject, body))
+
+    monkeypatch.setattr(email_service, 'send', send)
+
+    return sent_emails
+
+
+def test_queued_emails_are_sent_by_single_job(
+    email_app, enqueued_jobs, scheduled_jobs, sent_emails
+):
+    email_service.enqueue_email(SENDER, ['a@users.test'], 'first', 'Hi A!')
+    email_service.enqueue_email(SENDER, ['b@users.test'], 'second', 'Hi B!')
+
+    assert enqueued_jobs == [email_service.send_queued_emails]
+    assert email_service.get_stats().queued == 2
+
+    email_service.send_queued_emails()
+
+    assert sent_emails == [
+        ('ACME <noreply@acme.test>', ['a@users.test'], 'first', 'Hi A!'),
+        ('ACME <noreply@acme.test>', ['b@users.test'], 'second', 'Hi B!'),
+    ]
+    assert email_service.get_stats() == EmailStats(
+        queued=0, sent=2, failed=0, smtp_connections=0
+    )
+    assert scheduled_jobs == []
+
+    # The next e-mail requires a new job.
+    email_service.enqueue_email(SENDER, ['c@users.test'], 'third', 'Hi C!')
+    assert len(enqueued_jobs) == 2
+
+
+def test_job_sends_single_batch(
+    email_app, enqueued_jobs, sent_emails, monkeypatch
+):
+    monkeypatch.setattr(email_service, 'BATCH_SIZE', 2)
+
+    for subject in ['first', 'second', 'third']:
+        email_service.enqueue_email(SENDER, ['a@users.test'], subject, 'Hi!')
+
+    email_service.send_queued_emails()
+
+    assert [subject for _, _, subject, _ in sent_emails] == ['first', 'second']
+    assert email_service.get_stats().queued == 1
+
+    # A follow-up job takes care of the rest.
+    assert enqueued_jobs == [
+        email_service.send_queued_emails,
+        email_service.send_queued_emails,
+    ]
+
+    email_service.send_queued_emails()
+
+    assert [subject for _, _, subject, _ in sent_emails] == [
+        'first',
+        'second',
+        'third',
+    ]
+    assert len(enqueued_jobs) == 2
+
+
+def test_failed_email_is_retried_later(
+    email_app, enqueued_jobs, scheduled_jobs, sent_emails
+):
+    email_service.enqueue_email(SENDER, ['a@users.test'], 'fail', 'Hi A!')
+    email_service.enqueue_email(SENDER, ['b@users.test'], 'second', 'Hi B!')
+
+    email_service.send_queued_emails()
+
+    # The remaining e-mail has still been sent.
+    assert sent_emails == [
+        ('ACME <noreply@acme.test>', ['b@users.test'], 'second', 'Hi B!'),
+    ]
+
+    # The failed e-mail is kept, and a delayed job is scheduled.
+    assert email_service.get_stats() == EmailStats(
+        queued=1, sent=1, failed=0, smtp_connections=0
+    )
+    assert scheduled_jobs == [email_service.send_queued_emails]
+
+
+def test_email_is_given_up_after_max_attempts(
+    email_app, enqueued_jobs, scheduled_jobs, sent_emails
+):
+    email_service.enqueue_email(SENDER, ['a@users.test'], 'fail', 'Hi A!')
+
+    for _ in range(email_service.MAX_ATTEMPTS - 1):
+        email_service.send_queued_emails()
+
+    with pytest.raises(email_service.EmailSendingError):
+        email_service.send_queued_emails()
+
+    assert email_service.get_stats() == EmailStats(
+        queued=0, sent=0, failed=1, smtp_connections=0
+    )
+    assert len(scheduled_jobs) == email_service.MAX_ATTEMPTS - 1
+
+
+def test_job_does_not_send_while_another_one_is_draining(
+    email_app, enqueued_jobs, scheduled_jobs, sent_emails
+):
+    email_service.enqueue_email(SENDER, ['a@users.test'], 'first', 'Hi A!')
+
+    # Another job is draining the outbox.
+    other_job_outbox = email_service._get_outbox()
+    assert other_job_outbox.start()
+
+    email_service.send_queued_emails()
+
+    assert sent_emails == []
+    assert email_service.get_stats().queued == 1
+    assert enqueued_jobs == [email_service.send_queued_emails]
+    assert scheduled_jobs == []
@@ -0,0 +1,142 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from email.message import EmailMessage
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+
+import pytest
+
+from byceps.services.email.smtp import PooledSmtpConnection, SmtpConfig
+
+
+CONFIG = SmtpConfig(
+    host='localhost',
+    port=2525,
+    starttls=False,
+    use_ssl=False,
+    username=None,
+    password=None,
+)
+
+
+def test_connection_is_reused():
+    server = FakeSmtpServer()
+    connection = PooledSmtpConnection(CONFIG, connect=server.connect)
+
+    connection.send(build_message('first'))
+    connection.send(build_message('second'))
+
+    assert connection.connect_count == 1
+    assert server.received_subjects == ['first', 'second']
+
+
+def test_reconnect_after_connection_has_been_dropped():
+    server = FakeSmtpServer()
+    connection = PooledSmtpConnection(CONFIG, connect=server.connect)
+
+    connection.send(build_message('first'))
+    server.drop_connections()
+    connection.send(build_message('second'))
+
+    assert connection.connect_count == 2
+    assert server.received_subjects == ['first', 'second']
+
+
+def test_idle_connection_is_probed_before_use():
+    server = FakeSmtpServer()
+    clock = FakeClock()
+    connection = PooledSmtpConnection(
+        CONFIG, connect=server.connect, max_idle_seconds=30, clock=clock
+    )
+
+    connection.send(build_message('first'))
+
+    clock.now += 10
+    connection.send(build_message('second'))
+    assert server.noop_count == 0
+
+    clock.now += 31
+    server.drop_connections()
+    connection.send(build_message('third'))
+    assert server.noop_count == 1
+
+    assert connection.connect_count == 2
+    assert server.received_subjects == ['first', 'second', 'third']
+
+
+def test_message_errors_are_not_retried():
+    server = FakeSmtpServer()
+    connection = PooledSmtpConnection(CONFIG, connect=server.connect)
+
+    with pytest.raises(SMTPRecipientsRefused):
+        connection.send(build_message('refuse'))
+
+    assert connection.connect_count == 1
+
+
+# helpers
+
+
+def build_message(subject: str) -> EmailMessage:
+    message = EmailMessage()
+    message['From'] = 'sender@example.test'
+    message['To'] = 'recipient@example.test'
+    message['Subject'] = subject
+    message.set_content('Hi!')
+    return message
+
+
+class FakeSmtpServer:
+    def __init__(self) -> None:
+        self.received_subjects: list[str] = []
+        self.noop_count = 0
+        self._connections: list[FakeSmtp] = []
+
+    def connect(self, config: SmtpConfig):
+        smtp = FakeSmtp(self)
+        self._connections.append(smtp)
+        return smtp
+
+    def drop_connections(self) -> None:
+        for smtp in self._connections:
+            smtp.connected = False
+
+
+class FakeSmtp:
+    def __init__(self, server: FakeSmtpServer) -> None:
+        self.server = server
+        self.connected = True
+
+    def send_message(self, message: EmailMessage) -> None:
+        self._ensure_connected()
+
+        if message['Subject'] == 'refuse':
+            raise SMTPRecipientsRefused({})
+
+        self.server.received_subjects.append(message['Subject'])
+
+    def noop(self) -> tuple[int, bytes]:
+        self.server.noop_count += 1
+        self._ensure_connected()
+        return 250, b'OK'
+
+    def quit(self) -> None:
+        self._ensure_connected()
+        self.connected = False
+
+    def close(self) -> None:
+        self.connected = False
+
+    def _ensure_connected(self) -> None:
+        if not self.connected:
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,98 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from byceps.services.party.models import PartyID
+from byceps.services.party_stats import party_stats_snapshot_service
+from byceps.services.party_stats.dbmodels import DbPartyStatsSnapshot
+
+
+@pytest.fixture()
+def snapshot_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'PARTY_STATS_SNAPSHOTS_ENABLED': True,
+            'PARTY_STATS_SNAPSHOTS_MAX_AGE': 300,
+            'PARTY_STATS_SNAPSHOTS_REFRESH_DELAY': 10,
+            'PARTY_STATS_SNAPSHOTS_REFRESH_INTERVAL': 60,
+        }
+    )
+
+
+@patch('byceps.services.party_stats.party_stats_snapshot_service.enqueue_at')
+def test_pending_refresh_is_scheduled_only_once(enqueue_at_mock, snapshot_app):
+    party_stats_snapshot_service.schedule_refresh()
+    party_stats_snapshot_service.schedule_refresh()
+
+    assert enqueue_at_mock.call_count == 1
+
+
+@patch('byceps.services.party_stats.party_stats_snapshot_service.enqueue_at')
+def test_refresh_can_be_scheduled_again_after_refresh(
+    enqueue_at_mock, snapshot_app
+):
+    party_stats_snapshot_service.schedule_refresh()
+
+    with patch(
+        'byceps.services.party_stats.party_stats_snapshot_service._refresh_active_snapshots'
+    ):
+        party_stats_snapshot_service.refresh_snapshots()
+
+    party_stats_snapshot_service.schedule_refresh()
+
+    assert enqueue_at_mock.call_count == 2
+
+
+@patch('byceps.services.party_stats.party_stats_snapshot_service.enqueue_at')
+def test_refresh_is_not_scheduled_if_disabled(enqueue_at_mock, make_redis_app):
+    make_redis_app(additional_config={'PARTY_STATS_SNAPSHOTS_ENABLED': False})
+
+    party_stats_snapshot_service.schedule_refresh()
+    party_stats_snapshot_service.schedule_periodic_refresh()
+
+    enqueue_at_mock.assert_not_called()
+
+
+@patch(
+    'byceps.services.party_stats.party_stats_snapshot_service._find_snapshots'
+)
+def test_only_missing_and_outdated_snapshots_are_refreshed(
+    find_snapshots_mock, snapshot_app
+):
+    now = datetime.utcnow()
+    current_party_id = PartyID('current')
+    outdated_party_id = PartyID('outdated')
+    missing_party_id = PartyID('missing')
+
+    find_snapshots_mock.side_effect = [
+        {
+            current_party_id: {'computed_at': now - timedelta(seconds=10)},
+            outdated_party_id: {'computed_at': now - timedelta(seconds=600)},
+        },
+        {
+            outdated_party_id: {'computed_at': now},
+            missing_party_id: {'computed_at': now},
+        },
+    ]
+    refresh_mock = Mock()
+
+    snapshots = party_stats_snapshot_service._get_current_snapshots(
+        DbPartyStatsSnapshot.__table__,
+        'party_id',
+        {current_party_id, outdated_party_id, missing_party_id},
+        refresh_mock,
+    )
+
+    refresh_mock.assert_called_once_with({outdated_party_id, missing_party_id})
+    assert snapshots.keys() == {
+        current_party_id,
+        outdated_party_id,
+        missing_party_id,
+    }
+    assert snapshots[outdated_party_id]['computed_at'] == now
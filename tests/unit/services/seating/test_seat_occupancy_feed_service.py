@@ -0,0 +1,114 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import json
+
+import pytest
+
+from byceps.services.seating import seat_occupancy_feed_service
+from byceps.services.seating.models import SeatID, SeatingAreaID, SeatOccupancy
+from byceps.services.ticketing.models.ticket import TicketID
+
+from tests.helpers import generate_uuid
+
+
+KEEPALIVE = ': keep-alive\n\n'
+
+
+@pytest.fixture()
+def feed_app(make_redis_app):
+    return make_redis_app(
+        additional_config={'SEATING_PLAN_LIVE_UPDATES_ENABLED': True}
+    )
+
+
+@pytest.fixture()
+def area_id() -> SeatingAreaID:
+    return SeatingAreaID(generate_uuid())
+
+
+def test_resync_is_requested_if_version_is_outdated(feed_app, area_id):
+    events = seat_occupancy_feed_service.stream_events(
+        area_id, '0.1', lambda: '0.2'
+    )
+
+    assert next(events).startswith('retry: ')
+    assert next(events) == 'event: resync\nid: 0.2\ndata: {}\n\n'
+    assert next(events) == KEEPALIVE
+
+    events.close()
+
+
+def test_no_resync_is_requested_if_version_is_current(feed_app, area_id):
+    events = seat_occupancy_feed_service.stream_events(
+        area_id, '0.2', lambda: '0.2'
+    )
+
+    assert next(events).startswith('retry: ')
+    assert next(events) == KEEPALIVE
+
+    events.close()
+
+
+def test_published_changes_are_streamed(feed_app, area_id):
+    occupied_seat_id = SeatID(generate_uuid())
+    released_seat_id = SeatID(generate_uuid())
+    ticket_id = TicketID(generate_uuid())
+
+    events = seat_occupancy_feed_service.stream_events(
+        area_id, None, lambda: None
+    )
+    next(events)  # Subscribe.
+
+    seat_occupancy_feed_service.publish_occupancy_changes(
+        area_id,
+        '0.3',
+        {
+            occupied_seat_id: SeatOccupancy(
+                ticket_id=ticket_id,
+                occupier_screen_name='Seatwarmer',
+                occupier_avatar_url=None,
+            ),
+            released_seat_id: None,
+        },
+    )
+
+    event = next(events)
+
+    events.close()
+
+    header, data_line = event.rstrip('\n').rsplit('\n', 1)
+    assert header == 'event: occupancy\nid: 0.3'
+    assert json.loads(data_line.removeprefix('data: ')) == [
+        {
+            'seat_id': str(occupied_seat_id),
+            'ticket_id': str(ticket_id),
+            'occupier_screen_name': 'Seatwarmer',
+            'occupier_avatar_url': None,
+        },
+        {
+            'seat_id': str(released_seat_id),
+            'ticket_id': None,
+            'occupier_screen_name': None,
+            'occupier_avatar_url': None,
+        },
+    ]
+
+
+def test_changes_in_other_areas_are_not_streamed(feed_app, area_id):
+    other_area_id = SeatingAreaID(generate_uuid())
+
+    events = seat_occupancy_feed_service.stream_events(
+        area_id, None, lambda: None
+    )
+    next(events)  # Subscribe.
+
+    seat_occupancy_feed_service.publish_occupancy_changes(
+        other_area_id, '0.1', {SeatID(generate_uuid()): None}
+    )
+
+    assert next(events) == KEEPALIVE
+
+    events.close()
@@ -0,0 +1,125 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from byceps.services.seating import seat_plan_service
+from byceps.services.seating.models import SeatingAreaID
+
+from tests.helpers import generate_uuid
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'SEATING_PLAN_CACHE_ENABLED': True,
+            'SEATING_PLAN_CACHE_TTL': 300,
+        }
+    )
+
+
+@pytest.fixture()
+def area_id() -> SeatingAreaID:
+    return SeatingAreaID(generate_uuid())
+
+
+@patch('byceps.services.seating.seat_plan_service._load_occupancies')
+@patch('byceps.services.seating.seat_plan_service._load_seats')
+def test_seat_plan_is_cached(
+    load_seats_mock, load_occupancies_mock, cache_app, area_id
+):
+    load_seats_mock.return_value = []
+    load_occupancies_mock.return_value = {}
+
+    seat_plan1 = seat_plan_service.get_seat_plan(area_id)
+    seat_plan2 = seat_plan_service.get_seat_plan(area_id)
+
+    assert seat_plan1 == seat_plan2
+    assert seat_plan1.version == seat_plan_service.get_seat_plan_version(
+        area_id
+    )
+    assert load_seats_mock.call_count == 1
+    assert load_occupancies_mock.call_count == 1
+
+
+@patch('byceps.services.seating.seat_plan_service._load_occupancies')
+@patch('byceps.services.seating.seat_plan_service._load_seats')
+def test_invalidated_occupancies_are_reloaded(
+    load_seats_mock, load_occupancies_mock, cache_app, area_id
+):
+    load_seats_mock.return_value = []
+    load_occupancies_mock.return_value = {}
+
+    other_area_id = SeatingAreaID(generate_uuid())
+
+    version_before = seat_plan_service.get_seat_plan(area_id).version
+    other_version_before = seat_plan_service.get_seat_plan_version(
+        other_area_id
+    )
+
+    seat_plan_service.invalidate_occupancies([area_id])
+
+    version_after = seat_plan_service.get_seat_plan(area_id).version
+
+    assert version_after != version_before
+    assert (
+        seat_plan_service.get_seat_plan_version(other_area_id)
+        == other_version_before
+    )
+    assert load_seats_mock.call_count == 1
+    assert load_occupancies_mock.call_count == 2
+
+
+@patch('byceps.services.seating.seat_plan_service._load_occupancies')
+@patch('byceps.services.seating.seat_plan_service._load_seats')
+def test_seat_plan_is_loaded_every_time_if_disabled(
+    load_seats_mock, load_occupancies_mock, make_app, area_id
+):
+    load_seats_mock.return_value = []
+    load_occupancies_mock.return_value = {}
+
+    app = make_app(
+        additional_config={
+            'SEATING_PLAN_CACHE_ENABLED': False,
+            'SEATING_PLAN_LIVE_UPDATES_ENABLED': False,
+        }
+    )
+    with app.app_context():
+        seat_plan_service.get_seat_plan(area_id)
+        seat_plan = seat_plan_service.get_seat_plan(area_id)
+
+        assert seat_plan.version is None
+        assert seat_plan_service.get_seat_plan_version(area_id) is None
+
+    assert load_seats_mock.call_count == 2
+    assert load_occupancies_mock.call_count == 2
+
+
+@patch('byceps.services.seating.seat_plan_service._load_occupancies')
+@patch('byceps.services.seating.seat_plan_service._load_seats')
+def test_version_is_maintained_for_live_updates_without_cache(
+    load_seats_mock, load_occupancies_mock, make_redis_app, area_id
+):
+    make_redis_app(
+        additional_config={
+            'SEATING_PLAN_CACHE_ENABLED': False,
+            'SEATING_PLAN_LIVE_UPDATES_ENABLED': True,
+        }
+    )
+
+    load_seats_mock.return_value = []
+    load_occupancies_mock.return_value = {}
+
+    version_before = seat_plan_service.get_seat_plan(area_id).version
+
+    seat_plan_service.invalidate_occupancies([area_id])
+
+    version_after = seat_plan_service.get_seat_plan_version(area_id)
+
+    assert version_before is not None
+    assert version_after != version_before
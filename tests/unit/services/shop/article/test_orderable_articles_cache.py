@@ -0,0 +1,74 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.shop.article import orderable_articles_cache
+from byceps.services.shop.shop.models import ShopID
+
+from tests.helpers import generate_token
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'SHOP_ARTICLE_CACHE_ENABLED': True,
+            'SHOP_ARTICLE_CACHE_TTL': 300,
+        }
+    )
+
+
+@pytest.fixture()
+def loads() -> list[ShopID]:
+    return []
+
+
+@pytest.fixture()
+def make_loader(loads):
+    def _wrapper(shop_id: ShopID):
+        def load():
+            loads.append(shop_id)
+            return len(loads)
+
+        return load
+
+    return _wrapper
+
+
+def test_value_is_cached(cache_app, make_loader, loads):
+    shop_id = ShopID(generate_token())
+    load = make_loader(shop_id)
+
+    assert orderable_articles_cache.get_or_load(shop_id, load) == 1
+    assert orderable_articles_cache.get_or_load(shop_id, load) == 1
+    assert loads == [shop_id]
+
+
+def test_invalidation_is_per_shop(cache_app, make_loader, loads):
+    shop1_id = ShopID(generate_token())
+    shop2_id = ShopID(generate_token())
+
+    orderable_articles_cache.get_or_load(shop1_id, make_loader(shop1_id))
+    orderable_articles_cache.get_or_load(shop2_id, make_loader(shop2_id))
+
+    orderable_articles_cache.invalidate(shop1_id)
+
+    orderable_articles_cache.get_or_load(shop1_id, make_loader(shop1_id))
+    orderable_articles_cache.get_or_load(shop2_id, make_loader(shop2_id))
+
+    assert loads == [shop1_id, shop2_id, shop1_id]
+
+
+def test_value_is_loaded_every_time_if_disabled(make_app, make_loader, loads):
+    shop_id = ShopID(generate_token())
+    load = make_loader(shop_id)
+
+    app = make_app(additional_config={'SHOP_ARTICLE_CACHE_ENABLED': False})
+    with app.app_context():
+        orderable_articles_cache.get_or_load(shop_id, load)
+        orderable_articles_cache.get_or_load(shop_id, load)
+
+    assert loads == [shop_id, shop_id]
@@ -0,0 +1,98 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.shop.storefront import storefront_admission_service
+from byceps.services.shop.storefront.models import (
+    StorefrontAdmission,
+    StorefrontID,
+)
+from byceps.services.user.models.user import UserID
+
+from tests.helpers import generate_uuid
+
+
+STOREFRONT_ID = StorefrontID('acme-2023')
+
+NOW = 1_700_000_000.0
+
+ADMITTED = StorefrontAdmission(admitted=True, queue_position=None)
+
+
+@pytest.fixture()
+def admission_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'SHOP_ORDER_ADMISSION_LIMIT': 2,
+            'SHOP_ORDER_ADMISSION_TTL': 600,
+        }
+    )
+
+
+@pytest.fixture()
+def user_ids() -> list[UserID]:
+    return [UserID(generate_uuid()) for _ in range(4)]
+
+
+def test_everybody_is_admitted_if_disabled(make_app, user_ids):
+    app = make_app(additional_config={'SHOP_ORDER_ADMISSION_LIMIT': None})
+    with app.app_context():
+        for user_id in user_ids:
+            assert get_admission(user_id) == ADMITTED
+
+
+def test_users_beyond_limit_wait_in_line(admission_app, user_ids):
+    admissions = [get_admission(user_id) for user_id in user_ids]
+
+    assert admissions == [
+        ADMITTED,
+        ADMITTED,
+        waiting(1),
+        waiting(2),
+    ]
+
+
+def test_released_slot_is_given_to_next_in_line(admission_app, user_ids):
+    for user_id in user_ids:
+        get_admission(user_id)
+
+    storefront_admission_service.release_admission(STOREFRONT_ID, user_ids[0])
+
+    assert get_admission(user_ids[3], now=NOW + 1) == waiting(1)
+    assert get_admission(user_ids[2], now=NOW + 1) == ADMITTED
+    assert get_admission(user_ids[3], now=NOW + 2) == waiting(1)
+
+
+def test_expired_slot_is_given_to_next_in_line(admission_app, user_ids):
+    for user_id in user_ids[:3]:
+        get_admission(user_id)
+
+    # Keep waiting.
+    assert get_admission(user_ids[2], now=NOW + 30) == waiting(1)
+
+    assert get_admission(user_ids[2], now=NOW + 601) == ADMITTED
+
+
+def test_users_that_stopped_waiting_are_skipped(admission_app, user_ids):
+    for user_id in user_ids:
+        get_admission(user_id)
+
+    storefront_admission_service.release_admission(STOREFRONT_ID, user_ids[0])
+
+    # The user third in line has not checked their position for too
+    # long, but the fourth one has.
+    assert get_admission(user_ids[3], now=NOW + 120) == ADMITTED
+    assert get_admission(user_ids[2], now=NOW + 121) == waiting(1)
+
+
+def get_admission(user_id: UserID, *, now: float = NOW) -> StorefrontAdmission:
+    return storefront_admission_service.get_admission(
+        STOREFRONT_ID, user_id, now=now
+    )
+
+
+def waiting(queue_position: int) -> StorefrontAdmission:
+    return StorefrontAdmission(admitted=False, queue_position=queue_position)
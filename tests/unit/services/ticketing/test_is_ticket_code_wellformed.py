@@ -12,13 +12,15 @@ from byceps.services.ticketing import ticket_code_service
 @pytest.mark.parametrize(
     ('code', 'expected'),
     [
-        ('ZWXL'  , False),  # denied: too short
-        ('zwxln' , False),  # denied: not all-uppercase
-        ('ZWXLN' , True ),  # okay
-        ('ZW2LN' , True ),  # okay: numbers are fine (but can be hard to distinguish)
-        ('ZAXLN' , True ),  # okay (even though vowels are not in alphabet; all uppercase ASCII letters are fine)
-        ('ZÄXLN' , False),  # denied: umlaut is not in alphabet
-        ('ZWXLNG', False),  # denied: too long
+        ('ZWXL'     , False),  # denied: too short
+        ('zwxln'    , False),  # denied: not all-uppercase
+        ('ZWXLN'    , True ),  # okay
+        ('ZW2LN'    , True ),  # okay: numbers are fine (but can be hard to distinguish)
+        ('ZAXLN'    , True ),  # okay (even though vowels are not in alphabet; all uppercase ASCII letters are fine)
+        ('ZÄXLN'    , False),  # denied: umlaut is not in alphabet
+        ('ZWXLNG'   , True ),  # okay: longer codes are issued once short ones get scarce
+        ('ZWXLNGBC' , True ),  # okay: maximum length
+        ('ZWXLNGBCD', False),  # denied: too long
     ],
 )
 # fmt: on
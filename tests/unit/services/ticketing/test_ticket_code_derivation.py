@@ -0,0 +1,50 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.services.ticketing import ticket_code_service
+
+
+KEY = b'secret-key-for-tests'
+
+
+def test_derived_codes_are_unique():
+    code_length = 3
+    capacity = 21**code_length
+
+    codes = {
+        ticket_code_service.derive_ticket_code(index, code_length, KEY)
+        for index in range(capacity)
+    }
+
+    assert len(codes) == capacity
+
+
+def test_derived_codes_are_wellformed():
+    for index in range(100):
+        code = ticket_code_service.derive_ticket_code(index, 6, KEY)
+
+        assert len(code) == 6
+        assert ticket_code_service.is_ticket_code_wellformed(code)
+
+
+def test_derived_codes_depend_on_key():
+    codes1 = [
+        ticket_code_service.derive_ticket_code(index, 5, b'key1')
+        for index in range(10)
+    ]
+    codes2 = [
+        ticket_code_service.derive_ticket_code(index, 5, b'key2')
+        for index in range(10)
+    ]
+
+    assert codes1 != codes2
+
+
+@pytest.mark.parametrize('index', [-1, 21**5])
+def test_index_out_of_range_is_rejected(index):
+    with pytest.raises(ValueError):
+        ticket_code_service.derive_ticket_code(index, 5, KEY)
@@ -0,0 +1,29 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from unittest.mock import patch
+
+from byceps.services.ticketing import ticket_code_service
+
+
+def test_generate_ticket_codes():
+    codes = ticket_code_service.generate_ticket_codes(10).unwrap()
+
+    assert len(codes) == 10
+    assert all(
+        ticket_code_service.is_ticket_code_wellformed(code) for code in codes
+    )
+
+
+@patch('byceps.services.ticketing.ticket_code_service._generate_ticket_code')
+def test_generate_ticket_codes_skips_excluded_codes(generate_ticket_code_mock):
+    codes = iter(['XCLDD', 'ACCPT'])
+    generate_ticket_code_mock.side_effect = lambda: next(codes)
+
+    actual = ticket_code_service.generate_ticket_codes(
+        1, excluded_codes={'XCLDD'}
+    )
+
+    assert actual.unwrap() == {'ACCPT'}
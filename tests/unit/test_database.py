@@ -0,0 +1,53 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy.dialects import postgresql
+
+from byceps.database import insert_ignore_many_on_conflict
+from byceps.services.global_setting.dbmodels import DbGlobalSetting
+
+
+TABLE = DbGlobalSetting.__table__
+
+
+@patch('byceps.database.BULK_CHUNK_SIZE', 2)
+@patch('byceps.database.db')
+def test_insert_ignore_many_on_conflict_inserts_deduplicated_chunks(db_mock):
+    insert_ignore_many_on_conflict(
+        TABLE,
+        [
+            {'name': 'one', 'value': '1'},
+            {'name': 'two', 'value': '2'},
+            {'name': 'one', 'value': 'repeated'},
+            {'name': 'three', 'value': '3'},
+        ],
+    )
+
+    queries = [call.args[0] for call in db_mock.session.execute.call_args_list]
+    assert len(queries) == 2
+    assert [get_params(query) for query in queries] == [
+        {
+            'name_m0': 'one',
+            'value_m0': '1',
+            'name_m1': 'two',
+            'value_m1': '2',
+        },
+        {'name_m0': 'three', 'value_m0': '3'},
+    ]
+    assert all(
+        compile(query).endswith('ON CONFLICT (name) DO NOTHING')
+        for query in queries
+    )
+    db_mock.session.commit.assert_called_once_with()
+
+
+def compile(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def get_params(query):
+    return query.compile(dialect=postgresql.dialect()).params
@@ -0,0 +1,38 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.util.iterables import chunk
+
+
+@pytest.mark.parametrize(
+    ('iterable', 'size', 'expected'),
+    [
+        (
+            [],
+            2,
+            [],
+        ),
+        (
+            ['a', 'b', 'c', 'd'],
+            2,
+            [['a', 'b'], ['c', 'd']],
+        ),
+        (
+            range(5),
+            2,
+            [[0, 1], [2, 3], [4]],
+        ),
+        (
+            iter(range(3)),
+            10,
+            [[0, 1, 2]],
+        ),
+    ],
+)
+def test_chunk(iterable, size, expected):
+    actual = chunk(iterable, size)
+    assert list(actual) == expected
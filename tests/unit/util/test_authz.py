@@ -0,0 +1,111 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from unittest.mock import patch
+
+from flask import g
+import pytest
+
+from byceps.services.authz.models import PermissionID
+from byceps.util.authz import (
+    has_all_permissions,
+    has_any_permission,
+    has_current_user_all_permissions,
+    has_current_user_any_permission,
+    has_current_user_permission,
+    PermissionRegistry,
+)
+
+
+@pytest.fixture()
+def registry() -> PermissionRegistry:
+    registry = PermissionRegistry()
+    for permission_id in ['news.create', 'board.hide', 'board.announce']:
+        registry.register_permission(PermissionID(permission_id), '')
+    registry.assign_indexes()
+    return registry
+
+
+def test_indexes_follow_permission_id_order(registry):
+    assert registry.get_bit('board.announce') == 0b001
+    assert registry.get_bit('board.hide') == 0b010
+    assert registry.get_bit('news.create') == 0b100
+
+
+def test_unregistered_permissions_have_no_bit(registry):
+    assert registry.get_bit('board.delete') == 0
+
+
+def test_build_mask_ignores_unregistered_permissions(registry):
+    assert registry.build_mask(['news.create', 'board.delete']) == 0b100
+
+
+def test_find_mask(registry):
+    assert registry.find_mask(['news.create', 'board.hide']) == 0b110
+    assert registry.find_mask(['news.create', 'board.delete']) is None
+
+
+def test_registering_a_permission_reassigns_indexes(registry):
+    registry.register_permission(PermissionID('board.create'), '')
+
+    assert registry.get_bit('board.announce') == 0b0001
+    assert registry.get_bit('board.create') == 0b0010
+    assert registry.get_bit('news.create') == 0b1000
+
+
+@pytest.mark.parametrize(
+    ('mask', 'required_mask', 'expected_any', 'expected_all'),
+    [
+        (0b000, 0b011, False, False),
+        (0b001, 0b011, True, False),
+        (0b111, 0b011, True, True),
+        (0b111, 0b000, False, True),
+    ],
+)
+def test_has_any_and_all_permissions(
+    mask, required_mask, expected_any, expected_all
+):
+    assert has_any_permission(mask, required_mask) == expected_any
+    assert has_all_permissions(mask, required_mask) == expected_all
+
+
+class CurrentUserStub:
+    def __init__(self, permissions: frozenset[str]) -> None:
+        self.permissions = permissions
+
+
+def test_current_user_permission_checks(make_app, registry):
+    app = make_app()
+    with (
+        app.test_request_context(),
+        patch('byceps.util.authz.permission_registry', registry),
+    ):
+        g.user = CurrentUserStub(frozenset({'board.hide', 'news.create'}))
+
+        assert has_current_user_permission('board.hide')
+        assert not has_current_user_permission('board.announce')
+        assert not has_current_user_permission('board.delete')
+
+        assert has_current_user_any_permission('board.announce', 'board.hide')
+        assert not has_current_user_any_permission('board.announce')
+
+        assert has_current_user_all_permissions('board.hide', 'news.create')
+        assert not has_current_user_all_permissions(
+            'board.hide', 'board.announce'
+        )
+        assert not has_current_user_all_permissions('board.delete')
+
+
+def test_current_user_permission_mask_follows_current_user(make_app, registry):
+    app = make_app()
+    with (
+        app.test_request_context(),
+        patch('byceps.util.authz.permission_registry', registry),
+    ):
+        g.user = CurrentUserStub(frozenset({'board.hide'}))
+        assert has_current_user_permission('board.hide')
+
+        g.user = CurrentUserStub(frozenset())
+        assert not has_current_user_permission('board.hide')
@@ -0,0 +1,226 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from byceps.util.cache import (
+    CacheStats,
+    GenerationalCache,
+    LocalCache,
+    RedisCache,
+)
+
+
+def test_get_unknown_key_returns_default():
+    cache = LocalCache(maxsize=10)
+
+    assert cache.get('unknown') is None
+    assert cache.get('unknown', 'default') == 'default'
+
+
+def test_set_and_get():
+    cache = LocalCache(maxsize=10)
+
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    assert 'key' in cache
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = LocalCache(maxsize=10, ttl=30, clock=clock)
+
+    cache.set('key', 'value')
+
+    clock.advance(29)
+    assert cache.get('key') == 'value'
+
+    clock.advance(1)
+    assert cache.get('key') is None
+    assert len(cache) == 0
+
+
+def test_entry_specific_ttl_overrides_default():
+    clock = FakeClock()
+    cache = LocalCache(maxsize=10, ttl=30, clock=clock)
+
+    cache.set('key', 'value', ttl=5)
+
+    clock.advance(5)
+    assert cache.get('key') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LocalCache(maxsize=2)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # Mark as recently used.
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_get_or_set_loads_only_once():
+    cache = LocalCache(maxsize=10)
+    calls = []
+
+    def load():
+        calls.append(True)
+        return 'value'
+
+    assert cache.get_or_set('key', load) == 'value'
+    assert cache.get_or_set('key', load) == 'value'
+    assert len(calls) == 1
+
+
+def test_delete_and_clear():
+    cache = LocalCache(maxsize=10)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.delete('a')
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_stats():
+    cache = LocalCache(maxsize=10)
+
+    cache.set('key', 'value')
+    cache.get('key')
+    cache.get('key')
+    cache.get('unknown')
+
+    assert cache.get_stats() == CacheStats(hits=2, misses=1, size=1)
+
+
+@pytest.fixture()
+def generational_cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'EXAMPLE_CACHE_ENABLED': True,
+            'EXAMPLE_CACHE_TTL': 300,
+        }
+    )
+
+
+@pytest.fixture()
+def generational_cache():
+    return GenerationalCache(
+        'example',
+        'byceps:example:generation',
+        maxsize=10,
+        ttl_config_key='EXAMPLE_CACHE_TTL',
+        enabled_config_key='EXAMPLE_CACHE_ENABLED',
+    )
+
+
+def test_generational_cache_reloads_after_invalidation(
+    generational_cache_app, generational_cache
+):
+    loads = []
+
+    def load():
+        loads.append(True)
+        return len(loads)
+
+    assert generational_cache.get_or_load('key', ['ns'], load) == 1
+    assert generational_cache.get_or_load('key', ['ns'], load) == 1
+
+    generational_cache.invalidate('other-ns')
+    assert generational_cache.get_or_load('key', ['ns'], load) == 1
+
+    generational_cache.invalidate('ns')
+    assert generational_cache.get_or_load('key', ['ns'], load) == 2
+
+
+def test_generational_cache_skips_none_if_requested(
+    generational_cache_app, generational_cache
+):
+    loads = []
+
+    def load():
+        loads.append(True)
+        return None
+
+    generational_cache.get_or_load('key', ['ns'], load, cache_none=False)
+    generational_cache.get_or_load('key', ['ns'], load, cache_none=False)
+    assert len(loads) == 2
+
+    generational_cache.get_or_load('key', ['ns'], load)
+    generational_cache.get_or_load('key', ['ns'], load)
+    assert len(loads) == 3
+
+
+def test_generational_cache_loads_if_disabled(
+    generational_cache_app, generational_cache
+):
+    generational_cache_app.config['EXAMPLE_CACHE_ENABLED'] = False
+
+    assert generational_cache.get_or_load('key', ['ns'], lambda: 1) == 1
+    assert generational_cache.get_or_load('key', ['ns'], lambda: 2) == 2
+
+
+def test_generational_cache_tolerates_redis_failure(
+    generational_cache_app, generational_cache, monkeypatch
+):
+    def fail(*args, **kwargs):
+        raise ConnectionError('Redis went away')
+
+    monkeypatch.setattr(generational_cache_app.redis_client, 'mget', fail)
+    monkeypatch.setattr(generational_cache_app.redis_client, 'pipeline', fail)
+
+    assert generational_cache.get_generations(['ns']) is None
+    assert generational_cache.get_or_load('key', ['ns'], lambda: 1) == 1
+    assert generational_cache.get_or_load('key', ['ns'], lambda: 2) == 2
+
+    # Must not raise.
+    generational_cache.invalidate('ns')
+
+
+def test_generational_cache_shares_entries_via_redis_tier(
+    generational_cache_app,
+):
+    def create_cache() -> GenerationalCache:
+        return GenerationalCache(
+            'example',
+            'byceps:example:generation',
+            maxsize=10,
+            ttl_config_key='EXAMPLE_CACHE_TTL',
+            get_redis_cache=lambda: RedisCache(
+                generational_cache_app.redis_client, 'byceps:example', 300
+            ),
+        )
+
+    # Two caches stand in for two application processes.
+    cache1 = create_cache()
+    cache2 = create_cache()
+
+    assert cache1.get_or_load('key', ['ns'], lambda: 1) == 1
+    assert cache2.get_or_load('key', ['ns'], lambda: 2) == 1
+
+    cache1.invalidate('ns')
+    assert cache2.get_or_load('key', ['ns'], lambda: 3) == 3
+    assert cache1.get_or_load('key', ['ns'], lambda: 4) == 3
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def __call__(self) -> float:
+        return self.now
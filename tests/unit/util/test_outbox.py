@@ -0,0 +1,143 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+import pytest
+
+from byceps.util.outbox import Outbox
+
+
+KEY = 'test:outbox'
+
+
+@pytest.fixture()
+def app(make_redis_app):
+    return make_redis_app()
+
+
+@pytest.fixture()
+def outbox(app):
+    return Outbox(KEY)
+
+
+def test_only_first_push_requires_job(outbox):
+    assert outbox.push('a')
+    assert not outbox.push('b')
+    assert len(outbox) == 2
+
+
+def test_batches_are_claimed_oldest_first(outbox):
+    for item in ['a', 'b', 'c']:
+        outbox.push(item)
+
+    assert outbox.claim_batch(2) == [b'a', b'b']
+
+
+def test_unacknowledged_items_are_claimed_again(outbox):
+    for item in ['a', 'b', 'c']:
+        outbox.push(item)
+
+    outbox.claim_batch(2)
+    outbox.acknowledge()
+    # The job stops (or crashes) before acknowledging 'b'.
+
+    assert outbox.claim_batch(2) == [b'b', b'c']
+    assert len(outbox) == 2
+
+
+def test_replaced_item_is_claimed_again(outbox):
+    outbox.push('a')
+    outbox.push('b')
+
+    outbox.claim_batch(2)
+    outbox.replace_oldest_claimed('a2')
+
+    assert outbox.claim_batch(2) == [b'a2', b'b']
+
+
+def test_requeued_item_is_claimed_after_waiting_items(outbox):
+    outbox.push('a')
+    outbox.push('b')
+
+    outbox.claim_batch(1)
+    outbox.requeue('a')
+    outbox.acknowledge()
+
+    assert outbox.claim_batch(2) == [b'b', b'a']
+
+
+def test_release_requires_follow_up_job_if_items_are_left(outbox):
+    outbox.push('a')
+    outbox.push('b')
+
+    outbox.start()
+    outbox.claim_batch(1)
+    outbox.acknowledge()
+
+    assert outbox.release()
+
+
+def test_release_of_empty_outbox(outbox):
+    outbox.push('a')
+
+    outbox.start()
+    outbox.claim_batch(1)
+    outbox.acknowledge()
+
+    assert not outbox.release()
+    assert len(outbox) == 0
+
+    # The next item requires a new job.
+    assert outbox.push('b')
+
+
+def test_job_does_not_start_while_another_one_is_draining(app):
+    job1_outbox = Outbox(KEY)
+    job2_outbox = Outbox(KEY)
+
+    job1_outbox.push('a')
+    assert job1_outbox.start()
+
+    assert not job2_outbox.start()
+
+    # The first job can keep going.
+    assert job1_outbox.keep_draining()
+
+
+def test_job_stops_after_another_one_has_taken_over(app):
+    job1_outbox = Outbox(KEY)
+    job2_outbox = Outbox(KEY)
+
+    job1_outbox.push('a')
+    job1_outbox.start()
+    job1_outbox.claim_batch(1)
+
+    # The first job stalls until its flag expires. Meanwhile, an item
+    # is added (which schedules another job), and that job starts.
+    app.redis_client.delete(f'{KEY}:draining')
+    assert job2_outbox.push('b')
+    assert job2_outbox.start()
+
+    assert not job1_outbox.keep_draining()
+    assert not job1_outbox.release()
+
+    # The second job handles the item the first one had claimed.
+    assert job2_outbox.claim_batch(2) == [b'a', b'b']
+    job2_outbox.acknowledge(2)
+    assert not job2_outbox.release()
+
+
+def test_job_queued_beyond_flag_lifetime_leaves_outbox_to_newer_job(app):
+    job1_outbox = Outbox(KEY)
+    job2_outbox = Outbox(KEY)
+
+    job1_outbox.push('a')
+
+    # The flag expires while the first job waits in the queue, so the
+    # next item schedules another job, which starts first.
+    app.redis_client.delete(f'{KEY}:draining')
+    assert job2_outbox.push('b')
+    assert job2_outbox.start()
+
+    assert not job1_outbox.start()
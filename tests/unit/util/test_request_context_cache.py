@@ -0,0 +1,149 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from byceps.services.authz.models import PermissionID, RoleID
+from byceps.services.user.models.user import UserID
+from byceps.signals import authn as authn_signals, authz as authz_signals
+from byceps.util import request_context_cache
+
+from tests.helpers import generate_uuid
+
+
+@pytest.fixture()
+def cache_app(make_redis_app):
+    return make_redis_app(
+        additional_config={
+            'REQUEST_CONTEXT_CACHE_ENABLED': True,
+            'REQUEST_CONTEXT_CACHE_TTL': 60,
+        }
+    )
+
+
+@pytest.fixture()
+def user_id() -> UserID:
+    return UserID(generate_uuid())
+
+
+@patch('byceps.util.request_context_cache._get_permissions_for_user')
+def test_empty_permission_set_is_cached(
+    get_permissions_mock, cache_app, user_id
+):
+    get_permissions_mock.return_value = frozenset()
+
+    assert request_context_cache.get_permissions_for_user(user_id) == set()
+    assert request_context_cache.get_permissions_for_user(user_id) == set()
+
+    assert get_permissions_mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    ('signal', 'signal_kwargs'),
+    [
+        (
+            authz_signals.permission_assigned_to_role,
+            {
+                'permission_id': PermissionID('board.hide'),
+                'role_id': RoleID('board_moderator'),
+            },
+        ),
+        (
+            authz_signals.permission_deassigned_from_role,
+            {
+                'permission_id': PermissionID('board.hide'),
+                'role_id': RoleID('board_moderator'),
+            },
+        ),
+        (
+            authz_signals.role_deleted,
+            {'role_id': RoleID('board_moderator')},
+        ),
+    ],
+)
+@patch('byceps.util.request_context_cache._get_permissions_for_user')
+def test_permissions_are_reloaded_after_role_permission_change(
+    get_permissions_mock, cache_app, user_id, signal, signal_kwargs
+):
+    request_context_cache.enable_invalidation()
+
+    get_permissions_mock.return_value = frozenset({'board.view_hidden'})
+    request_context_cache.get_permissions_for_user(user_id)
+
+    get_permissions_mock.return_value = frozenset({'board.hide'})
+    signal.send(None, **signal_kwargs)
+
+    assert request_context_cache.get_permissions_for_user(user_id) == {
+        'board.hide'
+    }
+    assert get_permissions_mock.call_count == 2
+
+
+@patch(
+    'byceps.services.authn.session.authn_session_service.find_active_user_with_valid_session'
+)
+def test_user_with_valid_session_is_reloaded_after_tokens_were_deleted(
+    find_user_mock, cache_app, user_id
+):
+    request_context_cache.enable_invalidation()
+
+    find_user_mock.return_value = object()
+
+    request_context_cache.find_active_user_with_valid_session(user_id, 'token')
+    request_context_cache.find_active_user_with_valid_session(user_id, 'token')
+    assert find_user_mock.call_count == 1
+
+    find_user_mock.return_value = None
+    authn_signals.session_tokens_deleted.send(None, user_id=user_id)
+
+    assert (
+        request_context_cache.find_active_user_with_valid_session(
+            user_id, 'token'
+        )
+        is None
+    )
+    assert find_user_mock.call_count == 2
+
+
+@patch(
+    'byceps.services.authn.session.authn_session_service.find_active_user_with_valid_session'
+)
+def test_missing_auth_token_is_rejected_without_lookup(
+    find_user_mock, cache_app, user_id
+):
+    assert (
+        request_context_cache.find_active_user_with_valid_session(user_id, '')
+        is None
+    )
+    find_user_mock.assert_not_called()
+
+
+@patch('byceps.util.request_context_cache._get_permissions_for_user')
+def test_redis_tier_failure_is_treated_as_miss(
+    get_permissions_mock, make_redis_app, user_id, monkeypatch
+):
+    app = make_redis_app(
+        additional_config={
+            'REQUEST_CONTEXT_CACHE_ENABLED': True,
+            'REQUEST_CONTEXT_CACHE_REDIS_ENABLED': True,
+            'REQUEST_CONTEXT_CACHE_TTL': 60,
+        }
+    )
+
+    def fail(*args, **kwargs):
+        raise ConnectionError('Redis went away')
+
+    # Generations can still be read (or have been prefetched).
+    monkeypatch.setattr(app.redis_client, 'get', fail)
+    monkeypatch.setattr(app.redis_client, 'set', fail)
+
+    get_permissions_mock.return_value = frozenset({'board.view_hidden'})
+
+    assert request_context_cache.get_permissions_for_user(user_id) == {
+        'board.view_hidden'
+    }
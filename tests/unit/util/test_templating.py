@@ -0,0 +1,56 @@
+"""
+:Copyright: 2014-2023 Jochen Kupperschmidt
+:License: Revised BSD (see `LICENSE` file for details)
+"""
+
+from jinja2.exceptions import SecurityError
+import pytest
+
+from byceps.util.templating import (
+    clear_compiled_template_cache,
+    get_compiled_template_cache_stats,
+    load_template,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_compiled_template_cache()
+
+
+def test_load_template():
+    template = load_template('Hello, {{ name }}!')
+
+    assert template.render(name='<Hiro>') == 'Hello, &lt;Hiro&gt;!'
+
+
+def test_compiled_code_is_reused():
+    source = '{{ 1 + 2 }}'
+
+    before = get_compiled_template_cache_stats()
+    assert load_template(source).render() == '3'
+    assert load_template(source).render() == '3'
+    after = get_compiled_template_cache_stats()
+
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+    assert after.size == 1
+
+
+def test_template_globals_are_bound_per_template():
+    source = '{{ greet() }}'
+
+    template1 = load_template(source, template_globals={'greet': lambda: 'hi'})
+    template2 = load_template(source, template_globals={'greet': lambda: 'yo'})
+    template3 = load_template('{{ greet is defined }}')
+
+    assert template1.render() == 'hi'
+    assert template2.render() == 'yo'
+    assert template3.render() == 'False'
+
+
+def test_environment_is_sandboxed():
+    template = load_template('{{ items.append(1) }}')
+
+    with pytest.raises(SecurityError):
+        template.render(items=[])
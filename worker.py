@@ -8,6 +8,7 @@
 from rq import Worker
 
 from byceps.application import create_worker_app
+from byceps.services.party_stats import party_stats_snapshot_service
 from byceps.util.jobqueue import connection, get_queue
 from byceps.util.sentry import configure_sentry_from_env
 
@@ -18,6 +19,8 @@ if __name__ == '__main__':
     app = create_worker_app()
 
     with app.app_context():
+        party_stats_snapshot_service.schedule_periodic_refresh()
+
         with connection():
             queues = [get_queue(app)]
 